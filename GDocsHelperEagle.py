@@ -87,6 +87,7 @@ class GDocs(object):
         self.service, self.__subject, self.gerrors = _get_service()
         self.feeds = {}
         self._header_cache = {}
+        self._row_index = {}
 
     # --- Sheet/meta helpers ---
 
@@ -108,6 +109,7 @@ class GDocs(object):
         ).execute()
         feed = result.get('values', [])
         self.feeds[sheetId] = feed
+        self._row_index.pop(sheetId, None)
         return feed
 
     def get_headings(self, sheet_id):
@@ -132,25 +134,35 @@ class GDocs(object):
             return heads.index("asset"), "asset"
         raise RuntimeError(f"Sheet '{sheetId}' must have an 'Asset' column.")
 
-    def getRow(self, sheetId, rowId):
+    def getRowIndex(self, sheetId):
+        """
+        Return {asset: (row, row_number)} for every data row of the cached feed.
+        Built once per feed so bulk lookups don't rescan the sheet for every asset.
+        """
+        norm_id = _normalize_sheet_id(sheetId)
+        feed = self.getFeed(sheetId)
+        if norm_id in self._row_index:
+            return self._row_index[norm_id]
+
         heads, header_idx = self.headings_and_row_index(sheetId)
         if "asset" in heads:
             key_idx = heads.index("asset")
         else:
             raise RuntimeError(f"Sheet '{sheetId}' must have an 'Asset' column.")
 
-        feed = self.getFeed(sheetId)
-        # Search only data rows (after header)
-        search_rows = feed[header_idx + 1:]
-        found = None
-        found_abs_idx = -1
-        for i, row in enumerate(search_rows):
-            if key_idx < len(row) and row[key_idx] == rowId:
-                found = row
-                found_abs_idx = header_idx + 1 + i
-                break
+        # Index only data rows (after header); the first row for an asset wins
+        index = {}
+        for i, row in enumerate(feed[header_idx + 1:]):
+            if key_idx < len(row) and row[key_idx] not in index:
+                index[row[key_idx]] = (row, header_idx + 2 + i)
+        self._row_index[norm_id] = index
+        return index
 
-        return [found, (found_abs_idx + 1) if found is not None else -1]
+    def getRow(self, sheetId, rowId):
+        found = self.getRowIndex(sheetId).get(rowId)
+        if found is None:
+            return [None, -1]
+        return [found[0], found[1]]
     
     def headings_and_row_index(self, sheet_id):
         """
@@ -214,6 +226,7 @@ class GDocs(object):
             body={'values': [entry]}
         ).execute()
         self.feeds.pop(_normalize_sheet_id(sheetId), None)
+        self._row_index.pop(_normalize_sheet_id(sheetId), None)
 
     def updateRow(self, row, row_number, sheetId):
         s_id, tab = self.getSheetInfo(sheetId)
@@ -223,6 +236,7 @@ class GDocs(object):
                   'data': [{'range': f'{tab}!A{row_number}', 'values': [row]}]}
         ).execute()
         self.feeds.pop(_normalize_sheet_id(sheetId), None)
+        self._row_index.pop(_normalize_sheet_id(sheetId), None)
 
     def doUpdateConfig(self, sheetId, data):
         data = {self.cleaned_heading(k): v for k, v in data.items()}
@@ -286,6 +300,7 @@ class GDocs(object):
             spreadsheetId=s_id, body=body
         ).execute()
         self.feeds.pop(_normalize_sheet_id(sheetId), None)
+        self._row_index.pop(_normalize_sheet_id(sheetId), None)
 
     def mark_asset_deleted(self, asset):
         """
@@ -0,0 +1,119 @@
+# JobHistoryEagle.py
+
+import os
+import json
+import time
+import sqlite3
+import logging
+
+from RenderCacheEagle import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+HISTORY_FILENAME = "job_history.sqlite3"
+# Successful runs of an asset averaged for its estimate
+HISTORY_SAMPLES = 5
+# Scenes with no history: seconds = base + per_mb * .ma size, refit from history once enough rows exist
+DEFAULT_BASE_SECONDS = 60.0
+DEFAULT_SECONDS_PER_MB = 1.5
+MIN_ROWS_FOR_SIZE_MODEL = 10
+SIZE_MODEL_ROWS = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    asset TEXT NOT NULL,
+    scene_file TEXT,
+    finished_at REAL,
+    attempt INTEGER,
+    exit_code INTEGER,
+    exit_class TEXT,
+    seconds REAL,
+    peak_memory_mb REAL,
+    file_size INTEGER,
+    phases TEXT
+);
+CREATE INDEX IF NOT EXISTS job_runs_asset ON job_runs (asset, finished_at);
+"""
+
+
+def format_duration(seconds):
+    """Short human duration, e.g. 45s, 12m 05s, 3h 20m."""
+    seconds = int(max(seconds or 0, 0))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {(seconds % 3600) // 60:02d}m"
+
+
+class JobHistory(object):
+    """
+    Local SQLite log of every render attempt: duration, per-phase timings, peak memory and exit.
+    Used to estimate how long a scene will take, for ETAs and longest-job-first scheduling.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(default_cache_dir(), HISTORY_FILENAME)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.executescript(_SCHEMA)
+        self._size_model = None
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, asset, scene_file, attempt, exit_code, exit_class, seconds,
+               peak_memory_mb=None, phases=None):
+        try:
+            file_size = os.path.getsize(scene_file)
+        except OSError:
+            file_size = None
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO job_runs (asset, scene_file, finished_at, attempt, exit_code, exit_class,"
+                    " seconds, peak_memory_mb, file_size, phases) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (asset.lower(), scene_file, time.time(), attempt, exit_code, exit_class,
+                     seconds, peak_memory_mb, file_size, json.dumps(phases or {}))
+                )
+            self._size_model = None
+        except sqlite3.Error as e:
+            logger.error(f"Could not record job history for {asset}: {e}")
+
+    def size_model(self):
+        """(base_seconds, seconds_per_mb) fitted to past successful renders, or the defaults."""
+        if self._size_model is None:
+            self._size_model = (DEFAULT_BASE_SECONDS, DEFAULT_SECONDS_PER_MB)
+            rows = self.conn.execute(
+                "SELECT file_size, seconds FROM job_runs WHERE exit_code = 0 AND file_size IS NOT NULL"
+                " ORDER BY finished_at DESC LIMIT ?", (SIZE_MODEL_ROWS,)
+            ).fetchall()
+            if len(rows) >= MIN_ROWS_FOR_SIZE_MODEL:
+                xs = [size / (1024.0 * 1024.0) for size, _ in rows]
+                ys = [seconds for _, seconds in rows]
+                mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+                var_x = sum((x - mean_x) ** 2 for x in xs)
+                if var_x > 0:
+                    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+                    if slope > 0:
+                        self._size_model = (max(mean_y - slope * mean_x, 0.0), slope)
+        return self._size_model
+
+    def estimate(self, asset, scene_file):
+        """
+        Expected seconds for a render of asset: the average of its recent successful runs,
+        or a .ma file size estimate when it has never rendered successfully.
+        Returns (seconds, source) where source is 'history' or 'file size'.
+        """
+        rows = self.conn.execute(
+            "SELECT seconds FROM job_runs WHERE asset = ? AND exit_code = 0"
+            " ORDER BY finished_at DESC LIMIT ?", (asset.lower(), HISTORY_SAMPLES)
+        ).fetchall()
+        if rows:
+            return sum(r[0] for r in rows) / len(rows), 'history'
+        try:
+            size_mb = os.path.getsize(scene_file) / (1024.0 * 1024.0)
+        except OSError:
+            size_mb = 0.0
+        base, per_mb = self.size_model()
+        return base + per_mb * size_mb, 'file size'
@@ -0,0 +1,133 @@
+# JobLogEagle.py
+
+import os
+import gzip
+import time
+import shutil
+import logging
+from collections import deque
+
+from RenderCacheEagle import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+LOG_DIRNAME = "logs"
+LOG_RETENTION_DAYS = 14
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+SEVERITY_NAMES = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+
+_ERROR_MARKERS = ("error:", "[error]", "error occurred", "traceback", "exception", "failed", "!!!", "❌")
+_WARNING_MARKERS = ("warning", "[warn]", "could not", "skipping", "not found", "missing")
+# Maya's own echo of commands and results
+_DEBUG_PREFIXES = ("// ", "# ", "result:", "file read in", "[eagle_summary]")
+
+
+def classify_line(line):
+    """Best-effort severity of one line of tool or Maya output."""
+    lower = line.strip().lower()
+    if not lower:
+        return DEBUG
+    if any(marker in lower for marker in _ERROR_MARKERS):
+        return ERROR
+    if any(marker in lower for marker in _WARNING_MARKERS):
+        return WARNING
+    if lower.startswith(_DEBUG_PREFIXES):
+        return DEBUG
+    return INFO
+
+
+def default_log_dir():
+    path = os.path.join(default_cache_dir(), LOG_DIRNAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def prune_old_logs(log_dir, days=LOG_RETENTION_DAYS):
+    """Delete job logs older than the retention window."""
+    cutoff = time.time() - days * 86400
+    try:
+        names = os.listdir(log_dir)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(log_dir, name)
+        try:
+            if os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def compress_log(path):
+    """Gzip path in place. Returns the .gz path, or path unchanged if it could not be compressed."""
+    if not os.path.exists(path):
+        return path
+    gz_path = path + ".gz"
+    try:
+        with open(path, "rb") as src, gzip.open(gz_path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(path)
+        return gz_path
+    except OSError as e:
+        logger.error(f"Could not compress {path}: {e}")
+        return path
+
+
+class JobLog(object):
+    """Complete output of one render attempt, written as it streams and gzipped when closed."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8", errors="replace")
+
+    def write(self, line):
+        if self._file:
+            self._file.write(line + "\n")
+
+    def close(self, compress=True):
+        if not self._file:
+            return self.path
+        self._file.close()
+        self._file = None
+        if compress:
+            self.path = compress_log(self.path)
+        return self.path
+
+
+class LogBuffer(object):
+    """
+    Ring buffer of the most recent log lines for an on-screen view. Lines are classified once
+    on append; lines at or above min_severity are also queued until the view takes them, so the
+    view can repaint in one batch per frame instead of once per line.
+    """
+
+    def __init__(self, max_lines, min_severity=INFO):
+        self.lines = deque(maxlen=max_lines)
+        self.pending = deque(maxlen=max_lines)
+        self.min_severity = min_severity
+
+    def append(self, text):
+        for line in str(text).split("\n"):
+            severity = classify_line(line) if line else INFO
+            self.lines.append((severity, line))
+            if severity >= self.min_severity:
+                self.pending.append(line)
+
+    def take_pending(self):
+        """All queued lines as one block of text, or '' when nothing is waiting."""
+        if not self.pending:
+            return ""
+        text = "\n".join(self.pending)
+        self.pending.clear()
+        return text
+
+    def set_min_severity(self, severity):
+        """Change the filter; returns the buffered lines that pass it, for redrawing the view."""
+        self.min_severity = severity
+        self.pending.clear()
+        return "\n".join(line for sev, line in self.lines if sev >= severity)
+
+    def clear(self):
+        self.lines.clear()
+        self.pending.clear()
@@ -0,0 +1,1714 @@
+# -*- coding: utf-8 -*-
+# MayaRenderJob.py
+"""
+Maya-side half of the render pipeline. Runs inside mayapy, never in the tool's own Python.
+
+    mayapy -m MayaRenderJob --job <job_spec.json>      render one scene
+    mayapy -m MayaRenderJob --jobs <spec> <spec> ...     render several scenes in one session
+    mayapy -m MayaRenderJob --daemon                    persistent worker fed job specs over stdin
+
+Running it with -m lets Python cache the compiled module (see PYTHONPYCACHEPREFIX in
+RenderEngineEagle.maya_environment), so each job skips compiling this file.
+Nothing here imports Maya at module level, so the engine can import the shared constants.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import traceback
+import subprocess
+
+import TagMatcherEagle
+import RenderCacheEagle
+import RenderDataStoreEagle
+import TextureIndexEagle
+
+# Structured events (phases, layers, images, summary), one JSON object per line
+EVENT_TAG = "[EAGLE_EVENT]"
+# Daemon protocol messages (ready, pong, job_done, recycle)
+DAEMON_TAG = "[EAGLE_DAEMON]"
+RENDER_EXE = r"C:/Program Files/Autodesk/Maya2024/bin/Render.exe"
+# The only plugins a render job loads up front; scenes that need others still load them on open
+ALLOWED_PLUGINS = ("mtoa", "shaderFXPlugin")
+# Scenes open with references deferred and only the references that define grp_geo (and those
+# linked to them by reference edits) are loaded. When no reference is recognized as defining it,
+# references whose path matches one of these (lower case, forward slashes) are left out unless
+# grp_geo is still missing; the job spec's skip_reference_patterns replaces this default
+GRP_GEO_NAME = "grp_geo"
+SKIP_REFERENCE_PATTERNS = ("/cameras/", "/animation/", "_cam.ma", "_cam.mb", "_anim.ma", "_anim.mb")
+LIGHT_TEMPLATE_FILE = "characterLights_template.ma"
+# Formats a job can save its scratch scenes in; binary is much faster to save and for Render.exe to parse
+SCRATCH_FORMATS = {"mayaAscii": ".ma", "mayaBinary": ".mb"}
+# Render.exe outputs older than its start by more than this are left over from an earlier run;
+# the slack covers file systems that store mtimes in 2 second steps
+OUTPUT_MTIME_SLACK = 2.0
+
+
+def emit_event(event_type, **fields):
+    # One JSON object per line on stdout, parsed by the render engine as it streams
+    fields["type"] = event_type
+    fields["t"] = round(time.time(), 3)
+    sys.stdout.write(EVENT_TAG + " " + json.dumps(fields) + "\n")
+    sys.stdout.flush()
+
+
+def send_daemon_message(message):
+    sys.stdout.write(DAEMON_TAG + " " + json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+# Per-phase wall-clock timings of the current job, reported in its summary
+phase_times = {}
+current_phase = {"name": None, "start": time.time()}
+
+
+def reset_phases():
+    phase_times.clear()
+    current_phase.update(name=None, start=time.time())
+
+
+def mark_phase(name):
+    now = time.time()
+    if current_phase["name"]:
+        phase_times[current_phase["name"]] = round(
+            phase_times.get(current_phase["name"], 0.0) + now - current_phase["start"], 2)
+        emit_event("phase_end", phase=current_phase["name"], seconds=round(now - current_phase["start"], 2))
+    current_phase["name"], current_phase["start"] = name, now
+    if name:
+        emit_event("phase_start", phase=name)
+
+
+def memory_mb(peak=False):
+    # Working set (or peak working set) of this mayapy process
+    try:
+        if os.name == "nt":
+            import ctypes
+            from ctypes import wintypes
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                size = counters.PeakWorkingSetSize if peak else counters.WorkingSetSize
+                return round(size / (1024.0 * 1024.0), 1)
+            return 0.0
+        import resource
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1)
+    except Exception:
+        return 0.0
+
+
+def initialize_maya():
+    """
+    Start Maya standalone with the render job startup profile and load only ALLOWED_PLUGINS.
+    Once per process. The engine launches mayapy with an isolated MAYA_APP_DIR and userSetup
+    skipped (RenderEngineEagle.maya_environment); these are set again here for manual runs.
+    """
+    start_time = time.time()
+    os.environ["MAYA_ENABLE_LEGACY_RENDER_LAYERS"] = "1"
+    os.environ["MAYA_NO_CONVERT_LEGACY_RENDER_LAYERS"] = "1"
+    os.environ['MAYA_DISABLE_PLUGIN_AUTOLOAD'] = '1'
+    os.environ.setdefault("MAYA_SKIP_USERSETUP_PY", "1")
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    import maya.cmds as cmds
+
+    # anything loaded by Maya's own startup that is not on the allowlist (renderSetup, Turtle, ...)
+    for plugin in cmds.pluginInfo(q=True, listPlugins=True) or []:
+        if plugin in ALLOWED_PLUGINS:
+            continue
+        try:
+            cmds.unloadPlugin(plugin, force=True)
+            print(f"[Init] Unloaded {plugin}; it is not on the render plugin allowlist.")
+        except Exception as e:
+            print(f"[Init] Warning: could not unload {plugin}: {e}")
+
+    # mtoa makes sure Arnold attrs exist so ASCII parses cleanly
+    for plugin in ALLOWED_PLUGINS:
+        try:
+            if not cmds.pluginInfo(plugin, q=True, loaded=True):
+                cmds.loadPlugin(plugin, quiet=True)
+                print(f"[Init] Loaded {plugin}.")
+        except Exception as e:
+            print(f"[Init] {plugin} not available (continuing):", e)
+
+    seconds = round(time.time() - start_time, 2)
+    print(f"[Init] Maya initialized in {seconds:.1f}s")
+    emit_event("maya_init", seconds=seconds,
+               plugins=sorted(cmds.pluginInfo(q=True, listPlugins=True) or []),
+               app_dir=os.environ.get("MAYA_APP_DIR"))
+
+
+def uninitialize_maya():
+    import maya.standalone
+    maya.standalone.uninitialize()
+
+
+def find_grp_geo(scene_index=None):
+    """Long name of the group holding the asset's render geometry, or None."""
+    import maya.cmds as cmds
+    transforms = scene_index["transforms"] if scene_index else cmds.ls(type="transform", long=True)
+    geo_candidates = [x for x in transforms if x.endswith("|grp_geo")]
+    if not geo_candidates:
+        geo_candidates = cmds.ls("Char_Rig|grp_other|grp_geo", long=True)
+    if not geo_candidates:
+        geo_candidates = cmds.ls("|*|grp_mesh", long=True)
+    return geo_candidates[0] if geo_candidates else None
+
+
+def build_scene_index():
+    """
+    Walk the DAG once with MItDag, and the shading engines once, and keep everything the later
+    stages ask about, so they query this dict instead of making cmds round trips per node:
+        transforms             long names of every transform
+        meshes                 mesh long name -> {transform, ancestors (short names, root first), intermediate}
+        nonexport_transforms   transforms of meshes under a NonExportGeo group
+        mesh_shaders           mesh long name -> ShaderfxShaders of the shading engines it belongs to
+    """
+    import maya.api.OpenMaya as om
+    index = {"transforms": [], "meshes": {}, "nonexport_transforms": [], "mesh_shaders": {}}
+
+    dag_iter = om.MItDag(om.MItDag.kDepthFirst)
+    while not dag_iter.isDone():
+        path = dag_iter.getPath()
+        name = path.fullPathName()
+        if path.apiType() == om.MFn.kMesh:
+            transform = name.rpartition("|")[0]
+            ancestors = transform.split("|")[1:]
+            index["meshes"][name] = {
+                "transform": transform,
+                "ancestors": ancestors,
+                "intermediate": om.MFnDagNode(path).isIntermediateObject,
+            }
+            if "NonExportGeo" in ancestors and transform not in index["nonexport_transforms"]:
+                index["nonexport_transforms"].append(transform)
+        elif path.hasFn(om.MFn.kTransform):
+            index["transforms"].append(name)
+        dag_iter.next()
+
+    se_iter = om.MItDependencyNodes(om.MFn.kShadingEngine)
+    while not se_iter.isDone():
+        shading_engine = se_iter.thisNode()
+        source = om.MFnDependencyNode(shading_engine).findPlug("surfaceShader", False).source()
+        if not source.isNull:
+            shader = om.MFnDependencyNode(source.node())
+            if shader.typeName == "ShaderfxShader":
+                members = om.MFnSet(shading_engine).getMembers(False)
+                for i in range(members.length()):
+                    try:
+                        member = members.getDagPath(i)
+                    except (RuntimeError, TypeError):
+                        # not a DAG member
+                        continue
+                    index["mesh_shaders"].setdefault(member.fullPathName(), []).append(shader.name())
+        se_iter.next()
+
+    print(f"[Index] {len(index['transforms'])} transforms, {len(index['meshes'])} meshes, "
+          f"{len(index['mesh_shaders'])} meshes with ShaderFX shaders")
+    return index
+
+
+def meshes_under(scene_index, group):
+    """Long names of every mesh below group, from the scene index."""
+    prefix = group + "|"
+    return [mesh for mesh in scene_index["meshes"] if mesh.startswith(prefix)]
+
+
+# Maya's rotateOrder enum, in attribute order
+ROTATE_ORDERS = ("xyz", "yzx", "zxy", "xzy", "yxz", "zyx")
+
+
+def _raw_mesh_points(mesh, np):
+    """
+    World-space points of one mesh as an (n, 3) array, copied straight from the mesh's vertex
+    buffer (API 1.0 getRawPoints) and transformed by NumPy, with no Python object per vertex.
+    """
+    import ctypes
+    import maya.OpenMaya as om1
+    import maya.cmds as cmds
+    selection = om1.MSelectionList()
+    selection.add(mesh)
+    dag_path = om1.MDagPath()
+    selection.getDagPath(0, dag_path)
+    fn_mesh = om1.MFnMesh(dag_path)
+    count = fn_mesh.numVertices()
+    if not count:
+        return np.empty((0, 3))
+    buffer = (ctypes.c_float * (3 * count)).from_address(int(fn_mesh.getRawPoints()))
+    local = np.frombuffer(buffer, dtype=np.float32).reshape(count, 3).astype(np.float64)
+    matrix = np.array(cmds.xform(mesh.rsplit("|", 1)[0], q=True, ws=True, matrix=True), dtype=np.float64).reshape(4, 4)
+    return local @ matrix[:3, :3] + matrix[3, :3]
+
+
+def _mesh_points(mesh, np):
+    """World-space points of one mesh; falls back to an MPointArray read if the raw buffer is unavailable."""
+    try:
+        return _raw_mesh_points(mesh, np)
+    except Exception as e:
+        import maya.api.OpenMaya as om
+        print(f"[Geometry] Raw point read failed for {mesh}, reading points one by one: {e}")
+        selection = om.MSelectionList()
+        selection.add(mesh)
+        points = om.MFnMesh(selection.getDagPath(0)).getPoints(om.MSpace.kWorld)
+        return np.array(points, dtype=np.float64)[:, :3] if len(points) else np.empty((0, 3))
+
+
+def rotation_frame(rotation, rotate_axis=(0, 0, 0), rotate_order="xyz", parent_matrix=None):
+    """
+    The 3x3 row-vector matrix taking a transform's object-space rotation axes to world space:
+    rotate axis, then rotation, then the parent's world matrix. The transform's own scale and
+    shear come before its rotation, so they are not part of it.
+    """
+    import numpy as np
+    frame = euler_matrix(rotate_axis) @ euler_matrix(rotation, rotate_order)
+    if parent_matrix is not None:
+        frame = frame @ np.array(parent_matrix, dtype=np.float64).reshape(4, 4)[:3, :3]
+    return frame
+
+
+def read_geometry_stats(group, mesh_shapes):
+    """
+    Read every mesh of group into NumPy: world-space points, triangle count, and the group's
+    rotate pivot and rotation frame for view_bbox().
+    Returns None when NumPy is unavailable or there are no points; callers then
+    fall back to cmds.exactWorldBoundingBox and cmds.polyEvaluate.
+    """
+    try:
+        import numpy as np
+        import maya.cmds as cmds
+    except ImportError as e:
+        print(f"[Geometry] NumPy unavailable, using cmds: {e}")
+        return None
+    try:
+        point_arrays = []
+        triangles = 0
+        for mesh in mesh_shapes:
+            points = _mesh_points(mesh, np)
+            if len(points):
+                point_arrays.append(points)
+            tri = cmds.polyEvaluate(mesh, triangle=True)
+            if isinstance(tri, dict):
+                tri = sum(tri.values())
+            triangles += int(tri or 0)
+        if not point_arrays:
+            return None
+        parents = cmds.listRelatives(group, parent=True, fullPath=True)
+        frame = rotation_frame(
+            cmds.getAttr(group + ".rotate")[0],
+            cmds.getAttr(group + ".rotateAxis")[0],
+            ROTATE_ORDERS[cmds.getAttr(group + ".rotateOrder")],
+            cmds.xform(parents[0], q=True, ws=True, matrix=True) if parents else None,
+        )
+        return {
+            "points": np.concatenate(point_arrays),
+            "triangles": triangles,
+            "pivot": np.array(cmds.xform(group, q=True, ws=True, rotatePivot=True), dtype=np.float64),
+            "frame": frame,
+        }
+    except Exception as e:
+        print(f"[Geometry] Could not read meshes, using cmds: {e}")
+        return None
+
+
+def euler_matrix(rotation, order="xyz"):
+    """Row-vector matrix of an Euler rotation in degrees, composed the way Maya does for the rotate order."""
+    import numpy as np
+    x, y, z = np.radians(rotation)
+    axes = {
+        "x": np.array([[1, 0, 0], [0, np.cos(x), np.sin(x)], [0, -np.sin(x), np.cos(x)]]),
+        "y": np.array([[np.cos(y), 0, -np.sin(y)], [0, 1, 0], [np.sin(y), 0, np.cos(y)]]),
+        "z": np.array([[np.cos(z), np.sin(z), 0], [-np.sin(z), np.cos(z), 0], [0, 0, 1]]),
+    }
+    # "xyz" rotates about X first; with row vectors that matrix comes first
+    return axes[order[0]] @ axes[order[1]] @ axes[order[2]]
+
+
+def view_bbox(stats, rotation=(0, 0, 0), offset=(0, 0, 0)):
+    """
+    World bounding box [xmin, ymin, zmin, xmax, ymax, zmax] of the group's meshes after
+    cmds.rotate(*rotation, relative=True, objectSpace=True) about its pivot and a world offset,
+    computed from the point cloud without creating any nodes.
+    """
+    import numpy as np
+    points = stats["points"]
+    if any(rotation):
+        frame = stats["frame"]
+        # object-space rotation expressed in world space; the frame may carry a parent's
+        # non-uniform scale, so it is inverted rather than transposed
+        delta = np.linalg.inv(frame) @ euler_matrix(rotation) @ frame
+        points = (points - stats["pivot"]) @ delta + stats["pivot"]
+    low = points.min(axis=0)
+    high = points.max(axis=0)
+    return [float(low[0] + offset[0]), float(low[1] + offset[1]), float(low[2] + offset[2]),
+            float(high[0] + offset[0]), float(high[1] + offset[1]), float(high[2] + offset[2])]
+
+
+def offset_bbox(bbox, dx=0.0, dy=0.0, dz=0.0):
+    return [bbox[0] + dx, bbox[1] + dy, bbox[2] + dz, bbox[3] + dx, bbox[4] + dy, bbox[5] + dz]
+
+
+def union_bbox(bboxes):
+    return [min(b[0] for b in bboxes), min(b[1] for b in bboxes), min(b[2] for b in bboxes),
+            max(b[3] for b in bboxes), max(b[4] for b in bboxes), max(b[5] for b in bboxes)]
+
+
+def default_render_layer_ok():
+    """True when the scene has a local defaultRenderLayer and it is the current render layer."""
+    import maya.cmds as cmds
+    try:
+        if not cmds.objExists("defaultRenderLayer"):
+            return False
+        if cmds.referenceQuery("defaultRenderLayer", isNodeReferenced=True):
+            return False
+        return cmds.editRenderLayerGlobals(q=True, currentRenderLayer=True) == "defaultRenderLayer"
+    except Exception:
+        return False
+
+
+def repair_render_layers_in_place():
+    """
+    Fix the render layer manager and defaultRenderLayer inside the open scene, without the
+    export/import round trip. Returns False when the scene still is not clean afterwards,
+    e.g. when the only defaultRenderLayer comes from a reference and cannot be edited.
+    """
+    import maya.cmds as cmds
+    try:
+        if not cmds.objExists("renderLayerManager"):
+            cmds.createNode("renderLayerManager", name="renderLayerManager")
+            print("[Layers] Created renderLayerManager")
+        if not cmds.objExists("defaultRenderLayer"):
+            cmds.createNode("renderLayer", name="defaultRenderLayer", shared=True)
+            cmds.connectAttr("renderLayerManager.renderLayerId[0]", "defaultRenderLayer.identification", force=True)
+            print("[Layers] Created defaultRenderLayer")
+        elif cmds.referenceQuery("defaultRenderLayer", isNodeReferenced=True):
+            print("[Layers] defaultRenderLayer is referenced; it cannot be repaired in place")
+            return False
+        cmds.editRenderLayerGlobals(currentRenderLayer="defaultRenderLayer")
+        if cmds.objExists("defaultRenderLayer.renderable"):
+            cmds.setAttr("defaultRenderLayer.renderable", 1)
+    except Exception as e:
+        print(f"[Layers] In-place render layer repair failed: {e}")
+        return False
+    return default_render_layer_ok()
+
+
+def file_defines_node(path, node_name=GRP_GEO_NAME, _seen=None):
+    """
+    Whether the Maya file at path creates node_name itself or through one of its own references,
+    read from the file without Maya. Maya ASCII is scanned for the createNode statement and its
+    references are followed through RenderCacheEagle.read_reference_paths. Maya binary only gets
+    a byte search for the name and its references are not followed. Returns None when the file
+    cannot be read.
+    """
+    _seen = set() if _seen is None else _seen
+    key = os.path.normcase(os.path.abspath(path))
+    if key in _seen:
+        return False
+    _seen.add(key)
+    try:
+        if path.lower().endswith(".mb"):
+            needle = node_name.encode("utf-8") + b"\x00"
+            tail = b""
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    if needle in tail + chunk:
+                        return True
+                    tail = chunk[-len(needle):]
+            return False
+        pattern = re.compile(r'^\s*createNode transform\b.*\s-n "' + re.escape(node_name) + r'"')
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            if any(pattern.match(line) for line in f):
+                return True
+        return any(file_defines_node(ref, node_name, _seen)
+                   for ref in RenderCacheEagle.read_reference_paths(path) if os.path.exists(ref))
+    except OSError as e:
+        print(f"[References] Could not read {path}: {e}")
+        return None
+
+
+def load_needed_references(skip_patterns=SKIP_REFERENCE_PATTERNS):
+    """
+    Load only the deferred top-level references of a scene opened with loadReferenceDepth="none"
+    that supply grp_geo and its shading:
+      - the references whose file defines grp_geo (file_defines_node), and
+      - the unloaded references tied to those by reference edits, e.g. a shader library
+        reference whose shading groups the scene connected to grp_geo's meshes.
+    The scene's own light template is removed, since every job references a fresh copy.
+
+    Limitations: grp_geo is found from the file text, so a Maya binary reference that only gets
+    grp_geo from a nested reference, or a file that cannot be read, is not recognized, and
+    shading that lives in a reference with no edits linking it to grp_geo is not found. When no
+    owner of grp_geo is recognized, every reference is loaded except those whose path (lower case,
+    forward slashes) contains one of skip_patterns; if grp_geo is still missing, all are loaded.
+    """
+    import maya.cmds as cmds
+    deferred = {}
+    for ref_node in cmds.ls(type="reference") or []:
+        if ref_node == "sharedReferenceNode":
+            continue
+        try:
+            if cmds.referenceQuery(ref_node, isLoaded=True):
+                continue
+            path = cmds.referenceQuery(ref_node, filename=True, withoutCopyNumber=True)
+        except RuntimeError:
+            # orphan reference node; deleted once the scene is loaded
+            continue
+        if os.path.basename(path.replace("\\", "/")).lower() == LIGHT_TEMPLATE_FILE.lower():
+            try:
+                cmds.file(removeReference=True, referenceNode=ref_node)
+                print(f"[References] Removed the scene's light template {ref_node}; the job references its own.")
+                continue
+            except RuntimeError as e:
+                print(f"[References] Could not remove {ref_node}: {e}")
+        deferred[ref_node] = path
+
+    loaded = []
+
+    def load(ref_node, reason):
+        try:
+            cmds.file(loadReference=ref_node, loadReferenceDepth="all")
+            loaded.append(ref_node)
+            print(f"[References] Loaded {ref_node} ({reason}): {deferred[ref_node]}")
+        except RuntimeError as e:
+            print(f"[References] Could not load {ref_node}: {e}")
+
+    def namespace(ref_node):
+        try:
+            return cmds.referenceQuery(ref_node, namespace=True, shortName=True)
+        except RuntimeError:
+            return None
+
+    def edits(ref_node):
+        try:
+            return cmds.referenceQuery(ref_node, editStrings=True, failedEdits=True, successfulEdits=True) or []
+        except RuntimeError:
+            return []
+
+    owners = [ref_node for ref_node, path in deferred.items() if file_defines_node(path)]
+    for ref_node in owners:
+        load(ref_node, "defines grp_geo")
+
+    if owners and find_grp_geo():
+        # shading dependencies: references whose namespace appears in the owners' edits, or
+        # whose own edits touch an owner's namespace
+        owner_namespaces = [ns + ":" for ns in (namespace(r) for r in owners) if ns]
+        owner_edits = "\n".join(edit for r in owners for edit in edits(r))
+        for ref_node in deferred:
+            if ref_node in loaded:
+                continue
+            ns = namespace(ref_node)
+            if (ns and ns + ":" in owner_edits) or any(
+                    owner_ns in edit for edit in edits(ref_node) for owner_ns in owner_namespaces):
+                load(ref_node, "connected to grp_geo")
+    else:
+        if owners:
+            print("[References] grp_geo not found after loading its references; loading the others too.")
+        else:
+            print("[References] No reference recognized as defining grp_geo; loading all but the skip patterns.")
+        skipped = []
+        for ref_node, path in deferred.items():
+            if ref_node in loaded:
+                continue
+            if any(pattern in path.replace("\\", "/").lower() for pattern in skip_patterns):
+                skipped.append(ref_node)
+                continue
+            load(ref_node, "fallback")
+        if skipped and not find_grp_geo():
+            print("[References] grp_geo not found in the loaded references; loading the skipped ones too.")
+            for ref_node in skipped:
+                load(ref_node, "fallback")
+
+    left = len(deferred) - len(loaded)
+    print(f"[References] Loaded {len(loaded)} reference(s), left {left} unloaded.")
+    return loaded, [ref_node for ref_node in deferred if ref_node not in loaded]
+
+
+def make_texture_proxy(path, info, max_res):
+    """
+    Downscaled PNG copy of a texture with its longest edge at max_res, written once to the shared
+    proxy cache (TextureIndexEagle.proxy_path) and reused by later scenes. Returns its path, or
+    None when Maya could not read or write the image.
+    """
+    proxy = TextureIndexEagle.proxy_path(path, info, max_res)
+    if os.path.exists(proxy):
+        return proxy
+    try:
+        import maya.api.OpenMaya as om
+        os.makedirs(os.path.dirname(proxy), exist_ok=True)
+        image = om.MImage()
+        image.readFromFile(path)
+        width, height = image.getSize()
+        scale = float(max_res) / max(width, height)
+        image.resize(max(1, int(width * scale)), max(1, int(height * scale)), True)
+        # parallel jobs may build the same proxy; each writes its own file and the last replace wins
+        tmp_path = f"{os.path.splitext(proxy)[0]}.{os.getpid()}.tmp.png"
+        image.writeToFile(tmp_path, "png")
+        os.replace(tmp_path, proxy)
+        return proxy
+    except Exception as e:
+        print(f"[Textures] Could not build a {max_res} proxy of {path}: {e}")
+        return None
+
+
+def clean_image_name(filename_with_layer):
+    """The Eagle image name for a layer's image prefix: asset prefix (c_, o_, p_, fx_, ...) and _rig removed."""
+    clean_name = re.sub(r'^(c_|o_|p_|fx_|.+?_)', '', filename_with_layer + ".png")
+    return re.sub(r'_rig(?=\.png$)', '', clean_name)
+
+
+def layers_containing(group, render_layers):
+    """The render layers among render_layers with group, or any node under it, as a member."""
+    import maya.cmds as cmds
+    long_name = (cmds.ls(group, long=True) or [group])[0]
+    layers = []
+    for layer in render_layers:
+        try:
+            members = cmds.editRenderLayerMembers(layer, q=True, fullNames=True) or []
+        except RuntimeError:
+            continue
+        if any(m == long_name or m.startswith(long_name + "|") for m in members):
+            layers.append(layer)
+    return layers
+
+
+def instance_view(group, name, render_layers=()):
+    """
+    A new transform over the same children as group, for one extra view. Its meshes are DAG
+    instances, so no geometry or history is copied. It joins the given render layers, since
+    legacy render layer membership is per instance.
+    """
+    import maya.cmds as cmds
+    view = cmds.instance(group, name=name)[0]
+    for layer in render_layers:
+        try:
+            cmds.editRenderLayerMembers(layer, view, noRecurse=False)
+        except RuntimeError as e:
+            print(f"[Views] Could not add {view} to {layer}: {e}")
+    return view
+
+
+def hide_in_layers(node, render_layers):
+    """
+    Hide node in every render layer: visibility may carry a layer override, so it is set with
+    each layer current. Deleting node instead would delete the children its instances share.
+    """
+    import maya.cmds as cmds
+    current = cmds.editRenderLayerGlobals(q=True, currentRenderLayer=True)
+    for layer in dict.fromkeys(list(render_layers) + [current]):
+        try:
+            if layer != current:
+                cmds.editRenderLayerGlobals(currentRenderLayer=layer)
+        except RuntimeError as e:
+            print(f"[Views] Could not switch to {layer} to hide {node}: {e}")
+            continue
+        for attr in ("visibility", "lodVisibility"):
+            # rigs often drive or lock visibility; lodVisibility hides it just the same
+            try:
+                cmds.setAttr(f"{node}.{attr}", 0)
+                break
+            except RuntimeError:
+                continue
+        else:
+            print(f"[Views] Could not hide {node} in {layer}")
+    try:
+        cmds.editRenderLayerGlobals(currentRenderLayer=current)
+    except RuntimeError:
+        pass
+
+
+def render_exe_outputs(output_dir, render_layer, filename_with_layer):
+    """
+    Paths Render.exe may have written a layer's image to with -rd output_dir, -fnc 3 and no
+    padding: directly in output_dir, or in the per-layer subfolder it makes when several layers
+    render in one call (masterLayer for defaultRenderLayer), with or without a frame number.
+    """
+    layer_dir = "masterLayer" if render_layer == "defaultRenderLayer" else render_layer.replace(":", "_")
+    folders = (os.path.join(output_dir, layer_dir), output_dir)
+    names = (f"{filename_with_layer}.1.png", f"{filename_with_layer}.0001.png", f"{filename_with_layer}.png")
+    return [os.path.join(folder, name) for folder in folders for name in names]
+
+
+def _written_since(path, started_at):
+    try:
+        return os.path.getmtime(path) >= started_at - OUTPUT_MTIME_SLACK
+    except OSError:
+        return False
+
+
+def finalize_render_outputs(output_dir, layer_outputs, started_at=None):
+    """
+    Move each rendered layer's image to its Eagle name in output_dir with os.replace, which
+    overwrites the previous render in one step, and remove the layer subfolder if that left it
+    empty. Only the paths this job's layers can produce are looked at, never the rest of
+    output_dir, and with started_at (the time Render.exe was started) only files written since,
+    so an image left by an earlier crashed run is never taken for this one. Returns the layers
+    whose image was not found.
+    """
+    missing = []
+    for render_layer, filename_with_layer in layer_outputs:
+        final_path = os.path.join(output_dir, clean_image_name(filename_with_layer))
+        rendered = next((path for path in render_exe_outputs(output_dir, render_layer, filename_with_layer)
+                         if os.path.isfile(path) and (started_at is None or _written_since(path, started_at))),
+                        None)
+        if rendered is None:
+            missing.append(render_layer)
+            continue
+        if os.path.normcase(os.path.abspath(rendered)) != os.path.normcase(os.path.abspath(final_path)):
+            try:
+                os.replace(rendered, final_path)
+                print(f"Renamed {rendered} to {final_path}")
+            except OSError as e:
+                print(f"Error renaming {rendered}: {e}")
+                missing.append(render_layer)
+                continue
+        folder = os.path.dirname(rendered)
+        if os.path.normcase(os.path.abspath(folder)) != os.path.normcase(os.path.abspath(output_dir)):
+            try:
+                os.rmdir(folder)
+                print(f"Removed empty directory: {folder}")
+            except OSError:
+                pass  # not empty: something else lives there, leave it alone
+    return missing
+
+
+def render_scene(spec):
+    """
+    Render one scene described by a job spec (scene_file, output_dir, views, scratch_dir,
+    scratch_format, render_log, render_backend, texture_max_res, texture_budget_mb, texture_budget_mode,
+    tag_word_boundary, skip_reference_patterns). Failures leave through sys.exit(code), exactly as when this ran as a standalone script.
+    """
+    import maya.cmds as cmds
+    scratch_dir = spec["scratch_dir"]
+    render_backend = spec.get("render_backend") or "renderexe"
+    texture_max_res = int(spec.get("texture_max_res") or 0)
+    texture_budget_mb = float(spec.get("texture_budget_mb") or 0)
+    texture_budget_mode = spec.get("texture_budget_mode") or "cap"
+    tag_word_boundary = bool(spec.get("tag_word_boundary"))
+    skip_reference_patterns = tuple(p.replace("\\", "/").lower() for p in spec.get("skip_reference_patterns") or ())
+    skip_reference_patterns = skip_reference_patterns or SKIP_REFERENCE_PATTERNS
+    scratch_format = spec.get("scratch_format") or "mayaAscii"
+    if scratch_format not in SCRATCH_FORMATS:
+        print(f"Warning: unknown scratch format {scratch_format}; using mayaAscii")
+        scratch_format = "mayaAscii"
+
+    # === GET SCENE PATH AND TEMP DIRECTORY TO SAVE A MODIFIED VERSION===
+
+    original_scene = spec["scene_file"]
+    asset_name = spec.get("asset") or os.path.splitext(os.path.basename(original_scene))[0]
+
+    # Scratch scenes are named after the asset inside the job's own scratch folder
+    def scratch_scene(role):
+        return os.path.join(scratch_dir, f"{asset_name}_{role}{SCRATCH_FORMATS[scratch_format]}").replace("\\", "/")
+
+    temp_scene_path = scratch_scene("render")
+    export_path = scratch_scene("export")
+    rehost_path = scratch_scene("rehost")
+
+    # === DETERMINE WHAT KIND OF SCENE ===
+
+    output_dir = spec["output_dir"]
+    output_dir_lower = output_dir.lower()
+    is_prop_file = "props" in output_dir_lower
+    is_outfit_file = "outfits" in output_dir_lower
+    is_hair_file = "hair" in output_dir_lower
+    is_character_file = "characters" in output_dir_lower and not is_outfit_file
+    is_creature_file = "creatures" in output_dir_lower
+    is_effects_file = "effects" in output_dir_lower
+
+    file_type = ""
+    if is_prop_file:
+        file_type = "props"
+    elif is_outfit_file:
+        file_type = "outfits"
+    elif is_hair_file:
+        file_type = "hair"
+    elif is_character_file:
+        file_type = "characters"
+    elif is_creature_file:
+        file_type = "creatures"
+    elif is_effects_file:
+        file_type = "effects"
+
+    try:
+        mark_phase("open_scene")
+
+        # === OPEN SCENE ONCE, WITH REFERENCES DEFERRED ===
+
+        cmds.file(original_scene, open=True, force=True, loadReferenceDepth="none")
+        scene_loaded = cmds.file(query=True, sceneName=True)
+        if not scene_loaded:
+            print("!!! ERROR: Maya failed to open the scene file !!!")
+        print("Scene loaded path:", scene_loaded)
+
+        mark_phase("load_references")
+        load_needed_references(skip_reference_patterns)
+
+        # === CLEAN SCENE OF POTENTIAL BAD DEFAULT REFERENCE LAYERS ==
+
+        mark_phase("check_layers")
+        layer_repair = "none"
+        if default_render_layer_ok():
+            print("Scene render layers are good")
+        elif repair_render_layers_in_place():
+            layer_repair = "in_place"
+            print("[Layers] Repaired render layers in the open scene")
+        else:
+            # In-place repair failed: export assemblies, import into fresh scene, rebuild defaultRenderLayer
+            layer_repair = "rehost"
+            assemblies = [n for n in cmds.ls(assemblies=True) if n not in ("front", "persp", "side", "top")]
+            cmds.select(assemblies, r=True)
+            cmds.file(export_path, es=True, force=True, type=scratch_format, options="v=0")
+            cmds.file(new=True, force=True)
+            cmds.file(export_path, i=True, mergeNamespacesOnClash=True, namespace=":")
+            try:
+                cmds.file(rename=rehost_path)
+                cmds.file(save=True, type=scratch_format)
+                scene_loaded = rehost_path  # keep logs/logic happy
+                print(f"[Rehost] Saved working scene to: {rehost_path}")
+            except Exception as e:
+                print(f"[Rehost] Could not save rehosted scene: {e}")
+            # Ensure a manager exists
+            if not cmds.objExists("renderLayerManager"):
+                try:
+                    cmds.createNode("renderLayerManager", name="renderLayerManager")
+                except:
+                    pass
+            # Make sure defaultRenderLayer exists and is current+renderable
+            if not cmds.objExists("defaultRenderLayer"):
+                try:
+                    cmds.createNode("renderLayer", name="defaultRenderLayer", shared=True)
+                    print("[Layers] Created defaultRenderLayer")
+                except Exception as e:
+                    print(f"[Layers] Could not create defaultRenderLayer: {e}")
+            layerName = "defaultRenderLayer"
+            try:
+                cmds.editRenderLayerGlobals(currentRenderLayer=layerName)
+                if cmds.objExists(f"{layerName}.renderable"):
+                    cmds.setAttr(f"{layerName}.renderable", 1)
+            except:
+                pass
+            try:
+                os.remove(export_path)
+            except:
+                pass
+            print("[Cleaned scene of bad render layers]")
+        emit_event("layer_repair", path=layer_repair)
+
+        print("Scene loaded path:", scene_loaded)
+        print(f"Opened original scene: {original_scene}")
+        project_dir = cmds.workspace(q=True, rootDirectory=True)
+
+        # === CLEANUP ORPHAN REFERENCE NODES ===
+
+        for rn in cmds.ls(type='reference'):
+            try:
+                _ = cmds.referenceQuery(rn, filename=True)
+            except RuntimeError:
+                try:
+                    cmds.lockNode(rn, l=False)
+                    cmds.delete(rn)
+                    print("Deleted orphan reference node:", rn)
+                except Exception as e:
+                    print("Could not delete orphan reference node:", rn, e)
+
+        # === ENSURE CHARACTER LIGHTING IS IMPORTED ===
+
+        light_template_path = os.path.join(project_dir, "Lights", "ForTexturing", LIGHT_TEMPLATE_FILE)
+        if cmds.objExists("characterLights_template:KeyLight"):
+            try:
+                if cmds.referenceQuery("characterLights_templateRN", isNodeReferenced=True):
+                    cmds.file(removeReference=True, referenceNode="characterLights_templateRN")
+            except RuntimeError as e:
+                print(f"Warning: Failed to remove characterLights_templateRN reference: {e}")
+        try:
+            lightNodes = []
+            lightNodes = cmds.file(light_template_path, reference=True, type="mayaAscii", ignoreVersion=True, namespace="characterLights_template", options="v=0;", returnNewNodes=True)
+            print("Referenced characterLights_template.ma successfully.")
+        except Exception as e:
+            print(f"Failed to reference characterLights_template.ma: {e}")
+
+        mark_phase("prepare")
+        scene_index = build_scene_index()
+
+        # === HIDE ALL MESHES UNDER ANY NonExportGeo GROUP IN THE SCENE ===
+
+        all_render_layers = cmds.ls(type="renderLayer") or []
+        ml_render_layers = [layer for layer in all_render_layers if layer.startswith("ML_")]
+        render_layers_to_process = []
+        current_layer = cmds.editRenderLayerGlobals(q=True, currentRenderLayer=True)
+        render_layers_to_process = [current_layer] + ml_render_layers
+
+        for render_layer in render_layers_to_process:
+            try:
+                _is_ref = False
+                try:
+                    _is_ref = cmds.referenceQuery(render_layer, isNodeReferenced=True)
+                except Exception:
+                    _is_ref = False
+                if not (render_layer == "defaultRenderLayer" and _is_ref):
+                    cmds.editRenderLayerGlobals(currentRenderLayer=render_layer)
+                else:
+                    print(f"[Layer] '{render_layer}' is referenced; not making it current.")
+            except Exception as _e:
+                print(f"[Layer] Could not set currentRenderLayer='{render_layer}': {_e}")
+
+            print(f"Processing (or safely skipping) render layer: {render_layer}")
+            for transform in scene_index["nonexport_transforms"]:
+                cmds.setAttr(f"{transform}.visibility", 0)
+                print(f"Hid non-export mesh: {transform}")
+
+        # === FIND GRP_GEO MESH(S)===
+
+        grp_geo_name = find_grp_geo(scene_index)
+        if grp_geo_name:
+            print(f"Found `grp_geo`: {grp_geo_name}")
+        else:
+            print("Error: The group 'grp_geo' does not exist even after loading references!")
+            print("Scene hierarchy:", cmds.ls(dag=True, long=True))
+            sys.exit(1)
+
+        # === COMPUTE INITIAL BOUNDING BOX FOR GRP_GEO AND REMOVE ANY DEFORMER HISTORY ===
+
+        mesh_shapes = [m for m in meshes_under(scene_index, grp_geo_name) if not scene_index["meshes"][m]["intermediate"]]
+        # One bulk read of every mesh; bounding boxes of the rotated views come from it too
+        geo_stats = read_geometry_stats(grp_geo_name, mesh_shapes)
+        if geo_stats:
+            bbox = view_bbox(geo_stats)
+        else:
+            bbox = cmds.exactWorldBoundingBox(grp_geo_name)
+        x_min, y_min, z_min, x_max, y_max, z_max = bbox
+        bbox_width = x_max - x_min
+        bbox_height = y_max - y_min
+        bbox_depth = z_max - z_min
+        print(f"grp_geo bounding box: width={bbox_width}, height={bbox_height}, depth={bbox_depth}")
+
+        # === CALCULATE POLY COUNT AND INITIALIZE JSON DICTIONARY===
+
+        if geo_stats:
+            poly_count = geo_stats["triangles"]
+        else:
+            poly_count = 0
+            for mesh in mesh_shapes:
+                try:
+                    tri = cmds.polyEvaluate(mesh, triangle=True)
+                    if isinstance(tri, dict):
+                        tri = sum(tri.values())
+                    poly_count += (tri or 0)
+                except:
+                    pass
+
+        print(f"Polygon count for grp_geo: {poly_count}")
+        render_data = {}
+
+        # === CREATE INSTANCES OF GRP_GEO IN DIFFERENT PERSPECTIVES ===
+
+        views_to_render = list(spec.get("views") or [])
+        views_lower = {str(v).strip().lower() for v in views_to_render}
+        print("Views passed in:", views_to_render)
+
+        # Extra views are instances of grp_geo, in the same ML_ layers as grp_geo itself
+        view_layers = layers_containing(grp_geo_name, ml_render_layers)
+
+        # Default views when no views specified
+        dup_left = dup_top = dup_back = None
+        # World bounding box of each view once placed, when known without asking Maya
+        view_bboxes = {}
+        if not views_lower:
+            # xform below sets the view's world translation; its points move by the difference
+            grp_t = cmds.xform(grp_geo_name, q=True, ws=True, t=True)
+            offset1 = x_max + z_max + 0.5
+            dup_grp1 = instance_view(grp_geo_name, "grp_geo_dup1", view_layers)
+            cmds.rotate(0, -90, 0, dup_grp1, relative=True, objectSpace=True)
+            cmds.xform(dup_grp1, ws=True, t=(offset1, 0, 0))
+            if geo_stats:
+                view_bboxes[dup_grp1] = view_bbox(geo_stats, (0, -90, 0), (offset1 - grp_t[0], -grp_t[1], -grp_t[2]))
+            amount1 = x_max + z_max + 0.5
+
+            dup_grp2 = instance_view(grp_geo_name, "grp_geo_dup2", view_layers)
+            if is_prop_file:
+                rotation2 = (90, 0, -90)  # TOP
+                amount2 = x_max + max(y_max, abs(z_min)) + 0.5
+            else:
+                rotation2 = (0, 180, 0)  # BACK
+                amount2 = x_max + abs(z_min) + 0.5
+            cmds.rotate(*rotation2, dup_grp2, relative=True, objectSpace=True)
+
+            offset2 = amount1 + amount2
+            cmds.xform(dup_grp2, ws=True, t=(offset2, 0, 0))
+            if geo_stats:
+                view_bboxes[dup_grp2] = view_bbox(geo_stats, rotation2, (offset2 - grp_t[0], -grp_t[1], -grp_t[2]))
+            dup_left = dup_top = dup_back = None
+            dup_left = dup_grp1
+            dup_top  = dup_grp2 if is_prop_file else None
+            dup_back = dup_grp2 if not is_prop_file else None
+
+        else:
+            # Selected views to render
+            want_front = ('front' in views_lower)
+            want_left  = ('left'  in views_lower)
+            want_back  = ('back'  in views_lower)
+            want_top   = ('top'   in views_lower)
+            dup_left = dup_top = dup_back = None
+
+            # Use a gap that scales with the original grp_geo width
+            orig_bb = bbox
+            orig_width = max(orig_bb[3] - orig_bb[0], 0.001)
+            offset = 0.05
+            gap = orig_width * offset
+
+            # Get right edge of bounding box
+            current_right = orig_bb[3]
+
+            # A relative move shifts the bounding box by exactly the move, so nothing is re-measured
+            if want_left:
+                dup_left = instance_view(grp_geo_name, "grp_geo_left", view_layers)
+                cmds.rotate(0, -90, 0, dup_left, relative=True, objectSpace=True)
+                bb = view_bbox(geo_stats, (0, -90, 0)) if geo_stats else cmds.exactWorldBoundingBox(dup_left)
+                minX, minY, maxX, maxY = bb[0], bb[1], bb[3], bb[4]
+                dx = (current_right + gap) - minX
+                cmds.move(dx, 0, 0, dup_left, r=True, ws=True)
+                view_bboxes[dup_left] = offset_bbox(bb, dx, 0)
+                current_right = view_bboxes[dup_left][3]
+
+            if want_back:
+                dup_back = instance_view(grp_geo_name, "grp_geo_back", view_layers)
+                cmds.rotate(0, 180, 0, dup_back, relative=True, objectSpace=True)
+                bb = view_bbox(geo_stats, (0, 180, 0)) if geo_stats else cmds.exactWorldBoundingBox(dup_back)
+                minX, minY, maxX, maxY = bb[0], bb[1], bb[3], bb[4]
+                dx = (current_right + gap) - minX
+                cmds.move(dx, 0, 0, dup_back, r=True, ws=True)
+                view_bboxes[dup_back] = offset_bbox(bb, dx, 0)
+                current_right = view_bboxes[dup_back][3]
+
+            if want_top:
+                dup_top = instance_view(grp_geo_name, "grp_geo_top", view_layers)
+                cmds.rotate(90, 0, -90, dup_top, relative=True, objectSpace=True)
+                bb = view_bbox(geo_stats, (90, 0, -90)) if geo_stats else cmds.exactWorldBoundingBox(dup_top)
+                minX, minY, maxX, maxY = bb[0], bb[1], bb[3], bb[4]
+                dx = (current_right + gap) - minX
+                orig_cy = (y_min + y_max) / 2.0
+                dup_cy  = (minY  + maxY) / 2.0
+                dy = (orig_cy - dup_cy)
+                cmds.move(dx, dy, 0, dup_top, r=True, ws=True)
+                view_bboxes[dup_top] = offset_bbox(bb, dx, dy)
+                current_right = view_bboxes[dup_top][3]
+
+            # Hide FRONT (original) if not requested; the views share its meshes, so it stays in the scene
+            if not want_front:
+                hide_in_layers(grp_geo_name, render_layers_to_process)
+                print("Hid original grp_geo because 'Front' not requested.")
+
+        # === CREATE NEW ORTHOGRAPHIC CAMERA ===
+
+        if cmds.objExists("EagleCamera1"):
+            cmds.delete("EagleCamera1")
+
+        camera_transform = cmds.camera(name="EagleCamera1")[0]  # transform node
+        camera_shapes = cmds.listRelatives(camera_transform, shapes=True) or []
+        if camera_shapes:
+            # Rename to a stable, known shape name
+            camera_shape = cmds.rename(camera_shapes[0], "EagleCamera1Shape")
+        else:
+            print("Error: Camera shape not found!")
+            cmds.error("Camera shape missing after creation.")
+
+        # Toggle attributes on the SHAPE
+        cmds.setAttr(camera_shape + ".renderable", True)
+        cmds.setAttr(camera_shape + ".orthographic", True)
+        cmds.setAttr(camera_shape + ".orthographicWidth", 10.0)
+        print("Created camera:", camera_transform, "with shape:", camera_shape)
+
+        # === DETECT IF THIS IS A FLAT PLANE FOR EFFECTS FILES AND ADJUST CAMERA ===
+
+        flat_axis = None
+        if is_effects_file:
+            x = bbox_width
+            y = bbox_height
+            z = bbox_depth
+
+            flat_candidates = []
+            if x < 0.05 * y or x < 0.05 * z:
+                flat_candidates.append(('X', x))
+            if y < 0.05 * x or y < 0.05 * z:
+                flat_candidates.append(('Y', y))
+            if z < 0.05 * x or z < 0.05 * y:
+                flat_candidates.append(('Z', z))
+
+            if flat_candidates:
+                flat_axis = min(flat_candidates, key=lambda t: t[1])[0]
+                print("Flat axis detected by ratio:", flat_axis)
+
+        # === COMPUTE OVERALL BOUNDING BOX OF EXISTING MESHES ===
+
+        known_bboxes = []
+        bbox_targets = []
+        if not views_lower or 'front' in views_lower:
+            known_bboxes.append(bbox)
+        for n in (dup_left, dup_top, dup_back):
+            if n and n in view_bboxes:
+                known_bboxes.append(view_bboxes[n])
+            elif n and cmds.objExists(n):
+                bbox_targets.append(n)
+        if bbox_targets:
+            known_bboxes.append(cmds.exactWorldBoundingBox(*bbox_targets))
+        if not known_bboxes:
+            known_bboxes = [bbox]
+
+        overall_bbox = union_bbox(known_bboxes)
+        ov_x_min, ov_y_min, ov_z_min, ov_x_max, ov_y_max, ov_z_max = overall_bbox
+        margin = 1.05
+        overall_bb_width  = max((ov_x_max - ov_x_min) * margin, 0.01)
+        overall_bb_height = max((ov_y_max - ov_y_min) * margin, 0.01)
+        overall_bb_depth  = max((ov_z_max - ov_z_min) * margin, 0.01)
+
+        # === COMPUTE ASPECT RATIO BASED ON BOUNDING BOX SHAPE, COMPUTE PIXEL HEIGHT ===
+
+        dynamic_aspect = overall_bb_width / overall_bb_height
+        pixel_height = max(2, int(1920 / dynamic_aspect))
+        print("Overall bounding box Width:", overall_bb_width)
+        print("Corrected bounding box Height:", overall_bb_height)
+        print("Dynamic aspect ratio:", dynamic_aspect)
+        print("Clamped pixel height:", pixel_height)
+
+        # === SET CAMERA RESOLUTION, ORTHOGRAPHIC WIDTH AND ASPECT RATIO ===
+
+        cmds.setAttr("defaultResolution.width", 1920)
+        cmds.setAttr("defaultResolution.height", pixel_height)
+        cmds.setAttr(f"{camera_shape}.orthographicWidth", overall_bb_width)
+        cmds.setAttr("defaultResolution.deviceAspectRatio", dynamic_aspect)
+        print("Render resolution set to 1920 x", pixel_height)
+        print("Orthographic width set to:", overall_bb_width)
+        # Set the near clip plane to 0.001
+        #cmds.setAttr(f"{camera_shape}.nearClipPlane", 0.001)
+
+        # === AUTO-CENTER CAMERA BASED ON FLATNESS OR DEFAULT ===
+
+        if is_effects_file and flat_axis:
+            print("[Camera] Auto-orienting camera for flat effects plane...")
+            center_x = (ov_x_min + ov_x_max) / 2.0
+            center_y = (ov_y_min + ov_y_max) / 2.0
+            center_z = (ov_z_min + ov_z_max) / 2.0
+
+            if flat_axis == 'Z':
+                # Camera looking at front face from +Z
+                cam_pos = [center_x, center_y, ov_z_max + 100]
+                cam_rot = [0, 0, 0]
+                ortho_width = max(overall_bb_width, overall_bb_height) * 1.05
+                dynamic_aspect = overall_bb_width / overall_bb_height
+
+            elif flat_axis == 'X':
+                # Camera looking at side face from +X
+                cam_pos = [ov_x_max + 100, center_y, center_z]
+                cam_rot = [0, 90, 0]
+                ortho_width = max(overall_bb_depth, overall_bb_height) * 1.05
+                dynamic_aspect = overall_bb_depth / overall_bb_height
+
+            elif flat_axis == 'Y':
+                # Camera looking from above
+                cam_pos = [center_x, ov_y_max + 100, center_z]
+                cam_rot = [-90, 0, 0]
+                ortho_width = max(overall_bb_width, overall_bb_depth) * 1.05
+                dynamic_aspect = overall_bb_width / overall_bb_depth
+
+            if ortho_width < 0.0001:
+                ortho_width = 0.01
+            pixel_height = int(1920 / dynamic_aspect)
+            cmds.xform(camera_transform, ws=True, t=cam_pos)
+            cmds.setAttr(f"{camera_transform}.rotateX", cam_rot[0])
+            cmds.setAttr(f"{camera_transform}.rotateY", cam_rot[1])
+            cmds.setAttr(f"{camera_transform}.rotateZ", cam_rot[2])
+            cmds.setAttr(camera_shape + ".orthographicWidth", overall_bb_width)
+            print(f"[Camera] Camera positioned at {cam_pos} with rotation {cam_rot}")
+            print(f"[Camera] Ortho width: {ortho_width}, aspect: {dynamic_aspect}, height: {pixel_height}")
+
+        else:
+            # Default camera placement for non-flat objects
+            center_x = (ov_x_min + ov_x_max) / 2.0
+            center_y = (ov_y_min + ov_y_max) / 2.0
+            global_z_max = ov_z_max
+            cam_pos = (center_x, center_y, global_z_max + 100)
+            cmds.xform(camera_transform, ws=True, t=cam_pos)
+            dynamic_aspect = overall_bb_width / overall_bb_height
+            pixel_height = int(1920 / dynamic_aspect)
+            cmds.setAttr(f"{camera_shape}.orthographicWidth", overall_bb_width)
+            print("[Camera] Default camera positioning:", cam_pos)
+            print(f"[Camera] Default ortho width: {overall_bb_width}, aspect: {dynamic_aspect}, height: {pixel_height}")
+
+        # === SET ORTHO AS THE RENDERABLE CAMERA ===
+
+        # Disable renderable on all camera shapes
+        for cam_shape in (cmds.ls(type="camera") or []):
+            try:
+                cmds.setAttr(cam_shape + ".renderable", 0)
+            except Exception:
+                pass
+        # Enable only our camera's SHAPE
+        try:
+            cmds.setAttr(camera_shape + ".renderable", 1)
+        except Exception:
+            pass
+        # We'll pass the TRANSFORM to Render.exe
+        render_cam_transform = camera_transform
+        print("[Camera] Using transform for Render.exe:", render_cam_transform)
+
+        # === SET OTHER CAMERA SETTINGS ===
+
+        cmds.setAttr("hardwareRenderingGlobals.multiSampleEnable", 1)  # Enable anti-aliasing
+        cmds.setAttr("hardwareRenderingGlobals.multiSampleCount", 16)  # Higher = better smoothing (16 is a good balance)
+        cmds.setAttr("defaultRenderGlobals.imageFormat", 32)  # Set high-quality PNG output (lossless)
+        cmds.setAttr("hardwareRenderingGlobals.enableTextureMaxRes", 1)  # Enable high-quality textures
+        if texture_max_res:
+            # Retry after a texture memory crash: cap the texture size Hardware 2.0 loads
+            cmds.setAttr("hardwareRenderingGlobals.textureMaxResolution", texture_max_res)
+            print(f"[Retry] Capping texture resolution at {texture_max_res}")
+        cmds.setAttr("hardwareRenderingGlobals.transparencyAlgorithm", 2)  # Best transparency handling
+        cmds.setAttr("defaultRenderGlobals.animation", 0)  # Ensure animation is off (single frame)
+        cmds.setAttr("defaultRenderGlobals.startFrame", 1) # Ensure the renderable frame
+        cmds.setAttr("defaultRenderGlobals.endFrame", 1) # Ensure the renderable frame
+        cmds.setAttr("defaultRenderGlobals.extensionPadding", 0)  # Prevents ".0001" type suffix
+        cmds.setAttr("defaultRenderGlobals.periodInExt", 1) # Prevents ".1" suffix
+        cmds.setAttr("defaultRenderGlobals.currentRenderer", "mayaHardware2", type="string") # Use Maya Hardware 2.0
+
+        # === EXTRACT MESH-SHADER-TEXTURE DATA FROM ALL MESHES UNDER GRP_GEO ===
+
+        SHADERFX_TEXTURE_ATTRS = ('.DiffuseMap', '.LightmapMap', '.SpecularMap','.DirtMap', '.SecondDiffuseMap', '.Diffuse','.SecondaryMaps', '.ColorMap', '.Mask')
+        shader_texture_data = {}
+
+        # Get all meshes under grp_geo (from the index, so the view instances are not counted again)
+        meshes_under_grp_geo = meshes_under(scene_index, grp_geo_name)
+        tagged_outfit_parts = set()
+        if is_outfit_file or is_hair_file:
+            # If this is an outfit or hair file perform outfit tag check: nearest ancestor named after an outfit slot
+            outfit_parts = set(TagMatcherEagle.load_vocabulary()["outfit_parts"])
+            for m in meshes_under_grp_geo:
+                for parent in reversed(scene_index["meshes"][m]["ancestors"]):
+                    short_name = parent.upper()
+                    if short_name in outfit_parts:
+                        tagged_outfit_parts.add(short_name)
+                        break
+
+        # Get shaders connected to those meshes
+        connected_shaders = set()
+        shader_to_meshes = {}
+        for mesh in meshes_under_grp_geo:
+            for shader in scene_index["mesh_shaders"].get(mesh, []):
+                connected_shaders.add(shader)
+                shader_to_meshes.setdefault(shader, []).append(mesh)
+
+        # Gather texture data for the relevant shaders
+        for shader in connected_shaders:
+            shader_texture_data[shader] = []
+            for attr in SHADERFX_TEXTURE_ATTRS:
+                try:
+                    filePath = cmds.getAttr('{}{}'.format(shader, attr))
+                    #filePath = cmds.getAttr(shader + attr)
+                    if filePath:
+                        shader_texture_data[shader].append({
+                            'attribute': attr,
+                            'filePath': re.sub(r'//+', '/', filePath)
+                        })
+                except Exception as e:
+                    print(f"Skipping {shader}{attr} due to error: {e}")
+                    continue
+
+        # Existence, format and size of every texture in one query of the shared texture index,
+        # which only stats the textures no job has checked in the last minute
+        texture_paths = sorted({t['filePath'] for texlist in shader_texture_data.values() for t in texlist})
+        texture_info = {}
+        try:
+            texture_index = TextureIndexEagle.TextureIndex()
+            try:
+                texture_info = texture_index.lookup(texture_paths)
+            finally:
+                texture_index.close()
+        except Exception as e:
+            print(f"Warning: Texture index unavailable, checking textures directly: {e}")
+            texture_info = {path: {'exists': os.path.exists(path)} for path in texture_paths}
+
+        # === TEXTURE MEMORY PRE-FLIGHT ===
+
+        # Scenes whose textures would not fit in GPU memory crash Hardware 2.0 on every attempt,
+        # so cap their texture resolution (or swap in cached proxies) before rendering
+        texture_mb, budget_cap = TextureIndexEagle.plan_texture_budget(texture_info, texture_budget_mb, texture_max_res)
+        proxies = 0
+        if budget_cap:
+            print(f"[Textures] Estimated {texture_mb:.0f} MB of textures, over the {texture_budget_mb:.0f} MB budget; "
+                  f"limiting textures to {budget_cap} ({texture_budget_mode}).")
+            use_cap = texture_budget_mode != "proxy"
+            if not use_cap:
+                for shader, textures in shader_texture_data.items():
+                    for tex in textures:
+                        info = texture_info.get(tex['filePath']) or {}
+                        if not info.get('exists') or max(info.get('width') or 0, info.get('height') or 0) <= budget_cap:
+                            continue
+                        proxy = make_texture_proxy(tex['filePath'], info, budget_cap)
+                        try:
+                            if not proxy:
+                                raise RuntimeError("no proxy")
+                            cmds.setAttr(f"{shader}{tex['attribute']}", proxy, type="string")
+                            proxies += 1
+                        except Exception as e:
+                            print(f"[Textures] Keeping {tex['filePath']} on {shader}{tex['attribute']}: {e}")
+                            use_cap = True
+            if use_cap:
+                cmds.setAttr("hardwareRenderingGlobals.enableTextureMaxRes", 1)
+                cmds.setAttr("hardwareRenderingGlobals.textureMaxResolution", budget_cap)
+        emit_event("texture_budget", estimated_mb=round(texture_mb, 1), budget_mb=texture_budget_mb,
+                   cap=budget_cap, mode=texture_budget_mode, proxies=proxies)
+
+        # === CREATE TAGS FROM SHADER TEXTURE MESH DATA ===
+
+        keywords = []
+        rigUsed = ""
+        rig_tag = ""
+        if not shader_texture_data:
+            tagslist = []
+        else:
+            for shader, textures in shader_texture_data.items():
+                texture_names = [os.path.basename(tex['filePath']).replace('.png', '').lower() for tex in textures]
+                meshes = shader_to_meshes.get(shader, [])
+                cleaned_meshes = [scene_index["meshes"][m]["ancestors"][-1].lower() for m in meshes]
+                keywords.extend(texture_names + cleaned_meshes + [shader.lower()])
+            # Separated, so a tag never matches across two names
+            keywords_string = ' '.join(keywords)
+
+            print("keywords_string:")
+            print(keywords_string)
+
+            # One pass over the keywords for the whole vocabulary (eagle_tags.json), then the
+            # female/male, mask and outfit part rules
+            tagslist = TagMatcherEagle.tag_matcher().find(keywords_string, word_boundary=tag_word_boundary)
+            tagslist = TagMatcherEagle.apply_tag_rules(tagslist, tagged_outfit_parts)
+
+            # Save character and creature rig name for notes to be added later
+            if is_character_file or is_creature_file:
+                if grp_geo_name:
+                    if cmds.referenceQuery(grp_geo_name, isNodeReferenced=True):
+                        ref_node = cmds.referenceQuery(grp_geo_name, referenceNode=True)
+                        rigUsed = str(ref_node)
+                        rig_tag = re.sub(r'_?rn$', '', rigUsed, flags=re.IGNORECASE)
+                    else:
+                        print('grp_geo is a local node, not a reference')
+                else:
+                    print('grp_geo not found')
+            print("")
+            print("Tags:")
+            print (tagslist)
+
+        # === ADD LIGHTS TO ML_ RENDER LAYERS ===
+
+        light_root = "characterLights_template:Lights" if cmds.objExists("characterLights_template:Lights") else None
+        for render_layer in ml_render_layers:
+            try:
+                cmds.editRenderLayerGlobals(currentRenderLayer=render_layer)
+                if light_root:
+                    cmds.editRenderLayerMembers(render_layer, light_root, noRecurse=False)
+                    shapes = cmds.listRelatives(light_root, ad=True, type="shape", f=True) or []
+                    if shapes:
+                        cmds.editRenderLayerMembers(render_layer, shapes, noRecurse=True)
+                    print(f"Added lights to {render_layer}: {light_root}")
+                else:
+                    print("No valid light group found to add.")
+            except RuntimeError as e:
+                print(f"Failed to add lights to {render_layer}: {e}")
+
+        mark_phase("render")
+
+        # === SAVE A TEMPORARY SCENE TO RENDER ===
+
+        filename = os.path.splitext(os.path.basename(original_scene))[0]
+        render_exe = RENDER_EXE
+        scene_file = original_scene
+        # Render.exe log for this job only; the engine compresses it with the job log
+        log_file = spec["render_log"]
+
+        # === NAME EACH RENDER LAYER'S IMAGE AND DELETE IMAGES IF THE NAME ALREADY EXISTS ===
+
+        # One Render.exe call renders every layer, so each layer gets its own image prefix
+        # (a layer override on ML_ layers) instead of passing -im per call
+        layer_outputs = []
+        for render_layer in dict.fromkeys(render_layers_to_process):
+            print(f"Setting render layer: {render_layer}")
+            _is_ref = False
+            try:
+                try:
+                    _is_ref = cmds.referenceQuery(render_layer, isNodeReferenced=True)
+                except Exception:
+                    _is_ref = False
+                if not (render_layer == "defaultRenderLayer" and _is_ref):
+                    cmds.editRenderLayerGlobals(currentRenderLayer=render_layer)
+                else:
+                    print(f"[Layer] '{render_layer}' is referenced; skipping set-current; relying on -rl.")
+            except Exception as _e:
+                print(f"[Layer] Could not set currentRenderLayer='{render_layer}': {_e}")
+            if render_layer == "defaultRenderLayer":
+                filename_with_layer = filename
+            else:
+                layer_suffix = render_layer.replace("ML_", "")
+                filename_with_layer = f"{os.path.splitext(filename)[0]}_{layer_suffix}"
+
+            try:
+                if render_layer != "defaultRenderLayer":
+                    cmds.editRenderLayerAdjustment("defaultRenderGlobals.imageFilePrefix", layer=render_layer)
+                cmds.setAttr("defaultRenderGlobals.imageFilePrefix", filename_with_layer, type="string") # Name files with a prefix
+            except Exception as _e:
+                print(f"[Layer] Could not set image prefix for '{render_layer}': {_e}")
+            # the previous image is left in place: finalize_render_outputs only replaces it with
+            # an image this run wrote, so a failed render keeps the last good one
+            expected_output = os.path.join(output_dir, f"{filename_with_layer}.png").replace(os.sep, "/")
+            print(f"Render for {render_layer} will be saved to: {expected_output}")
+            layer_outputs.append((render_layer, filename_with_layer))
+
+        try:
+            cmds.editRenderLayerGlobals(currentRenderLayer=layer_outputs[0][0])
+        except Exception:
+            pass
+
+        # === OPTIONALLY RENDER INSIDE THIS MAYA SESSION WITH HARDWARE 2.0 ===
+
+        # Skips the temp scene save and the second scene load in Render.exe; any failure falls back to Render.exe
+        rendered_in_process = False
+        if render_backend == "inprocess":
+            try:
+                for render_layer, filename_with_layer in layer_outputs:
+                    try:
+                        if not (render_layer == "defaultRenderLayer" and cmds.referenceQuery(render_layer, isNodeReferenced=True)):
+                            cmds.editRenderLayerGlobals(currentRenderLayer=render_layer)
+                    except Exception:
+                        pass
+                    print(f"[InProcess] Rendering layer {render_layer} through {render_cam_transform}")
+                    image_path = cmds.ogsRender(
+                        camera=render_cam_transform,
+                        currentFrame=True,
+                        width=1920,
+                        height=int(pixel_height),
+                        layer=render_layer,
+                        enableMultisample=True,
+                        noRenderView=True
+                    )
+                    if not image_path or not os.path.exists(image_path):
+                        raise RuntimeError(f"ogsRender wrote no image for layer {render_layer}")
+                    final_path = os.path.join(output_dir, clean_image_name(filename_with_layer))
+                    if os.path.exists(final_path):
+                        os.remove(final_path)
+                    shutil.move(image_path, final_path)
+                    print(f"[InProcess] Wrote {final_path}")
+                    emit_event("layer_rendered", layer=render_layer, backend="inprocess")
+                rendered_in_process = True
+            except Exception as e:
+                print(f"[InProcess] Hardware 2.0 render failed, falling back to Render.exe: {e}")
+            try:
+                cmds.editRenderLayerGlobals(currentRenderLayer=layer_outputs[0][0])
+            except Exception:
+                pass
+
+        if not rendered_in_process:
+            cmds.file(rename=temp_scene_path)
+            cmds.file(save=True, type=scratch_format)
+            print(f"Temporary scene saved: {temp_scene_path}")
+
+            # === RENDER ALL LAYERS WITH ONE RENDER.EXE CALL ===
+
+            render_cmd = [
+                render_exe,
+                "-r", "hw2",
+                "-s", "1", "-e", "1",
+                "-x", "1920", "-y", str(int(pixel_height)),
+                "-cam", render_cam_transform,
+                "-rd", output_dir,
+                "-of", "png",
+                "-fnc", "3",
+                "-rl", ",".join(layer for layer, _ in layer_outputs),
+                "-log", log_file,
+                temp_scene_path
+            ]
+
+            print("Executing Render.exe with command:")
+            print(" ".join(render_cmd))
+
+            render_started_at = time.time()
+            process = subprocess.run(render_cmd, shell=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+            # bail out if Render.exe failed, stop rendering this scene
+            if process.returncode != 0:
+                print(f"Render.exe failed with exit code {process.returncode}")
+                print(process.stderr)
+                sys.exit(process.returncode)
+
+            print("Render.exe Errors:")
+            print(process.stderr)
+            for render_layer, _ in layer_outputs:
+                emit_event("layer_rendered", layer=render_layer, backend="renderexe")
+
+            # === MOVE THIS JOB'S IMAGES TO THEIR EAGLE NAMES (FRAME SUFFIX, PREFIX, _RIG AND LAYER FOLDER REMOVED) ===
+
+            for render_layer in finalize_render_outputs(output_dir, layer_outputs, render_started_at):
+                print(f"Warning: Render.exe output for layer {render_layer} not found under {output_dir}")
+
+        mark_phase("record")
+
+        # === RECORD JSON DATA FOR EACH LAYER'S IMAGE ===
+
+        for render_layer, filename_with_layer in layer_outputs:
+            imglink = os.path.join(output_dir, filename_with_layer + ".png").replace(os.sep, "/")
+            if "/Potter" in imglink:
+                p4_link = "//Potter" + imglink.split("/Potter", 1)[1]
+            else:
+                p4_link = imglink
+            filename = os.path.basename(imglink)
+            dirname = os.path.dirname(imglink)
+            clean_filename  = re.sub(r'^(c_|o_|p_|fx_|.+?_)', '', filename)
+            clean_filename  = re.sub(r'_rig(?=\.png$)', '', os.path.basename(clean_filename ))
+            image_key = os.path.splitext(clean_filename )[0]
+            imglink = os.path.join(dirname, clean_filename ).replace(os.sep, "/")
+            if not os.path.exists(imglink):
+                print(f"Warning: Expected image for layer {render_layer} not found: {imglink}")
+            else:
+                emit_event("image_written", layer=render_layer, path=imglink)
+            scene_relative_path = scene_file.replace("\\", "/").split("/Perforce/Potter/Art/3D/", 1)[-1]
+            malink = f"//Potter/Art/3D/{scene_relative_path}"
+
+            render_data[image_key] = {
+                "imglink": imglink,
+                "malink": malink,
+                "poly_count": poly_count,
+                "bounding_box": [bbox_width, bbox_height, bbox_depth],
+                "file_type": file_type
+            }
+
+            # Add rig used found in file
+            if rigUsed:
+                render_data[image_key]["rig_used"] = rig_tag.lower()
+            else:
+                render_data[image_key]["rig_used"] = ""
+            # Add tags found in file
+            for i, tag in enumerate(tagslist):
+                render_data[image_key][f"tag{i + 1}"] = tag
+
+            print(f"Recorded JSON data for image: {image_key}")
+
+        # === WRITE EAGLE JSON FILE ===
+
+        base_library = os.path.join(os.path.splitdrive(output_dir)[0] + os.sep, "Perforce", "Potter", "Art", "EagleFiles")
+        library_root = os.path.join(base_library, file_type.capitalize())
+        json_filename = f"render_data_{file_type.lower()}.json"
+        json_file = os.path.join(library_root, json_filename)
+
+        # Parallel render jobs share the category, so append this scene to its journal instead of
+        # rewriting the whole JSON; the engine compacts it into json_file when the batch finishes
+        render_data_recorded = False
+        try:
+            RenderDataStoreEagle.RenderDataStore(json_file).upsert(render_data, source=scene_file)
+            render_data_recorded = True
+            print("Render JSON data recorded for:", json_file)
+        except Exception as e:
+            print(f"Error: Failed to record render data for {json_file}: {e}")
+
+        # === WRITE SUMMARY JSON DATA ===
+        try:
+            asset_name = os.path.splitext(os.path.basename(original_scene))[0]
+            num_shaders = len(connected_shaders)
+            num_textures = sum(len(v) for v in shader_texture_data.values())
+            missing_textures = any(not info['exists'] for info in texture_info.values())
+            scene_rel = original_scene.replace(os.sep, "/").split("/Perforce/", 1)[-1]
+            p4_path = f"//{scene_rel}"
+            mark_phase("summary")
+
+            summary = {
+                "type": file_type,                 # e.g. "props", "effects"
+                "asset": asset_name,               # scene name minus .ma
+                "path": p4_path,                   # Perforce-style path
+                "polycount": poly_count,
+                "num_textures": num_textures,
+                "num_shaders": num_shaders,
+                "missing_textures": missing_textures,
+                "textures": texture_paths,         # checked by the render cache on the next run
+                "images": [entry["imglink"] for entry in render_data.values()],
+                "phases": phase_times,
+                "layer_repair": layer_repair,
+                "render_data_file": json_file,
+                "render_data_recorded": render_data_recorded,
+                "peak_memory_mb": memory_mb(peak=True)
+            }
+            emit_event("summary", summary=summary)
+        except Exception as e:
+            print("Failed to emit summary:", e)
+
+        norm_outdir = output_dir.replace(os.sep, "/")
+        print("Render complete! Check directory: " + norm_outdir)
+        mark_phase(None)
+
+    except Exception as e:
+        traceback.print_exc()
+        print(f"Error occurred: {e}")
+        sys.exit(1)
+
+    finally:
+        # === CLEANUP: REMOVE SCRATCH SCENES, WHETHER THE JOB SUCCEEDED OR NOT ===
+        # (the engine also deletes the whole scratch folder once the job is finished)
+        for path in (temp_scene_path, export_path, rehost_path):
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+                    print(f"Temporary scene deleted: {path}")
+            except OSError as e:
+                print(f"Could not delete temporary scene {path}: {e}")
+
+
+def run_job(spec):
+    """Render one job spec and return its exit code instead of exiting the process."""
+    try:
+        render_scene(spec)
+        return 0
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+
+
+def reset_scene():
+    """Return the session to an empty scene between jobs: drop the render camera, unload references, new file."""
+    import maya.cmds as cmds
+    try:
+        if cmds.objExists("EagleCamera1"):
+            cmds.delete("EagleCamera1")
+    except Exception as e:
+        print("[Reset] Could not delete EagleCamera1:", e)
+    for ref_node in cmds.ls(type="reference") or []:
+        try:
+            if cmds.referenceQuery(ref_node, isLoaded=True):
+                cmds.file(unloadReference=ref_node)
+        except RuntimeError:
+            # sharedReferenceNode and orphaned reference nodes have no file to unload
+            pass
+    try:
+        cmds.file(new=True, force=True)
+    except Exception as e:
+        print("[Reset] Could not reset scene:", e)
+
+
+def run_batch(spec_paths):
+    """
+    Render several job specs one after another in this Maya session, resetting it between scenes.
+    Each scene's result is reported as a DAEMON_TAG job_done message carrying its index in
+    spec_paths, so a batch that dies part way tells the engine exactly which scenes never ran.
+    """
+    for index, spec_path in enumerate(spec_paths):
+        if index:
+            reset_phases()
+            mark_phase("init")
+        start_time = time.time()
+        try:
+            with open(spec_path, "r") as f:
+                spec = json.load(f)
+        except Exception as e:
+            print(f"[Batch] Could not read job spec {spec_path}: {e}")
+            exit_code = 1
+        else:
+            print(f"[Batch] Scene {index + 1} of {len(spec_paths)}: {spec.get('scene_file')}")
+            exit_code = run_job(spec)
+        reset_scene()
+        send_daemon_message({"event": "job_done", "index": index, "exit_code": exit_code,
+                             "seconds": time.time() - start_time, "memory_mb": memory_mb()})
+    return 0
+
+
+def serve(max_jobs, max_memory_growth_mb):
+    """
+    Persistent worker: run job specs sent as JSON lines on stdin, one at a time, and report
+    each result as a DAEMON_TAG message. Exits to be recycled after max_jobs jobs or once
+    memory has grown by max_memory_growth_mb.
+    """
+    baseline_mb = memory_mb()
+    jobs_done = 0
+    send_daemon_message({"event": "ready", "pid": os.getpid(), "memory_mb": baseline_mb})
+
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            break
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError:
+            print("[Daemon] Ignoring malformed message:", line)
+            continue
+
+        command = message.get("cmd")
+        if command == "quit":
+            break
+        if command == "ping":
+            send_daemon_message({"event": "pong", "jobs_done": jobs_done, "memory_mb": memory_mb()})
+            continue
+        if command != "job":
+            print("[Daemon] Unknown command:", command)
+            continue
+
+        job_id = message.get("job_id")
+        spec = message.get("spec") or {}
+        print(f"[Daemon] Starting job {job_id}: {spec.get('scene_file')} -> {spec.get('output_dir')} views={spec.get('views')}")
+        start_time = time.time()
+        reset_phases()
+        mark_phase("init")
+        exit_code = run_job(spec)
+
+        # Reset the session so the next job starts from an empty scene
+        reset_scene()
+
+        jobs_done += 1
+        current_mb = memory_mb()
+        send_daemon_message({"event": "job_done", "job_id": job_id, "exit_code": exit_code,
+                             "seconds": time.time() - start_time, "memory_mb": current_mb})
+
+        if jobs_done >= max_jobs or (max_memory_growth_mb and current_mb - baseline_mb > max_memory_growth_mb):
+            send_daemon_message({"event": "recycle", "jobs_done": jobs_done, "memory_mb": current_mb})
+            break
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maya-side render job for MayaToEagleTool.")
+    parser.add_argument("--job", help="Path of a job spec JSON file to render")
+    parser.add_argument("--jobs", nargs="+", help="Paths of several job spec JSON files to render in turn")
+    parser.add_argument("--daemon", action="store_true", help="Serve job specs from stdin until told to quit")
+    parser.add_argument("--max-jobs", type=int, default=25)
+    parser.add_argument("--max-memory-growth-mb", type=float, default=4096)
+    args = parser.parse_args(argv)
+    if not args.job and not args.jobs and not args.daemon:
+        parser.error("one of --job, --jobs or --daemon is required")
+
+    reset_phases()
+    mark_phase("init")
+    initialize_maya()
+    try:
+        if args.daemon:
+            exit_code = serve(args.max_jobs, args.max_memory_growth_mb)
+        elif args.jobs:
+            exit_code = run_batch(args.jobs)
+        else:
+            with open(args.job, "r") as f:
+                spec = json.load(f)
+            exit_code = run_job(spec)
+    finally:
+        uninitialize_maya()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# MayaToEagleBatch.py
+"""
+Headless batch runner: scan, plan, render, sync Google Sheets and optionally upload to Eagle
+without Qt, e.g. from a scheduled task or a render node.
+
+    python MayaToEagleBatch.py --folder D:/Perforce/Potter/Art/3D/Props --mode "Re-Render Changed Only" --concurrency 4
+
+Progress is printed to stdout as one JSON object per line; Maya and tool logs go to stderr.
+Exit code is 0 when every job succeeded, 1 when any job failed and 2 when nothing could be planned.
+"""
+
+import sys
+import json
+import argparse
+
+import RenderEngineEagle
+import RenderPlanEagle
+import JobLogEagle
+import TextureIndexEagle
+
+CATEGORIES = ["Characters", "Creatures", "Effects", "Hair", "Outfits", "Props"]
+
+
+def emit(event):
+    sys.stdout.write(json.dumps(event) + "\n")
+    sys.stdout.flush()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render Maya scenes to Eagle without the GUI.")
+    parser.add_argument("--folder", required=True, help="Folder searched recursively for *_rig.ma scenes")
+    parser.add_argument("--category", action="append", choices=CATEGORIES,
+                        help="Only render (and upload) this Eagle library; may be repeated")
+    parser.add_argument("--mode", choices=RenderPlanEagle.RERENDER_MODES, default="Render New Entries Only",
+                        help="Rerender mode, as in the GUI's Render Options")
+    parser.add_argument("--concurrency", type=int, default=RenderEngineEagle.DEFAULT_RENDER_WORKERS,
+                        help="Number of scenes rendered at the same time")
+    parser.add_argument("--backend", choices=sorted(RenderEngineEagle.RENDER_BACKENDS.values()), default="renderexe",
+                        help="Render backend passed to the Maya script")
+    parser.add_argument("--persistent", action="store_true", help="Keep Maya loaded between scenes")
+    parser.add_argument("--scenes-per-process", type=int, default=RenderEngineEagle.DEFAULT_SCENES_PER_PROCESS,
+                        help="Without --persistent, render up to this many props, effects or hair scenes "
+                             "in one mayapy process")
+    parser.add_argument("--scratch-dir", default=None,
+                        help="Root for per-scene scratch folders, e.g. a local NVMe or tmpfs path "
+                             f"(default: ${RenderEngineEagle.SCRATCH_ROOT_ENV} or the system temp dir)")
+    parser.add_argument("--scratch-format", choices=sorted(RenderEngineEagle.SCRATCH_FORMATS),
+                        default=RenderEngineEagle.DEFAULT_SCRATCH_FORMAT,
+                        help="Maya file format of the scratch scenes handed to Render.exe")
+    parser.add_argument("--timeout", type=float, default=RenderEngineEagle.JOB_TIMEOUT_SECONDS,
+                        help="Kill a scene's Maya process tree after this many seconds (0 disables)")
+    parser.add_argument("--no-output-timeout", type=float, default=RenderEngineEagle.JOB_NO_OUTPUT_TIMEOUT_SECONDS,
+                        help="Kill a scene that printed nothing for this many seconds (0 disables)")
+    parser.add_argument("--max-attempts", type=int, default=RenderEngineEagle.MAX_JOB_ATTEMPTS,
+                        help="Attempts per scene for retryable failures (texture crashes, timeouts)")
+    parser.add_argument("--texture-budget-mb", type=float, default=TextureIndexEagle.DEFAULT_TEXTURE_BUDGET_MB,
+                        help="Estimated texture memory above which a scene renders with reduced textures (0 disables)")
+    parser.add_argument("--texture-budget-mode", choices=TextureIndexEagle.TEXTURE_BUDGET_MODES, default="cap",
+                        help="Reduce over-budget textures by capping Hardware 2.0's texture resolution "
+                             "or with cached downscaled proxies")
+    parser.add_argument("--skip-reference-pattern", action="append", dest="skip_reference_patterns", metavar="PATTERN",
+                        help="Path fragment of references to leave unloaded when no reference is recognized "
+                             "as defining grp_geo; may be repeated and replaces the default list "
+                             f"({', '.join(RenderEngineEagle.MayaRenderJob.SKIP_REFERENCE_PATTERNS)})")
+    parser.add_argument("--tag-word-boundary", action="store_true",
+                        help="Only tag whole words of texture, mesh and shader names, not any substring")
+    parser.add_argument("--rerender-deleted", action="store_true", help="Also render assets marked deleted in Sheets")
+    parser.add_argument("--dry-run", action="store_true", help="Print the job plan without starting Maya")
+    parser.add_argument("--upload", action="store_true", help="Upload the rendered categories to Eagle afterwards")
+    parser.add_argument("--quiet", action="store_true", help="Do not echo Maya and tool logs to stderr")
+    parser.add_argument("--log-level", choices=sorted(JobLogEagle.SEVERITY_NAMES, key=JobLogEagle.SEVERITY_NAMES.get),
+                        default="info", help="Lowest severity echoed to stderr; per-scene logs always keep everything")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    min_severity = JobLogEagle.SEVERITY_NAMES[args.log_level]
+
+    def log(text):
+        if args.quiet:
+            return
+        lines = [line for line in str(text).split("\n") if JobLogEagle.classify_line(line) >= min_severity]
+        if lines:
+            sys.stderr.write("\n".join(lines) + "\n")
+            sys.stderr.flush()
+
+    failures = []
+
+    def on_event(event):
+        if event['event'] == 'job_finished' and event['exit_code'] != 0:
+            failures.append(event['asset'])
+        emit(event)
+
+    engine = RenderEngineEagle.RenderEngine(log=log, on_event=on_event)
+    engine.max_workers = max(1, min(RenderEngineEagle.MAX_RENDER_WORKERS, args.concurrency))
+    engine.persistent = args.persistent
+    engine.scenes_per_process = max(1, min(RenderEngineEagle.MAX_SCENES_PER_PROCESS, args.scenes_per_process))
+    engine.render_backend = args.backend
+    if args.scratch_dir:
+        engine.scratch_root = args.scratch_dir
+    engine.scratch_format = args.scratch_format
+    engine.mode = args.mode
+    engine.rerender_deleted = args.rerender_deleted
+    engine.tag_word_boundary = args.tag_word_boundary
+    if args.skip_reference_patterns:
+        engine.skip_reference_patterns = args.skip_reference_patterns
+    engine.texture_budget_mb = max(0.0, args.texture_budget_mb)
+    engine.texture_budget_mode = args.texture_budget_mode
+    engine.job_timeout = args.timeout
+    engine.no_output_timeout = args.no_output_timeout
+    engine.max_attempts = max(1, args.max_attempts)
+
+    plan = engine.build_job_plan(args.folder, args.category)
+    if plan is None:
+        emit({'event': 'error', 'message': f"Could not plan {args.folder}: no renderable scenes, "
+                                           "or Sheets is unavailable for this mode (see the log)"})
+        return 2
+
+    if args.dry_run:
+        for job in plan:
+            emit({
+                'event': 'planned',
+                'asset': job['asset'],
+                'scene_file': job['scene_file'],
+                'output_dir': job['output_dir'],
+                'sheet': job['sheet'],
+                'views': job['views'],
+                'action': job['action'],
+                'reason': job['reason'],
+            })
+        to_render = sum(1 for job in plan if job['action'] == 'render')
+        emit({'event': 'plan_summary', 'render': to_render, 'skip': len(plan) - to_render, 'total': len(plan)})
+        return 0
+
+    try:
+        engine.run(plan)
+    except KeyboardInterrupt:
+        engine.stop()
+        engine.render_cache.save()
+        engine.compact_render_data()
+        emit({'event': 'interrupted', 'finished': engine.finished_count})
+        return 130
+
+    if args.upload:
+        base_library = RenderEngineEagle.find_base_library(args.folder)
+        categories = args.category or sorted({job['sheet'] for job in plan if job['action'] == 'render'})
+        for category in categories:
+            ok = bool(base_library) and RenderEngineEagle.upload_category(base_library, category, log=log)
+            emit({'event': 'upload', 'category': category, 'ok': ok})
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
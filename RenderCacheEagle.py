@@ -0,0 +1,216 @@
+# RenderCacheEagle.py
+
+import os
+import re
+import json
+import hashlib
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "render_manifest.json"
+HASH_CACHE_FILENAME = "render_hash_cache.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Reference statements in a .ma header, e.g. file -rdi 1 -ns "x" -rfn "xRN" "C:/path/x.ma";
+_REFERENCE_PATH_RE = re.compile(r'"([^"]+\.(?:ma|mb|fbx|abc))"\s*;?\s*$', re.IGNORECASE)
+
+
+def default_cache_dir():
+    """Local (non-Perforce) folder for the tool's caches and databases."""
+    root = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    if not os.path.isdir(root):
+        root = tempfile.gettempdir()
+    path = os.path.join(root, "MayaToEagleTool")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _norm(path):
+    return os.path.normcase(os.path.normpath(path)).replace("\\", "/")
+
+
+def _stamp(path):
+    """(size, mtime) of a file, or None when it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime
+
+
+def file_digest(path):
+    """SHA-1 of a file, read in fixed-size chunks so large scenes never load into memory."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_reference_paths(scene_file):
+    """
+    Return the file paths referenced by a Maya ASCII scene.
+    Only the header is read: references are declared before the first createNode.
+    """
+    if not scene_file.lower().endswith(".ma"):
+        return []
+    paths = []
+    statement = None
+    scene_dir = os.path.dirname(scene_file)
+    with open(scene_file, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith("createNode") or stripped.startswith("requires"):
+                break
+            if statement is None:
+                if not stripped.startswith("file ") or " -r" not in stripped:
+                    continue
+                statement = stripped
+            else:
+                statement += " " + stripped
+            if statement.endswith(";"):
+                m = _REFERENCE_PATH_RE.search(statement)
+                if m:
+                    ref = os.path.expandvars(m.group(1))
+                    if not os.path.isabs(ref):
+                        ref = os.path.join(scene_dir, ref)
+                    paths.append(os.path.normpath(ref))
+                statement = None
+    return list(dict.fromkeys(paths))
+
+
+class RenderCache(object):
+    """
+    Local render manifest keyed by a hash of everything that feeds a render:
+    the .ma contents, its referenced files, the selected views, the Maya script version
+    and the render settings. File hashes are cached by (path, size, mtime). Textures are
+    too many to hash, so each entry keeps the (size, mtime) of the textures the render used.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.manifest_path = os.path.join(self.cache_dir, MANIFEST_FILENAME)
+        self.hash_cache_path = os.path.join(self.cache_dir, HASH_CACHE_FILENAME)
+        self.manifest = self._load(self.manifest_path)
+        self.hash_cache = self._load(self.hash_cache_path)
+        self._dirty = False
+
+    @staticmethod
+    def _load(path):
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write(path, data):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            self._write(self.manifest_path, self.manifest)
+            self._write(self.hash_cache_path, self.hash_cache)
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Could not save render cache: {e}")
+
+    # --- Hashing ---
+
+    def _file_entry(self, path):
+        """Return the cached [size, mtime, sha1, refs] entry for path, rehashing only when it changed."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = _norm(path)
+        entry = self.hash_cache.get(key)
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime:
+            return entry
+        try:
+            refs = read_reference_paths(path)
+        except OSError:
+            refs = []
+        entry = [st.st_size, st.st_mtime, file_digest(path), refs]
+        self.hash_cache[key] = entry
+        self._dirty = True
+        return entry
+
+    def _input_digests(self, scene_file):
+        """Digest of the scene plus every file it references (recursively), in a stable order."""
+        digests = []
+        pending = [scene_file]
+        seen = set()
+        while pending:
+            path = pending.pop(0)
+            key = _norm(path)
+            if key in seen:
+                continue
+            seen.add(key)
+            entry = self._file_entry(path)
+            if entry is None:
+                digests.append(f"{key}:missing")
+                continue
+            digests.append(f"{key}:{entry[2]}")
+            pending.extend(entry[3])
+        return digests
+
+    def scene_key(self, scene_file, views, script_version, settings):
+        h = hashlib.sha1()
+        for digest in self._input_digests(scene_file):
+            h.update(digest.encode("utf-8"))
+        h.update(json.dumps(sorted(v.lower() for v in (views or []))).encode("utf-8"))
+        h.update(str(script_version).encode("utf-8"))
+        h.update(json.dumps(settings or {}, sort_keys=True).encode("utf-8"))
+        return h.hexdigest()
+
+    # --- Manifest ---
+
+    def is_unchanged(self, scene_file, views, script_version, settings):
+        """
+        Return (unchanged, reason). A scene is unchanged when its input key matches the last
+        successful render and every texture it used and image it wrote still has the same size and mtime.
+        """
+        entry = self.manifest.get(_norm(scene_file))
+        if not entry:
+            return False, "no previous render recorded"
+        if entry.get("key") != self.scene_key(scene_file, views, script_version, settings):
+            return False, "scene, references, views or render settings changed"
+        images = entry.get("images") or {}
+        if not images:
+            return False, "previous render recorded no images"
+        for path, stamp in (entry.get("textures") or {}).items():
+            if _stamp(path) != (stamp and tuple(stamp)):
+                return False, f"texture changed: {path}"
+        for path, (size, mtime) in images.items():
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False, f"output image missing: {path}"
+            if st.st_size != size or st.st_mtime != mtime:
+                return False, f"output image changed: {path}"
+        return True, "inputs and output images unchanged"
+
+    def record(self, scene_file, views, script_version, settings, image_paths, texture_paths=None):
+        """Remember a successful render so an identical later run can be skipped."""
+        images = {}
+        for path in image_paths or []:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            images[path] = [st.st_size, st.st_mtime]
+        self.manifest[_norm(scene_file)] = {
+            "key": self.scene_key(scene_file, views, script_version, settings),
+            "images": images,
+            # a texture missing at render time is recorded as None, so adding it counts as a change
+            "textures": {path: _stamp(path) for path in texture_paths or []},
+        }
+        self._dirty = True
@@ -0,0 +1,181 @@
+# RenderDataStoreEagle.py
+"""
+Per-category store for the Eagle render data. Render jobs append each scene's entries to a
+JSONL journal next to render_data_<category>.json while holding an OS lock on a lock file
+(msvcrt on Windows, flock elsewhere), which costs the same however big the category is. Compaction folds the journal into the legacy JSON that
+UploadToEagle.py reads and empties the journal. The journal is compacted once it grows past
+COMPACT_JOURNAL_BYTES, when a batch finishes, and before an upload.
+Nothing here imports Maya, so MayaRenderJob uses it inside mayapy and the tool can use it too.
+"""
+
+import os
+import re
+import json
+import stat
+import time
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+LOCK_SUFFIX = ".lock"
+# Seconds to wait for another job's lock. The OS releases the lock of a process that dies, so a
+# crashed job never leaves one behind
+LOCK_TIMEOUT_SECONDS = 300
+# Journal size that triggers a compaction on the next upsert
+COMPACT_JOURNAL_BYTES = 4 * 1024 * 1024
+
+# "bounding_box": [\n 1.0,\n 2.0 ...] -> "bounding_box": [1.0, 2.0, ...]
+_BOUNDING_BOX_RE = re.compile(r'("bounding_box": )\[\s*([\d\.,\s]+?)\s*\]')
+
+
+class RenderDataLockTimeout(Exception):
+    """Another process held the category's lock for longer than the timeout; nothing was written."""
+
+
+def format_render_data(data):
+    """The legacy render_data JSON text: indented, with each bounding box on one line."""
+    return _BOUNDING_BOX_RE.sub(
+        lambda m: m.group(1) + '[' + ', '.join(item.strip() for item in m.group(2).split(',')) + ']',
+        json.dumps(data, indent=4)
+    )
+
+
+class RenderDataStore(object):
+    """
+    render_data for one category: the legacy JSON file is the snapshot and the journal holds the
+    scenes rendered since it was last compacted, one JSON line per upsert.
+    """
+
+    def __init__(self, json_path, log=print, lock_timeout=LOCK_TIMEOUT_SECONDS):
+        self.json_path = json_path
+        self.journal_path = os.path.splitext(json_path)[0] + JOURNAL_SUFFIX
+        self.lock_path = json_path + LOCK_SUFFIX
+        self.lock_timeout = lock_timeout
+        self.log = log
+        self._lock_fd = None
+        self._lock_depth = 0
+
+    # --- Locking ---
+
+    def __enter__(self):
+        if self._lock_depth == 0:
+            self._lock_fd = self._acquire()
+        self._lock_depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._lock_depth -= 1
+        if self._lock_depth == 0:
+            fd, self._lock_fd = self._lock_fd, None
+            try:
+                if os.name == "nt":
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+            finally:
+                # the lock file itself stays: deleting it could split waiters across two files
+                os.close(fd)
+        return False
+
+    def _acquire(self):
+        """
+        Open the lock file and take an exclusive OS lock on it. Returns its descriptor. Raises
+        RenderDataLockTimeout after lock_timeout seconds rather than writing unlocked.
+        """
+        fd = os.open(self.lock_path, os.O_CREAT | os.O_RDWR, 0o666)
+        deadline = time.time() + self.lock_timeout
+        while True:
+            try:
+                if os.name == "nt":
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except OSError:
+                if time.time() > deadline:
+                    os.close(fd)
+                    raise RenderDataLockTimeout(f"Timed out after {self.lock_timeout:.0f}s waiting for {self.lock_path}")
+                time.sleep(0.1)
+
+    # --- Reading ---
+
+    def _read_snapshot(self):
+        if not os.path.exists(self.json_path):
+            return {}
+        try:
+            with open(self.json_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.log(f"Error reading render data {self.json_path}: {e}")
+            return {}
+
+    def _replay_journal(self, data):
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        data.update(json.loads(line)["entries"])
+                    except (ValueError, KeyError, TypeError):
+                        # a job killed mid-write leaves a partial last line; everything before it still counts
+                        self.log(f"Warning: Skipping unreadable line {line_number} of {self.journal_path}")
+        except FileNotFoundError:
+            pass
+        return data
+
+    # --- Writing ---
+
+    def upsert(self, entries, source=None):
+        """
+        Add or replace entries (image key -> entry dict) with one appended journal line.
+        Raises RenderDataLockTimeout when the lock could not be taken; nothing is written then.
+        """
+        if not entries:
+            return
+        line = json.dumps({"t": round(time.time(), 3), "source": source, "entries": entries}) + "\n"
+        with self:
+            fd = os.open(self.journal_path, os.O_CREAT | os.O_APPEND | os.O_WRONLY, 0o666)
+            try:
+                os.write(fd, line.encode("utf-8"))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            if os.path.getsize(self.journal_path) > COMPACT_JOURNAL_BYTES:
+                self.compact()
+
+    def compact(self):
+        """
+        Fold the journal into the legacy JSON file, replaced in one step, then empty the journal.
+        Returns the JSON path, or None when there is no render data yet or the JSON could not be
+        written (the journal is kept).
+        """
+        with self:
+            if not os.path.exists(self.journal_path):
+                return self.json_path if os.path.exists(self.json_path) else None
+            data = self._replay_journal(self._read_snapshot())
+            if not self.export(data):
+                return None
+            os.remove(self.journal_path)
+            return self.json_path
+
+    def export(self, data, path=None):
+        """Write data as legacy render_data JSON to path (default: the category's JSON file)."""
+        path = path or self.json_path
+        tmp_path = path + ".tmp"
+        try:
+            if os.path.exists(path):
+                # Perforce leaves files it has not checked out read-only
+                os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+            with open(tmp_path, "w") as f:
+                f.write(format_render_data(data))
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            self.log(f"Failed to write render data {path}: {e}")
+            return False
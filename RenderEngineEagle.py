@@ -0,0 +1,1264 @@
+# RenderEngineEagle.py
+#
+# Qt-free render orchestration shared by the GUI (MayaToEagleTool.py) and the
+# headless batch runner (MayaToEagleBatch.py).
+
+import sys
+import os
+import stat
+import json
+import hashlib
+import time
+import queue
+import signal
+import shutil
+import tempfile
+import threading
+import subprocess
+import GDocsHelperEagle as GDocsHelper
+import RenderCacheEagle
+import RenderPlanEagle
+import JobHistoryEagle
+import JobLogEagle
+import MayaRenderJob
+import TagMatcherEagle
+import TextureIndexEagle
+import RenderDataStoreEagle
+from MayaRenderJob import DAEMON_TAG, EVENT_TAG
+
+# Path to Maya’s mayapy executable
+MAYA_BIN = r"C:/Program Files/Autodesk/Maya2024/bin/mayapy.exe"
+# Render backends selectable per batch: label -> render_backend in the job spec
+RENDER_BACKENDS = {
+    "Render.exe": "renderexe",
+    "In-Process (Hardware 2.0)": "inprocess",
+}
+# Each mayapy job also spawns Render.exe, so default to roughly one worker per 8 cores
+DEFAULT_RENDER_WORKERS = max(1, min(8, (os.cpu_count() or 1) // 8))
+MAX_RENDER_WORKERS = 32
+# Persistent mayapy daemons: recycle after this many jobs or this much memory growth
+DAEMON_MAX_JOBS = 25
+DAEMON_MAX_MEMORY_GROWTH_MB = 4096
+DAEMON_HEALTH_INTERVAL_MS = 30000
+DAEMON_MAX_START_FAILURES = 3
+# Without daemons, scenes from these sheets may share one mayapy process: they start up for
+# longer than they render. 1 scene per process keeps the old one-scene-per-mayapy behaviour.
+BATCH_SHEETS = {"Props", "Effects", "Hair"}
+DEFAULT_SCENES_PER_PROCESS = 1
+MAX_SCENES_PER_PROCESS = 16
+# Exit code classification written to the 'crashed' column
+CRASH_CODES = {3221225477, 3221225785}
+LAYER_EXIT_CODES = {211}
+UNKNOWN_DATA_CODES = {1}
+# Exit class -> (crashed value for Sheets, failure log note)
+EXIT_CLASSES = {
+    'ok': ('No', None),
+    'bad_layer': ('Yes, Exit 211 bad default layer', "EXIT 211 BAD DEFAULT LAYER"),
+    'unknown_data': ('Yes, Exit 1 Bad Data', "EXIT 1 FILE CONTAINS UNKNOWN DATA"),
+    'texture_crash': ('Yes, Large Texture Crash', "LARGE TEXTURE CRASH"),
+    'timeout': ('Yes, Timed out', "TIMEOUT"),
+    'other': ('Yes, plugin or other error', "PLUGIN OR OTHER ERROR"),
+}
+# Exit class -> job spec overrides for the next attempt. Classes not listed (bad default
+# layer, unknown data, plugin errors) fail the same way every time and are never retried.
+RETRY_POLICY = {
+    'texture_crash': {'texture_max_res': 1024},
+    'timeout': {},
+}
+MAX_JOB_ATTEMPTS = 2
+# Watchdog: kill a job's process tree after this long, or after this long without any output
+JOB_TIMEOUT_SECONDS = 45 * 60
+JOB_NO_OUTPUT_TIMEOUT_SECONDS = 15 * 60
+# How often a running batch reports its ETA when no job has finished in between
+ETA_EVENT_INTERVAL_SECONDS = 10
+
+# Per-job scratch folders (scratch scenes, job spec) go under this root; empty means the system
+# temp dir. Point it at a fast local disk. Folders left behind by a killed tool are pruned.
+SCRATCH_ROOT_ENV = "MAYATOEAGLE_SCRATCH_DIR"
+SCRATCH_PREFIX = "MayaToEagle_"
+SCRATCH_FORMATS = MayaRenderJob.SCRATCH_FORMATS
+DEFAULT_SCRATCH_FORMAT = "mayaBinary"
+STALE_SCRATCH_HOURS = 24
+
+# Maya-side code: MayaRenderJob.py, run as `mayapy -m MayaRenderJob` with a job spec JSON
+MAYA_JOB_MODULE = "MayaRenderJob"
+# Render jobs get their own MAYA_APP_DIR under the cache folder (see maya_environment)
+MAYA_APP_DIRNAME = "maya_app_dir"
+# Changing the Maya-side code or the tag vocabulary invalidates every render cache entry
+RENDER_SCRIPT_VERSION = hashlib.sha1("".join(
+    RenderCacheEagle.file_digest(path)
+    for path in (MayaRenderJob.__file__, TagMatcherEagle.__file__, TagMatcherEagle.default_tags_path())
+).encode("ascii")).hexdigest()[:12]
+
+###############################################################################
+# Engine: scan, plan, render, Sheets sync and Eagle upload without any Qt dependency
+###############################################################################
+
+def get_base_path():
+    if getattr(sys, 'frozen', False):
+        return sys._MEIPASS
+    else:
+        return os.path.dirname(os.path.abspath(__file__))
+
+
+def maya_environment():
+    """
+    Environment for mayapy: MayaRenderJob importable from the tool folder, its bytecode
+    cached outside the (Perforce) tool folder so every job after the first skips compiling it,
+    and Maya's minimal startup profile for render jobs.
+    """
+    env = os.environ.copy()
+    module_dir = os.path.dirname(os.path.abspath(MayaRenderJob.__file__))
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (module_dir, env.get("PYTHONPATH")) if p)
+    env["PYTHONPYCACHEPREFIX"] = os.path.join(RenderCacheEagle.default_cache_dir(), "pycache")
+    # Render startup profile: no user prefs, shelves, plugin prefs (P4GT, Turtle, ...) or userSetup
+    env["MAYA_APP_DIR"] = maya_app_dir()
+    env["MAYA_SKIP_USERSETUP_PY"] = "1"
+    env["MAYA_DISABLE_PLUGIN_AUTOLOAD"] = "1"
+    return env
+
+
+def maya_app_dir():
+    """Isolated MAYA_APP_DIR for render jobs, separate from the artist's own Maya preferences."""
+    path = os.path.join(RenderCacheEagle.default_cache_dir(), MAYA_APP_DIRNAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def maya_job_arguments(*arguments):
+    return ["-m", MAYA_JOB_MODULE] + list(arguments)
+
+
+def prune_stale_scratch(scratch_root, hours=STALE_SCRATCH_HOURS):
+    """Delete job scratch folders older than hours, left behind when the tool or mayapy was killed."""
+    root = scratch_root or tempfile.gettempdir()
+    cutoff = time.time() - hours * 3600
+    try:
+        names = [name for name in os.listdir(root) if name.startswith(SCRATCH_PREFIX)]
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(root, name)
+        try:
+            if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def clean_ma_file(filepath):
+    """
+    Remove plugins from the .ma text file to prevent crashes.
+    """
+    try:
+        # Unset read-only flag
+        file_attrs = os.stat(filepath).st_mode
+        if not file_attrs & stat.S_IWRITE:
+            os.chmod(filepath, file_attrs | stat.S_IWRITE)
+        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+            lines = f.readlines()
+        # Remove lines that contain the string
+        cleaned_lines = [line for line in lines if '"Unfold3DUnfold"' not in line]
+        # Leave untouched files alone so their mtime (and render cache entry) stays valid
+        if len(cleaned_lines) != len(lines):
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.writelines(cleaned_lines)
+        return True
+    except Exception as e:
+        print(f"[ERROR] Failed to clean {filepath}: {e}")
+        return False
+
+
+def render_settings(backend="renderexe", texture_max_res=0):
+    """Settings that change the rendered image; part of the render cache key."""
+    settings = {
+        'backend': backend,
+        'width': 1920,
+    }
+    # Only reduced-quality retries add this, so full-quality cache entries stay valid
+    if texture_max_res:
+        settings['texture_max_res'] = texture_max_res
+    return settings
+
+
+def views_to_checkbox_payload(views):
+    views_lower = {v.strip().lower() for v in (views or [])}
+    return {
+        'front': 'front' in views_lower,
+        'left':  'left'  in views_lower,
+        'back':  'back'  in views_lower,
+        'top':   'top'   in views_lower,
+    }
+
+
+def classify_exit(exit_code, timed_out=None):
+    """
+    Map a mayapy exit code to (exit class, crashed value for Sheets, failure log note or None).
+    A job killed by the watchdog is a timeout whatever code the kill produced.
+    """
+    if timed_out:
+        kind = 'timeout'
+    elif exit_code == 0:
+        kind = 'ok'
+    elif exit_code in LAYER_EXIT_CODES:
+        kind = 'bad_layer'
+    elif exit_code in UNKNOWN_DATA_CODES:
+        kind = 'unknown_data'
+    elif exit_code in CRASH_CODES or exit_code < 0:
+        kind = 'texture_crash'
+    else:
+        kind = 'other'
+    crashed, note = EXIT_CLASSES[kind]
+    if kind == 'timeout':
+        note = f"{note} ({timed_out})"
+    elif kind == 'other':
+        note = f"{note} (exit {exit_code})"
+    return kind, crashed, note
+
+
+def find_base_library(scene_folder=""):
+    """EagleFiles library root on the drive of scene_folder, or on the first drive with a Perforce folder."""
+    if not scene_folder:
+        possible_drives = [f"{chr(letter)}:\\" for letter in range(67, 91)]  # Scan C to Z drives
+        for drive in possible_drives:
+            perforce_path = os.path.join(drive, "Perforce")
+            if os.path.exists(perforce_path) and os.path.isdir(perforce_path):
+                scene_folder = perforce_path
+        if not scene_folder:
+            return None
+    drive = os.path.splitdrive(scene_folder)[0]
+    if not drive:
+        return None
+    return os.path.join(drive + os.sep, "Perforce", "Potter", "Art", "EagleFiles")
+
+
+def render_data_path(base_library, category):
+    return os.path.join(base_library, category, f"render_data_{category.lower()}.json")
+
+
+def upload_category(base_library, category, log=print):
+    """Run UploadToEagle.py for one category's render_data JSON. Returns True on success."""
+    json_path = render_data_path(base_library, category)
+    # scenes rendered since the last compaction are still in the journal
+    try:
+        RenderDataStoreEagle.RenderDataStore(json_path, log=log).compact()
+    except RenderDataStoreEagle.RenderDataLockTimeout as e:
+        log(f"Not uploading {category}: its render data could not be compacted. {e}")
+        return False
+    if not os.path.exists(json_path):
+        log(f"JSON not found for {category}: {json_path}")
+        return False
+    try:
+        with open(json_path, "r") as f:
+            json.load(f)
+    except Exception as e:
+        log(f"Error loading JSON for {category}: {e}")
+        return False
+
+    log(f"\nUploading for {category} from {json_path}\n")
+    env = os.environ.copy()
+    env["JSON_FILE_PATH"] = json_path
+    python_exe = sys.executable if not getattr(sys, 'frozen', False) else None
+    python_exe = python_exe or shutil.which("python") or shutil.which("python3")
+    if not python_exe:
+        log("Python executable not found.")
+        return False
+
+    upload_script = os.path.join(get_base_path(), "UploadToEagle.py")
+    try:
+        result = subprocess.run(
+            [python_exe, upload_script],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        log(result.stdout)
+        log(f"Finished upload for: {category}\n")
+        return True
+    except subprocess.CalledProcessError as e:
+        log(f"Upload failed for {category}: {e}\n")
+        log(e.stdout)
+        log(e.stderr)
+        return False
+
+
+class MayaProcess(object):
+    """
+    A mayapy subprocess with stdout and stderr merged. A background thread reads it line by line
+    into the engine's event queue and reports the exit code once the pipe closes, so the engine
+    itself never blocks on a child process.
+    """
+
+    def __init__(self, arguments, events, env=None):
+        self.popen = subprocess.Popen(
+            [MAYA_BIN] + list(arguments),
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            # own process group so kill_tree() can take Render.exe down with it
+            start_new_session=(os.name != "nt")
+        )
+        self.pid = self.popen.pid
+        self._reader = threading.Thread(target=self._read, args=(events,), daemon=True)
+        self._reader.start()
+
+    def _read(self, events):
+        for raw in iter(self.popen.stdout.readline, b""):
+            events.put((self, 'line', raw.decode('utf-8', 'ignore').rstrip("\r\n")))
+        self.popen.stdout.close()
+        events.put((self, 'exit', self.popen.wait()))
+
+    def write_line(self, text):
+        try:
+            self.popen.stdin.write((text + "\n").encode('utf-8'))
+            self.popen.stdin.flush()
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def close_stdin(self):
+        try:
+            self.popen.stdin.close()
+        except (OSError, ValueError):
+            pass
+
+    def kill(self):
+        try:
+            self.popen.kill()
+        except OSError:
+            pass
+
+    def kill_tree(self):
+        """Kill mayapy and every process it started (Render.exe), which kill() would orphan."""
+        if self.popen.poll() is not None:
+            return
+        if os.name == "nt":
+            try:
+                subprocess.run(["taskkill", "/PID", str(self.pid), "/T", "/F"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+            except OSError:
+                pass
+        else:
+            try:
+                os.killpg(self.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        self.kill()
+
+
+class RenderEngine(object):
+    """
+    Runs a render batch: scans a folder, plans every job, renders them on a pool of mayapy
+    processes (one-shot or persistent daemons), and writes results to Sheets and the render cache.
+
+    Nothing here blocks: call poll() regularly (from a QTimer or a loop) to pump process output.
+    Log text goes to log(text); progress goes to on_event(dict) as plain JSON-serialisable events.
+    """
+
+    def __init__(self, log=None, on_event=None):
+        self.log = log or print
+        self.on_event = on_event
+        self.max_workers = DEFAULT_RENDER_WORKERS
+        self.persistent = False
+        self.render_backend = "renderexe"
+        self.mode = "Render New Entries Only"
+        self.rerender_deleted = False
+        self.job_timeout = JOB_TIMEOUT_SECONDS
+        self.no_output_timeout = JOB_NO_OUTPUT_TIMEOUT_SECONDS
+        self.max_attempts = MAX_JOB_ATTEMPTS
+        self.scenes_per_process = DEFAULT_SCENES_PER_PROCESS
+        self.scratch_root = os.environ.get(SCRATCH_ROOT_ENV) or None
+        self.scratch_format = DEFAULT_SCRATCH_FORMAT
+        # Tags only match whole words of texture, mesh and shader names instead of any substring
+        self.tag_word_boundary = False
+        # Scenes estimated over this much texture memory render with capped textures or proxies; 0 disables
+        self.texture_budget_mb = TextureIndexEagle.DEFAULT_TEXTURE_BUDGET_MB
+        self.texture_budget_mode = "cap"
+        # Reference paths left unloaded when no reference is recognized as defining grp_geo
+        self.skip_reference_patterns = list(MayaRenderJob.SKIP_REFERENCE_PATTERNS)
+        self.gdocs = None
+        self.render_cache = RenderCacheEagle.RenderCache()
+        try:
+            self.history = JobHistoryEagle.JobHistory()
+        except Exception as e:
+            self.log(f"[WARN] Job history database unavailable; ETAs and job ordering disabled: {e}")
+            self.history = None
+        self.failures_log = os.path.join(get_base_path(), "MayaToEagleFailures_log.txt")
+        self.log_dir = JobLogEagle.default_log_dir()
+        self.events = queue.Queue()
+        self.active_jobs = {}
+        self.batches = {}
+        self.daemons = []
+        self.daemon_start_failures = 0
+        self.job_counter = 0
+        self.render_queue = []
+        self.retry_queue = []
+        self.current_index = 0
+        self.finished_count = 0
+        self.batch_started_at = None
+        # How many scenes needed no render layer repair, an in-place one, or the export/import rehost
+        self.layer_repairs = {}
+        # render_data JSON files whose journals this batch appended to, compacted when it finishes
+        self.render_data_files = set()
+        self.last_eta_event = 0.0
+        self.last_health_check = time.time()
+
+    def emit(self, event, **fields):
+        if self.on_event:
+            fields['event'] = event
+            self.on_event(fields)
+
+    def is_running(self):
+        return bool(self.render_queue)
+
+    def has_pending_jobs(self):
+        return bool(self.retry_queue) or self.current_index < len(self.render_queue)
+
+    def pending_job_count(self):
+        return len(self.retry_queue) + max(0, len(self.render_queue) - self.current_index)
+
+    def next_job(self):
+        """Retries go first so a retried scene does not wait behind the rest of the batch."""
+        if self.retry_queue:
+            return self.retry_queue.pop(0)
+        job = self.render_queue[self.current_index]
+        self.current_index += 1
+        return job
+
+    def is_batchable(self, job):
+        return (self.scenes_per_process > 1
+                and GDocsHelper._normalize_sheet_id(job['sheet']) in BATCH_SHEETS)
+
+    def next_batch(self):
+        """
+        The next job, plus the planned jobs right after it when they can share its mayapy process.
+        Retries and scenes split out of a crashed batch always run alone.
+        """
+        from_retry = bool(self.retry_queue)
+        jobs = [self.next_job()]
+        if from_retry or not self.is_batchable(jobs[0]):
+            return jobs
+        while len(jobs) < self.scenes_per_process and self.current_index < len(self.render_queue):
+            if not self.is_batchable(self.render_queue[self.current_index]):
+                break
+            jobs.append(self.next_job())
+        return jobs
+
+    def busy_job_count(self):
+        return len(self.active_jobs) + sum(1 for d in self.daemons if d['job'])
+
+    # --- Planning ---
+
+    def build_job_plan(self, scene_folder, categories=None):
+        """
+        Scan the scene folder and evaluate every skip rule and view selection up front.
+        categories optionally limits the plan to those Eagle libraries (e.g. ["Props"]).
+        Returns the plan (see RenderPlanEagle.build_job_plan) or None on error.
+        """
+        if not scene_folder:
+            self.log("Error: Please select a scene folder.")
+            return None
+
+        # Force fresh read from Google Sheets on each run
+        try:
+            self.gdocs = GDocsHelper.GDocs()
+        except Exception as e:
+            self.log(f"[WARN] Could not reset Google Sheets helper: {e}")
+            # a helper from an earlier batch would plan from stale rows
+            self.gdocs = None
+
+        # Scan for .ma files meeting the criteria.
+        scene_files = RenderPlanEagle.scan_scene_files(scene_folder)
+        if categories:
+            wanted = {c.lower() for c in categories}
+            scene_files = [(f, d) for f, d in scene_files
+                           if GDocsHelper._category_from_output_dir(d).lower() in wanted]
+        if not scene_files:
+            self.log("Error: The .ma files must be in one of the renderable folders (Props, Outfits, Hair, Characters, Creatures, Effects)")
+            return None
+        self.log(f"Found {len(scene_files)} matching .ma file(s) in folder: {scene_folder}")
+
+        try:
+            plan = RenderPlanEagle.build_job_plan(
+                scene_files,
+                self.gdocs,
+                self.mode,
+                self.rerender_deleted,
+                render_cache=self.render_cache,
+                script_version=RENDER_SCRIPT_VERSION,
+                render_settings=render_settings(self.render_backend)
+            )
+        except RenderPlanEagle.SheetsUnavailableError as e:
+            self.log(f"Error: {e}. Nothing was queued; use 'Force Re-Render All' to render without Sheets.")
+            return None
+        self.render_cache.save()
+        return plan
+
+    # --- Scheduling ---
+
+    def start(self, plan):
+        """Queue every 'render' job of plan and fill the worker slots. Returns False if a batch is running."""
+        if self.busy_job_count() or self.render_queue:
+            self.log("A render batch is already running. Wait for it to finish before starting another.")
+            return False
+
+        with open(self.failures_log, "w") as f:
+            pass
+        JobLogEagle.prune_old_logs(self.log_dir)
+        prune_stale_scratch(self.scratch_root)
+
+        for job in plan:
+            if job['action'] == 'skip':
+                self.log(f"=== Skipping render. {job['reason']} ===")
+                self.emit('job_skipped', asset=job['asset'], scene_file=job['scene_file'], reason=job['reason'])
+
+        self.render_queue = self.order_longest_first([job for job in plan if job['action'] == 'render'])
+        for index, job in enumerate(self.render_queue):
+            job['index'] = index + 1
+            job['attempts'] = []
+            job['overrides'] = {}
+        self.retry_queue = []
+        self.current_index = 0
+        self.finished_count = 0
+        self.batch_started_at = time.time()
+        self.layer_repairs = {}
+        self.render_data_files = set()
+        self.daemon_start_failures = 0
+        self.log(f"\n{len(self.render_queue)} scene(s) to render, {len(plan) - len(self.render_queue)} skipped.")
+        self.log(f"Running up to {self.max_workers} render(s) at a time.")
+        self.emit('batch_started', total=len(self.render_queue), skipped=len(plan) - len(self.render_queue),
+                  workers=self.max_workers, persistent=self.persistent, backend=self.render_backend,
+                  **self.progress_stats())
+        if not self.render_queue:
+            self.log("=== Nothing to render ===")
+            self.emit('batch_finished', total=0, finished=0)
+            return True
+        self.run_next_render()
+        return True
+
+    def order_longest_first(self, jobs):
+        """
+        Estimate every job from the history database and sort the longest first, so the biggest
+        scenes start early instead of becoming the tail of a parallel batch.
+        """
+        for job in jobs:
+            job['estimate'], job['estimate_source'] = None, None
+            if self.history is None:
+                continue
+            try:
+                job['estimate'], job['estimate_source'] = self.history.estimate(job['asset'], job['scene_file'])
+            except Exception as e:
+                self.log(f"[WARN] Could not estimate {job['asset']}: {e}")
+        if self.history is None or not jobs:
+            return jobs
+        jobs = sorted(jobs, key=lambda job: job['estimate'] or 0.0, reverse=True)
+        from_history = sum(1 for job in jobs if job['estimate_source'] == 'history')
+        self.log(f"Ordered {len(jobs)} job(s) longest first ({from_history} from history, "
+                 f"{len(jobs) - from_history} estimated from file size); "
+                 f"longest: {jobs[0]['asset']} ~{JobHistoryEagle.format_duration(jobs[0]['estimate'])}.")
+        return jobs
+
+    def progress_stats(self):
+        """ETA from the estimated seconds left in every unfinished job, and throughput so far."""
+        now = time.time()
+        remaining = [job.get('estimate') or 0.0 for job in self.retry_queue]
+        remaining += [job.get('estimate') or 0.0 for job in self.render_queue[self.current_index:]]
+        for batch in self.batches.values():
+            remaining += [job.get('estimate') or 0.0 for job in batch['jobs'][batch['done'] + 1:]]
+        for _, job in self.running_jobs():
+            elapsed = now - job.get('started_at', now)
+            remaining.append(max((job.get('estimate') or 0.0) - elapsed, 0.0))
+        eta = None
+        if self.history is not None and remaining:
+            # work spread over the workers, but never less than the longest single job left
+            eta = max(sum(remaining) / max(self.max_workers, 1), max(remaining))
+        scenes_per_hour = None
+        if self.batch_started_at and self.finished_count:
+            elapsed_hours = (now - self.batch_started_at) / 3600.0
+            if elapsed_hours > 0:
+                scenes_per_hour = round(self.finished_count / elapsed_hours, 1)
+        return {'eta_seconds': None if eta is None else round(eta), 'scenes_per_hour': scenes_per_hour}
+
+    def poll(self):
+        """
+        Handle all process output and exits queued since the last call.
+        Returns True while the batch still has work in flight.
+        """
+        pending_lines = {}
+        while True:
+            try:
+                proc, kind, value = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'line':
+                self.handle_line(proc, value, pending_lines)
+            else:
+                self.flush_lines(pending_lines)
+                self.handle_exit(proc, value)
+        self.flush_lines(pending_lines)
+        self.check_job_timeouts()
+
+        if self.render_queue and time.time() - self.last_eta_event >= ETA_EVENT_INTERVAL_SECONDS:
+            self.last_eta_event = time.time()
+            self.emit('eta', done=self.finished_count, total=len(self.render_queue), **self.progress_stats())
+
+        if self.daemons and time.time() - self.last_health_check >= DAEMON_HEALTH_INTERVAL_MS / 1000.0:
+            self.last_health_check = time.time()
+            self.check_daemon_health()
+        return self.is_running() or bool(self.busy_job_count())
+
+    def run(self, plan, poll_interval=0.1):
+        """Blocking helper for headless use: start plan and poll until every job has finished."""
+        if not self.start(plan):
+            return False
+        while self.poll():
+            time.sleep(poll_interval)
+        return True
+
+    def stop(self):
+        """Kill every mayapy process; used when the GUI closes or a headless run is interrupted."""
+        for proc in list(self.active_jobs):
+            proc.kill_tree()
+        for daemon in list(self.daemons):
+            daemon['process'].kill_tree()
+
+    def compact_render_data(self):
+        """Fold the render_data journals written during this batch into their JSON files."""
+        for json_path in sorted(self.render_data_files):
+            try:
+                if RenderDataStoreEagle.RenderDataStore(json_path, log=self.log).compact():
+                    self.log(f"Render data written to: {json_path}")
+            except RenderDataStoreEagle.RenderDataLockTimeout as e:
+                self.log(f"[WARN] {e}; the journal is kept and compacted on the next batch or upload.")
+        self.render_data_files = set()
+
+    def running_jobs(self):
+        """(process, job) for every job currently rendering, one-shot or on a daemon."""
+        running = list(self.active_jobs.items())
+        running.extend((d['process'], d['job']) for d in self.daemons if d['job'])
+        return running
+
+    def check_job_timeouts(self):
+        """Watchdog: kill the process tree of any job over its wall-clock or no-output limit."""
+        now = time.time()
+        for proc, job in self.running_jobs():
+            if job.get('timed_out') or 'started_at' not in job:
+                continue
+            if self.job_timeout and now - job['started_at'] > self.job_timeout:
+                job['timed_out'] = f"no result after {self.job_timeout:.0f}s"
+            elif self.no_output_timeout and now - job['last_output_at'] > self.no_output_timeout:
+                job['timed_out'] = f"no output for {self.no_output_timeout:.0f}s"
+            else:
+                continue
+            self.log(f"[Watchdog] {job['asset']}: {job['timed_out']}; killing mayapy pid {proc.pid} and its children.")
+            # The exit is reported through the reader thread like any other, so the job finishes in handle_exit
+            proc.kill_tree()
+
+    def run_next_render(self):
+        """
+        Fill every free worker slot with the next planned job.
+        Called when a batch starts and again whenever a job finishes.
+        """
+        if self.persistent:
+            # Top up the daemon pool, but never past the pending jobs that no idle or starting
+            # daemon will pick up: each daemon pays a full Maya startup
+            while self.persistent and len(self.daemons) < self.max_workers and \
+                    self.pending_job_count() > sum(1 for d in self.daemons if not d['job']):
+                # with no daemon left to finish and call back here, keep trying until
+                # start_daemon gives up on persistent workers
+                if not self.start_daemon() and self.daemons:
+                    break
+            for daemon in self.daemons:
+                while daemon['ready'] and not daemon['job'] and self.has_pending_jobs():
+                    job = self.next_job()
+                    if self.prepare_render_job(job):
+                        self.dispatch_daemon_job(daemon, job)
+                    else:
+                        self.mark_job_done(job)
+        # not an else: persistent workers may have been switched off just above
+        if not self.persistent:
+            while len(self.active_jobs) < self.max_workers and self.has_pending_jobs():
+                jobs = self.next_batch()
+                if len(jobs) > 1:
+                    self.start_batch(jobs)
+                    continue
+                job = jobs[0]
+                if not self.prepare_render_job(job) or not self.start_render_process(job):
+                    self.mark_job_done(job)
+
+        if not self.busy_job_count() and not self.has_pending_jobs() and self.render_queue:
+            self.shutdown_daemons()
+            self.render_cache.save()
+            self.compact_render_data()
+            self.log("\n==========================")
+            self.log("=== All files have been processed ===")
+            self.log("==========================")
+            if self.layer_repairs:
+                self.log("Render layer repairs: " + ", ".join(
+                    f"{path} {count}" for path, count in sorted(self.layer_repairs.items())))
+            self.emit('batch_finished', total=len(self.render_queue), finished=self.finished_count,
+                      layer_repairs=dict(self.layer_repairs))
+            self.render_queue = []
+
+    def mark_job_done(self, job, crashed=None):
+        self.finished_count += 1
+        self.last_eta_event = time.time()
+        self.emit('progress', done=self.finished_count, total=len(self.render_queue),
+                  asset=job['asset'], crashed=crashed, **self.progress_stats())
+
+    def prepare_render_job(self, job):
+        """
+        Clean the job's scene and write its job spec into its own scratch folder.
+        Returns the job dict, or None when the job could not be prepared.
+        """
+        scene_file, output_dir = job['scene_file'], job['output_dir']
+        attempt = len(job['attempts']) + 1
+
+        # Clean the .ma file before rendering
+        self.log(f"Cleaning file: {scene_file}")
+        success = clean_ma_file(scene_file)
+        if success:
+            self.log("Cleaning complete.")
+        else:
+            self.log("Cleaning failed. Proceeding anyway.")
+
+        attempt_label = f" (attempt {attempt} of {self.max_attempts})" if attempt > 1 else ""
+        self.log(f"\n--- Rendering file {job['index']} of {len(self.render_queue)}{attempt_label}: {scene_file} ---\n")
+        self.log(f"Output directory: {output_dir}")
+        if job['reason']:
+            self.log(job['reason'])
+
+        # Ensure the output directory exists
+        if not os.path.exists(output_dir):
+            try:
+                os.makedirs(output_dir)
+                self.log(f"Created output directory: {output_dir}")
+            except Exception as e:
+                self.log("Error creating output directory: " + str(e))
+                return None
+
+        # Every job gets its own scratch folder so parallel jobs never share temp scenes or scripts
+        asset_name = job['asset']
+        try:
+            if self.scratch_root:
+                os.makedirs(self.scratch_root, exist_ok=True)
+            scratch_dir = tempfile.mkdtemp(prefix=f"{SCRATCH_PREFIX}{asset_name}_", dir=self.scratch_root)
+        except Exception as e:
+            self.log("Error creating scratch folder: " + str(e))
+            return None
+        # Per-attempt logs: everything mayapy prints, and Render.exe's own -log
+        log_base = os.path.join(self.log_dir, f"{time.strftime('%Y%m%d_%H%M%S')}_{asset_name}_attempt{attempt}")
+        render_log = log_base + "_render.log"
+
+        # Camera angles were read from the sheet when the plan was built
+        views = job['views']
+        self.log(f"[EAGLE] Views for {os.path.basename(scene_file)}: {', '.join(views) if views else 'None'}")
+        # Everything the Maya side needs for this scene; each job has its own spec file
+        spec = {
+            'asset': asset_name,
+            'scene_file': scene_file,
+            'output_dir': output_dir,
+            'views': views,
+            'scratch_dir': scratch_dir,
+            'scratch_format': self.scratch_format,
+            'render_log': render_log,
+            'render_backend': self.render_backend,
+            'texture_max_res': int(job['overrides'].get('texture_max_res', 0)),
+            'texture_budget_mb': self.texture_budget_mb,
+            'texture_budget_mode': self.texture_budget_mode,
+            'tag_word_boundary': self.tag_word_boundary,
+            'skip_reference_patterns': list(self.skip_reference_patterns),
+        }
+        spec_path = os.path.join(scratch_dir, "job_spec.json")
+        try:
+            with open(spec_path, "w") as f:
+                json.dump(spec, f, indent=2)
+        except Exception as e:
+            self.log("Error writing job spec: " + str(e))
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+            return None
+
+        try:
+            job_log = JobLogEagle.JobLog(log_base + ".log")
+        except OSError as e:
+            self.log(f"[WARN] Could not open job log for {asset_name}: {e}")
+            job_log = None
+
+        self.job_counter += 1
+        job.update({
+            'id': self.job_counter,
+            'render_backend': self.render_backend,
+            'scratch_dir': scratch_dir,
+            'spec': spec,
+            'spec_path': spec_path,
+            'summary': None,
+            'images': [],
+            'phase': None,
+            'log': job_log,
+            'render_log': render_log,
+        })
+        self.emit('job_started', id=job['id'], asset=asset_name, scene_file=scene_file, views=views,
+                  index=job['index'], total=len(self.render_queue), attempt=attempt, overrides=job['overrides'])
+        return job
+
+    # --- One-shot mayapy processes ---
+
+    def start_render_process(self, job):
+        """Run a prepared job in its own mayapy process. Returns False if it could not be started."""
+        arguments = maya_job_arguments("--job", job['spec_path'])
+        self.log("Executing command:")
+        self.log(MAYA_BIN + " " + " ".join(arguments))
+        self.log("-----\n")
+
+        try:
+            process = MayaProcess(arguments, self.events, env=maya_environment())
+        except OSError as e:
+            self.record_failure(job['scene_file'], f"mayapy failed to start: {e}")
+            shutil.rmtree(job['scratch_dir'], ignore_errors=True)
+            self.close_job_logs(job)
+            return False
+        # stdin is only used by daemons
+        process.close_stdin()
+        job['started_at'] = job['last_output_at'] = time.time()
+        job['timed_out'] = None
+        self.active_jobs[process] = job
+        return True
+
+    def handle_line(self, proc, line, pending_lines):
+        """Route one line of mayapy output: daemon protocol messages are handled, the rest is logged."""
+        daemon = self.daemon_for(proc)
+        if (daemon is not None or proc in self.batches) and line.startswith(DAEMON_TAG):
+            try:
+                message = json.loads(line[len(DAEMON_TAG):])
+            except ValueError:
+                message = None
+            if message is not None:
+                self.flush_lines(pending_lines)
+                if daemon is not None:
+                    self.handle_daemon_message(daemon, message)
+                else:
+                    self.handle_batch_message(proc, message)
+                return
+        job = daemon['job'] if daemon is not None else self.active_jobs.get(proc)
+        if job:
+            job['last_output_at'] = time.time()
+            if job.get('log'):
+                job['log'].write(line)
+            if line.startswith(EVENT_TAG):
+                try:
+                    event = json.loads(line[len(EVENT_TAG):])
+                except ValueError:
+                    event = None
+                if isinstance(event, dict):
+                    self.flush_lines(pending_lines)
+                    self.handle_job_event(job, event)
+                    return
+        elif daemon is not None and line.startswith(EVENT_TAG):
+            # A daemon's own startup, before its first job; only the init time is worth showing
+            try:
+                event = json.loads(line[len(EVENT_TAG):])
+            except ValueError:
+                event = None
+            if isinstance(event, dict):
+                if event.get('type') == 'maya_init':
+                    self.log(f"[Daemon] Worker pid {proc.pid}: Maya initialized in {event.get('seconds', 0):.1f}s.")
+                return
+        # Tag output with the asset name so interleaved parallel logs stay readable
+        if job and self.max_workers > 1:
+            line = f"[{job['asset']}] {line}"
+        pending_lines.setdefault(proc, []).append(line)
+
+    def handle_job_event(self, job, event):
+        """Apply one structured event from a running MayaRenderJob to its job as it streams in."""
+        kind = event.get('type')
+        if kind == 'maya_init':
+            # Launch to initialized, including mayapy's own startup before MayaRenderJob runs
+            job['startup_seconds'] = round(time.time() - job['started_at'], 1)
+            self.log(f"[{job['asset']}] Maya startup took {job['startup_seconds']:.1f}s "
+                     f"({event.get('seconds', 0):.1f}s initializing standalone and plugins).")
+            self.emit('job_init', id=job['id'], asset=job['asset'], startup_seconds=job['startup_seconds'],
+                      init_seconds=event.get('seconds'), plugins=event.get('plugins'))
+        elif kind == 'layer_repair':
+            job['layer_repair'] = event.get('path')
+            self.layer_repairs[job['layer_repair']] = self.layer_repairs.get(job['layer_repair'], 0) + 1
+            if job['layer_repair'] != 'none':
+                self.log(f"[{job['asset']}] Render layers repaired: {job['layer_repair']}")
+        elif kind == 'texture_budget':
+            if event.get('cap'):
+                self.log(f"[{job['asset']}] Textures estimated at {event.get('estimated_mb', 0):.0f} MB, over the "
+                         f"{event.get('budget_mb', 0):.0f} MB budget; limited to {event['cap']} ({event.get('mode')}"
+                         + (f", {event['proxies']} proxies" if event.get('proxies') else "") + ").")
+                self.emit('job_texture_budget', id=job['id'], asset=job['asset'], estimated_mb=event.get('estimated_mb'),
+                          cap=event['cap'], mode=event.get('mode'), proxies=event.get('proxies'))
+        elif kind == 'phase_start':
+            job['phase'] = event.get('phase')
+            self.emit('job_phase', id=job['id'], asset=job['asset'], phase=job['phase'])
+        elif kind == 'phase_end':
+            self.log(f"[{job['asset']}] {event.get('phase')} took {event.get('seconds', 0):.1f}s")
+        elif kind == 'layer_rendered':
+            self.emit('layer_rendered', id=job['id'], asset=job['asset'],
+                      layer=event.get('layer'), backend=event.get('backend'))
+        elif kind == 'image_written':
+            job['images'].append(event.get('path'))
+            self.emit('image_written', id=job['id'], asset=job['asset'],
+                      layer=event.get('layer'), path=event.get('path'))
+        elif kind == 'summary':
+            job['summary'] = event.get('summary') or {}
+            if job['summary'].get('render_data_file'):
+                self.render_data_files.add(job['summary']['render_data_file'])
+            if job['summary'].get('render_data_recorded') is False:
+                self.record_failure(job['scene_file'], "RENDER DATA NOT RECORDED "
+                                    f"({job['summary'].get('render_data_file')}); rerender to add it to Eagle")
+            # Sheets is written in finish_render_job: Maya can still crash on the way out
+            self.emit('job_summary', id=job['id'], asset=job['asset'], summary=job['summary'])
+
+    def flush_lines(self, pending_lines):
+        for lines in pending_lines.values():
+            self.log("\n".join(lines))
+        pending_lines.clear()
+
+    def handle_exit(self, proc, exit_code):
+        daemon = self.daemon_for(proc)
+        if daemon is not None:
+            self.on_daemon_finished(daemon, exit_code)
+            return
+        batch = self.batches.pop(proc, None)
+        job = self.active_jobs.pop(proc, None)
+        if batch is not None:
+            self.on_batch_finished(batch, exit_code)
+        elif job is not None:
+            self.finish_render_job(job, exit_code)
+        else:
+            return
+        self.run_next_render()
+
+    # --- Multi-scene mayapy processes ---
+
+    def start_batch(self, jobs):
+        """
+        Render several prepared jobs in turn in one mayapy process, so Maya starts up once for all
+        of them. The process counts as one worker; its current scene is the one in active_jobs.
+        """
+        prepared = []
+        for job in jobs:
+            if self.prepare_render_job(job):
+                prepared.append(job)
+            else:
+                self.mark_job_done(job)
+        if len(prepared) < 2:
+            for job in prepared:
+                if not self.start_render_process(job):
+                    self.mark_job_done(job)
+            return
+
+        arguments = maya_job_arguments("--jobs", *[job['spec_path'] for job in prepared])
+        self.log(f"[Batch] Rendering {len(prepared)} scenes in one mayapy process: "
+                 + ", ".join(job['asset'] for job in prepared))
+        try:
+            process = MayaProcess(arguments, self.events, env=maya_environment())
+        except OSError as e:
+            for job in prepared:
+                self.record_failure(job['scene_file'], f"mayapy failed to start: {e}")
+                shutil.rmtree(job['scratch_dir'], ignore_errors=True)
+                self.close_job_logs(job)
+                self.mark_job_done(job)
+            return
+        process.close_stdin()
+        # Maya's startup is charged to the first scene, as it would be in its own process
+        first = prepared[0]
+        first['started_at'] = first['last_output_at'] = time.time()
+        first['timed_out'] = None
+        self.batches[process] = {'jobs': prepared, 'done': 0}
+        self.active_jobs[process] = first
+
+    def handle_batch_message(self, proc, message):
+        """A batch process finished one scene: record it and make the next scene current."""
+        if message.get('event') != 'job_done':
+            return
+        batch = self.batches[proc]
+        if message.get('index') != batch['done']:
+            self.log(f"[Batch] Ignoring out-of-order result for scene {message.get('index')}.")
+            return
+        job = batch['jobs'][batch['done']]
+        batch['done'] += 1
+        job['daemon_memory_mb'] = message.get('memory_mb')
+        self.finish_render_job(job, message.get('exit_code', 1))
+        if batch['done'] < len(batch['jobs']):
+            next_job = batch['jobs'][batch['done']]
+            next_job['started_at'] = next_job['last_output_at'] = time.time()
+            next_job['timed_out'] = None
+            self.active_jobs[proc] = next_job
+
+    def on_batch_finished(self, batch, exit_code):
+        """
+        The batch process exited. If it died before reporting every scene, re-run the rest one
+        at a time so a crash is pinned on a single scene instead of failing the whole batch.
+        """
+        remaining = batch['jobs'][batch['done']:]
+        if not remaining:
+            return
+        self.log(f"[Batch] mayapy exited with code {exit_code} after {batch['done']} of "
+                 f"{len(batch['jobs'])} scene(s); re-running the remaining {len(remaining)} one at a time.")
+        current = remaining[0]
+        if batch['done'] == 0 or current.get('timed_out'):
+            # Nothing ran before it in this session, so the failure is the scene's own
+            self.finish_render_job(current, exit_code)
+            remaining = remaining[1:]
+        for job in remaining:
+            self.requeue_job(job, f"Batch process exited with code {exit_code}; re-running this scene alone")
+
+    def requeue_job(self, job, note):
+        """Put a prepared job that never got a result back in the queue, to run in its own process."""
+        shutil.rmtree(job['scratch_dir'], ignore_errors=True)
+        self.close_job_logs(job, note)
+        job.pop('started_at', None)
+        self.emit('job_requeued', id=job['id'], asset=job['asset'], reason=note)
+        self.retry_queue.append(job)
+
+    # --- Persistent mayapy daemons ---
+
+    def daemon_for(self, proc):
+        for daemon in self.daemons:
+            if daemon['process'] is proc:
+                return daemon
+        return None
+
+    def start_daemon(self):
+        """
+        Launch one persistent mayapy worker. It reports a 'ready' event once Maya is initialized.
+        Returns False if persistent workers had to be switched off.
+        """
+        if self.daemon_start_failures >= DAEMON_MAX_START_FAILURES:
+            self.log("[Daemon] Persistent Maya workers keep failing to start; "
+                     "falling back to one mayapy process per scene.")
+            self.persistent = False
+            self.emit('persistent_disabled')
+            return False
+        arguments = maya_job_arguments("--daemon",
+                                       "--max-jobs", str(DAEMON_MAX_JOBS),
+                                       "--max-memory-growth-mb", str(DAEMON_MAX_MEMORY_GROWTH_MB))
+        self.log(f"[Daemon] Starting persistent Maya worker: {MAYA_BIN} {' '.join(arguments)}")
+        try:
+            process = MayaProcess(arguments, self.events, env=maya_environment())
+        except OSError as e:
+            self.log(f"[Daemon] mayapy failed to start: {e}")
+            self.daemon_start_failures += 1
+            return False
+        self.daemons.append({
+            'process': process,
+            'job': None,
+            'ready': False,
+            'ping_pending': False,
+        })
+        return True
+
+    def send_daemon_message(self, daemon, message):
+        return daemon['process'].write_line(json.dumps(message))
+
+    def dispatch_daemon_job(self, daemon, job):
+        daemon['job'] = job
+        job['started_at'] = job['last_output_at'] = time.time()
+        job['timed_out'] = None
+        self.log(f"[Daemon] Sending {job['asset']} to worker pid {daemon['process'].pid}")
+        self.send_daemon_message(daemon, {
+            'cmd': 'job',
+            'job_id': job['id'],
+            'spec': job['spec'],
+        })
+
+    def handle_daemon_message(self, daemon, message):
+        event = message.get('event')
+        if event == 'ready':
+            daemon['ready'] = True
+            self.daemon_start_failures = 0
+            self.log(f"[Daemon] Worker pid {message.get('pid')} ready "
+                     f"({message.get('memory_mb', 0):.0f} MB).")
+            self.run_next_render()
+        elif event == 'pong':
+            daemon['ping_pending'] = False
+        elif event == 'job_done':
+            job = daemon['job']
+            daemon['job'] = None
+            if job and job['id'] == message.get('job_id'):
+                job['daemon_memory_mb'] = message.get('memory_mb')
+                self.log(f"[Daemon] {job['asset']} finished in {message.get('seconds', 0):.1f}s "
+                         f"(worker at {message.get('memory_mb', 0):.0f} MB).")
+                self.finish_render_job(job, message.get('exit_code', 1))
+            self.run_next_render()
+        elif event == 'recycle':
+            # The daemon exits on its own; on_daemon_finished starts a replacement if work remains
+            daemon['ready'] = False
+            self.log(f"[Daemon] Recycling worker after {message.get('jobs_done')} job(s) "
+                     f"at {message.get('memory_mb', 0):.0f} MB.")
+
+    def on_daemon_finished(self, daemon, exit_code):
+        if not daemon['ready'] and not daemon['job'] and exit_code != 0:
+            self.daemon_start_failures += 1
+        self.remove_daemon(daemon)
+        job = daemon['job']
+        if job:
+            # The daemon died mid-job; treat it like a one-shot process exiting with this code
+            self.log(f"[Daemon] Worker exited with code {exit_code} while rendering {job['asset']}.")
+            self.finish_render_job(job, exit_code)
+        self.run_next_render()
+
+    def remove_daemon(self, daemon):
+        if daemon in self.daemons:
+            self.daemons.remove(daemon)
+
+    def check_daemon_health(self):
+        """Ping idle daemons; kill any that did not answer the previous ping."""
+        for daemon in list(self.daemons):
+            if not daemon['ready'] or daemon['job']:
+                continue
+            if daemon['ping_pending']:
+                self.log(f"[Daemon] Worker pid {daemon['process'].pid} "
+                         "stopped responding; restarting it.")
+                daemon['process'].kill_tree()
+                continue
+            daemon['ping_pending'] = True
+            self.send_daemon_message(daemon, {'cmd': 'ping'})
+
+    def shutdown_daemons(self):
+        for daemon in list(self.daemons):
+            if daemon['job']:
+                continue
+            daemon['ready'] = False
+            if self.send_daemon_message(daemon, {'cmd': 'quit'}):
+                daemon['process'].close_stdin()
+            else:
+                daemon['process'].kill_tree()
+
+    # --- Results ---
+
+    def record_failure(self, scene_file, note=""):
+        """
+        Append the scene path to MayaToEagleFailures_log.txt.
+        Called from every crash / timeout / non-zero exit path.
+        """
+        try:
+            if os.path.exists(self.failures_log):
+                os.chmod(self.failures_log, stat.S_IWRITE)
+            with open(self.failures_log, "a") as f:
+                f.write(scene_file + " --- " + note + "\n")
+            self.log(f"❌ Logged failure for: {scene_file}")
+        except Exception as e:
+            self.log(f"Error writing to failures log: {e}")
+
+    def finish_render_job(self, job, exit_code):
+        """Classify the exit code, clean up the job's scratch folder and write results back to Sheets."""
+        scene_file = job['scene_file']
+
+        self.log(f"\nProcess finished for {scene_file} with exit code: {exit_code}")
+
+        # if it failed, write to failures log
+        kind, crashed, failure_note = classify_exit(exit_code, job.get('timed_out'))
+        attempt = {
+            'attempt': len(job['attempts']) + 1,
+            'exit_code': exit_code,
+            'exit_class': kind,
+            'seconds': round(time.time() - job.get('started_at', time.time()), 1),
+            'overrides': dict(job['overrides']),
+            # only jobs that started their own Maya session have a startup time
+            'startup_seconds': job.pop('startup_seconds', None),
+        }
+        job['attempts'].append(attempt)
+        self.emit('job_attempt', id=job['id'], asset=job['asset'], **attempt)
+        if failure_note:
+            self.record_failure(scene_file, f"{failure_note} [attempt {attempt['attempt']}]")
+        else:
+            self.log(f"✔️ Process succeeded: {scene_file}")
+
+        # the summary arrived as an event while the job was running
+        summary = job['summary']
+
+        if self.history is not None:
+            self.history.record(
+                job['asset'], scene_file, attempt['attempt'], exit_code, kind, attempt['seconds'],
+                peak_memory_mb=(summary or {}).get('peak_memory_mb') or job.pop('daemon_memory_mb', None),
+                phases=(summary or {}).get('phases')
+            )
+
+        # remember successful renders so unchanged scenes can be skipped next time
+        if exit_code == 0 and summary:
+            try:
+                self.render_cache.record(
+                    scene_file, job['views'], RENDER_SCRIPT_VERSION,
+                    render_settings(job['render_backend'], job['overrides'].get('texture_max_res', 0)),
+                    summary.get('images'), summary.get('textures')
+                )
+            except Exception as e:
+                self.log(f"Could not update render cache for {job['asset']}: {e}")
+
+        # clean up the job spec and scratch scenes
+        try:
+            shutil.rmtree(job['scratch_dir'])
+            self.log("\nCleanup complete.")
+        except Exception as e:
+            self.log("Error removing temporary scratch folder: " + str(e))
+        self.close_job_logs(job, f"Exit code {exit_code} ({kind}) after {attempt['seconds']}s")
+
+        if kind in RETRY_POLICY and len(job['attempts']) < self.max_attempts:
+            job['overrides'].update(RETRY_POLICY[kind])
+            self.log(f"[Retry] {job['asset']}: {crashed}; retrying"
+                     + (f" with {job['overrides']}" if job['overrides'] else "") + ".")
+            self.retry_queue.append(job)
+            return
+
+        self.sync_sheets(job, summary, crashed)
+        self.emit('job_finished', id=job['id'], asset=job['asset'], scene_file=scene_file,
+                  exit_code=exit_code, crashed=crashed, attempts=job['attempts'],
+                  images=(summary or {}).get('images', job['images']))
+        self.mark_job_done(job, crashed)
+
+    def close_job_logs(self, job, footer=None):
+        """Finish and gzip the attempt's mayapy and Render.exe logs."""
+        job_log = job.pop('log', None)
+        if job_log is None:
+            return
+        if footer:
+            job_log.write(footer)
+        path = job_log.close()
+        JobLogEagle.compress_log(job.get('render_log', ''))
+        self.log(f"Job log: {path}")
+
+    def sync_sheets(self, job, summary, crashed):
+        """Write a finished job's views, scene stats and crash state to its Sheets row."""
+        if self.gdocs is None:
+            self.log("Sheets update skipped: Google Sheets helper is not available.")
+            return
+        try:
+            scene_file = job['scene_file']
+            sheet  = job['sheet']
+            asset  = os.path.splitext(os.path.basename(scene_file))[0]
+            p4     = GDocsHelper._to_p4_path(scene_file)
+
+            checkbox_payload = views_to_checkbox_payload(job['views'])
+            payload = {'asset': asset, 'path': p4}
+            payload.update(checkbox_payload)
+            if summary:
+                payload.update({
+                    'type':        summary.get('type'),
+                    'polycount':        summary.get('polycount'),
+                    'numberoftextures': summary.get('num_textures'),
+                    'numberofshaders':  summary.get('num_shaders'),
+                    'missingtextures':  'Yes' if summary.get('missing_textures') else 'No',
+                })
+            payload['crashed'] = crashed
+            order = [('front', 'Front'), ('left', 'Left'), ('back', 'Back'), ('top', 'Top')]
+            previously_rendered = ", ".join(label for key, label in order if bool(payload.get(key)))
+            payload['Previously Rendered'] = previously_rendered
+
+            status = job['deleted_status']
+            if status is None or (status is True and self.rerender_deleted):
+                payload['deleted'] = False
+                payload['Deleted'] = False
+
+            self.gdocs.doUpdateConfig(sheet, payload)
+
+        except Exception as e:
+            self.log(f"Sheets update failed: {e}")
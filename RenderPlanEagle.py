@@ -0,0 +1,216 @@
+# RenderPlanEagle.py
+
+import os
+import re
+
+import GDocsHelperEagle as GDocsHelper
+
+RERENDER_MODES = [
+    "Render New Entries Only",
+    "Re-Render If New View",
+    "Re-Render Crashed Renders Only",
+    "Re-Render Changed Only",
+    "Force Re-Render All",
+]
+
+# Modes that decide from the scene alone; every other mode needs the asset's Sheets row
+SHEETLESS_MODES = {"Force Re-Render All"}
+
+TRUE_VALUES = {'true', 'yes', 'y', '1', 'checked', 'on', '☑', '☒'}
+VIEW_COLUMNS = (('front', 'Front'), ('left', 'Left'), ('back', 'Back'), ('top', 'Top'))
+
+
+class SheetsUnavailableError(Exception):
+    """The rerender mode needs Sheets rows that could not be read."""
+
+
+def get_output_dir_for_file(file_path):
+    """
+    Determines the proper output directory for a given .ma file.
+    """
+    norm_path = os.path.normpath(file_path)
+    file_dir = os.path.dirname(norm_path)
+    drive, path_after_drive = os.path.splitdrive(file_dir)
+    path_after_drive_lower = path_after_drive.lower()
+    file_lower = os.path.basename(file_path).lower()
+
+    # Define the relative base paths
+    base_props_relative = os.path.join(os.sep, "perforce", "potter", "art", "3d", "props")
+    base_characters_relative = os.path.join(os.sep, "perforce", "potter", "art", "3d", "characters")
+    base_creatures_relative = os.path.join(os.sep, "perforce", "potter", "art", "3d", "characters", "_creatures")
+    base_outfits_relative = os.path.join(os.sep, "perforce", "potter", "art", "3d", "characters", "_outfits")
+    base_effects_relative = os.path.join(os.sep, "perforce", "potter", "art", "3d", "effects")
+
+    # Build the base library folder
+    base_library = os.path.join(drive + os.sep, "Perforce", "Potter", "Art", "EagleFiles")
+    output_dir = None
+
+    def subpath_after(base_path):
+        return os.path.relpath(file_dir, os.path.join(drive + os.sep, base_path.lstrip(os.sep)))
+
+    if path_after_drive_lower.startswith(base_props_relative) and file_lower.startswith("p_"):
+        output_dir = os.path.join(base_library, "Props", subpath_after(base_props_relative))
+    elif path_after_drive_lower.startswith(base_creatures_relative) and file_lower.startswith("c_"):
+        output_dir = os.path.join(base_library, "Creatures", subpath_after(base_creatures_relative))
+    elif path_after_drive_lower.startswith(base_outfits_relative):
+        if file_lower.startswith("o_"):
+            output_dir = os.path.join(base_library, "Outfits", subpath_after(base_outfits_relative))
+        elif file_lower.startswith("c_"):
+            output_dir = os.path.join(base_library, "Hair", subpath_after(base_outfits_relative))
+    elif path_after_drive_lower.startswith(base_effects_relative) and file_lower.startswith("fx_"):
+        output_dir = os.path.join(base_library, "Effects", subpath_after(base_effects_relative))
+    elif (path_after_drive_lower.startswith(base_characters_relative)
+        and not path_after_drive_lower.startswith(base_creatures_relative)
+        and not path_after_drive_lower.startswith(base_outfits_relative)
+        and file_lower.startswith("c_")):
+        output_dir = os.path.join(base_library, "Characters", subpath_after(base_characters_relative))
+
+    return output_dir
+
+
+def scan_scene_files(scene_folder):
+    """Return [(scene_file, output_dir)] for every renderable *_rig.ma under scene_folder."""
+    scene_files = []
+    for root, dirs, files in os.walk(scene_folder):
+        for file in files:
+            if file.lower().endswith("_rig.ma"):
+                full_path = os.path.join(root, file)
+                out_dir = get_output_dir_for_file(full_path)
+                if out_dir:
+                    scene_files.append((full_path, out_dir))
+    return scene_files
+
+
+def default_views(sheet):
+    """New entries: props get Front/Left/Top, everything else Front/Left/Back."""
+    if GDocsHelper._normalize_sheet_id(sheet).lower().startswith("prop"):
+        return ["Front", "Left", "Top"]
+    return ["Front", "Left", "Back"]
+
+
+def checked_views(row_dict):
+    """Views ticked in an existing sheet row."""
+    checked = []
+    for key, label in VIEW_COLUMNS:
+        v = row_dict.get(key)
+        if v and str(v).strip().lower() in TRUE_VALUES:
+            checked.append(label)
+    return checked
+
+
+def _evaluate_skip(row_dict, mode, rerender_deleted, base_filename):
+    """
+    Apply the rerender mode to an existing sheet row.
+    Returns (skip, message, is_deleted); the message explains skips and forced renders.
+    """
+    deleted_raw = str(row_dict.get('deleted', '') or '').strip().lower()
+    is_deleted = deleted_raw in TRUE_VALUES
+    if is_deleted:
+        if not rerender_deleted:
+            return True, (f"Marked deleted in Sheets; enable 'Re-render deleted assets' "
+                          f"to process: {base_filename}"), is_deleted
+        return False, (f"[Override] 'Deleted' is true and override is ON; "
+                       f"forcing render for {base_filename}."), is_deleted
+
+    if mode == "Render New Entries Only":
+        return True, f"Entry already exists: {base_filename}", is_deleted
+    if mode == "Re-Render Crashed Renders Only":
+        crashed_raw = str(row_dict.get('crashed', '') or '').strip()
+        crashed_norm = crashed_raw.lower()
+        if crashed_norm and not crashed_norm.startswith('no'):
+            return False, f"Re-rendering existing entry due to crashed='{crashed_raw}'.", is_deleted
+        return True, (f"Skipping non-crashed entry: {base_filename} "
+                      f"(crashed='{crashed_raw or 'No'}')"), is_deleted
+    if mode == "Re-Render If New View":
+        allowed = {"Front", "Left", "Back", "Top"}
+        prev_raw = str(row_dict.get('previouslyrendered', '') or '')
+        prev_set = {t.title() for t in re.split(r'[,\s/;]+', prev_raw) if t.strip()} & allowed
+        selected_set = set(checked_views(row_dict)) & allowed
+        if prev_set == selected_set and prev_set:
+            return True, ("'Previously Rendered' matches selected views "
+                          f"({', '.join(sorted(selected_set))}) for: {base_filename}"), is_deleted
+    return False, None, is_deleted
+
+
+def build_job_plan(scene_files, gdocs, mode, rerender_deleted,
+                   render_cache=None, script_version=None, render_settings=None):
+    """
+    Evaluate every skip rule and view selection for all scenes in one pass over the
+    cached Sheets feeds. Returns an ordered list of job dicts with action 'render' or 'skip'.
+    Raises SheetsUnavailableError when the mode needs Sheets and a sheet cannot be read, rather
+    than rendering every scene it could not evaluate.
+    """
+    needs_sheets = mode not in SHEETLESS_MODES
+    if gdocs is None and needs_sheets:
+        raise SheetsUnavailableError(f"Google Sheets is unavailable and '{mode}' needs it")
+    row_indexes = {}
+    plan = []
+    for scene_file, output_dir in scene_files:
+        asset = os.path.splitext(os.path.basename(scene_file))[0]
+        sheet = GDocsHelper._category_from_output_dir(output_dir)
+        job = {
+            'scene_file': scene_file,
+            'output_dir': output_dir,
+            'asset': asset,
+            'sheet': sheet,
+            'views': [],
+            'action': 'render',
+            'reason': None,
+            'deleted_status': None,
+        }
+        plan.append(job)
+
+        if "incrementalSave" in scene_file:
+            job['action'] = 'skip'
+            job['reason'] = f"File with 'incrementalSave' in path: {scene_file}"
+            continue
+
+        try:
+            if sheet not in row_indexes:
+                row_indexes[sheet] = gdocs.getRowIndex(sheet)
+            found = row_indexes[sheet].get(asset)
+        except Exception as e:
+            if needs_sheets:
+                raise SheetsUnavailableError(f"Could not read the {sheet} sheet needed by '{mode}': {e}") from e
+            job['reason'] = f"[WARN] Could not evaluate skip rule: {e}"
+            continue
+
+        if found is None:
+            job['views'] = default_views(sheet)
+            job['reason'] = "New entry"
+            if mode == "Re-Render Crashed Renders Only":
+                job['action'] = 'skip'
+                job['reason'] = f"No existing row (nothing crashed) for: {asset.lower()}"
+            continue
+
+        row_dict = gdocs.to_dict(sheet, found[0])
+        job['views'] = checked_views(row_dict)
+        skip, message, is_deleted = _evaluate_skip(row_dict, mode, rerender_deleted, asset)
+        job['deleted_status'] = is_deleted
+        job['reason'] = message
+        if skip:
+            job['action'] = 'skip'
+        elif mode == "Re-Render Changed Only" and not is_deleted and render_cache is not None:
+            unchanged, reason = render_cache.is_unchanged(
+                scene_file, job['views'], script_version, render_settings
+            )
+            job['reason'] = f"Render cache: {reason}"
+            if unchanged:
+                job['action'] = 'skip'
+    return plan
+
+
+def format_plan(plan):
+    """Human-readable dry-run listing of a job plan."""
+    lines = []
+    to_render = [j for j in plan if j['action'] == 'render']
+    lines.append(f"Plan: {len(to_render)} to render, {len(plan) - len(to_render)} to skip, {len(plan)} total")
+    for i, job in enumerate(plan, 1):
+        views = ", ".join(job['views']) if job['views'] else "None"
+        line = f"{i:>5}. {job['action'].upper():<6} {job['asset']}"
+        if job['action'] == 'render':
+            line += f"  [{views}] -> {job['output_dir']}"
+        if job['reason']:
+            line += f"  ({job['reason']})"
+        lines.append(line)
+    return lines
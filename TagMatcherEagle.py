@@ -0,0 +1,117 @@
+# TagMatcherEagle.py
+"""
+Tag vocabulary and matcher for the Eagle render data. The vocabulary lives in eagle_tags.json
+next to this file. Nothing here imports Maya, so MayaRenderJob uses it inside mayapy and the
+tool can use it too.
+"""
+
+import os
+import json
+from collections import deque
+
+TAGS_FILENAME = "eagle_tags.json"
+# Vocabulary lists matched against texture, mesh and shader names
+TAG_LISTS = ("props", "effects", "all", "shaders")
+
+_vocabularies = {}
+_matchers = {}
+
+
+def default_tags_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), TAGS_FILENAME)
+
+
+def load_vocabulary(path=None):
+    """The vocabulary file as a dict of lists, read once per path."""
+    path = path or default_tags_path()
+    if path not in _vocabularies:
+        with open(path, "r", encoding="utf-8") as f:
+            _vocabularies[path] = json.load(f)
+    return _vocabularies[path]
+
+
+def tag_matcher(path=None):
+    """The TagMatcher over every TAG_LISTS term of the vocabulary, built once and reused for every scene."""
+    path = path or default_tags_path()
+    if path not in _matchers:
+        vocabulary = load_vocabulary(path)
+        _matchers[path] = TagMatcher(term for name in TAG_LISTS for term in vocabulary.get(name, []))
+    return _matchers[path]
+
+
+def apply_tag_rules(tags, outfit_parts=()):
+    """The post-rules on matched tags: 'female' suppresses 'male', 'mask' is dropped, outfit part tags are added."""
+    lowered = {tag.lower() for tag in tags}
+    if "female" in lowered:
+        tags = [tag for tag in tags if tag.lower() != "male"]
+    tags = [tag for tag in tags if tag.lower() != "mask"]
+    tags.extend(part.lower() for part in outfit_parts)
+    return tags
+
+
+class TagMatcher(object):
+    """
+    Aho-Corasick automaton over the lower-cased terms: find() walks a text once and returns every
+    term that occurs in it, however many terms there are.
+
+    With word_boundary=True a term only counts when no letter or digit touches it on either side,
+    so "wood" matches "p_wood_floor" and "wood.png" but not "woodland".
+    """
+
+    def __init__(self, terms):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for term in terms:
+            self._add(term)
+        self._link()
+
+    def _add(self, term):
+        key = term.lower()
+        if not key:
+            return
+        node = 0
+        for char in key:
+            child = self.goto[node].get(char)
+            if child is None:
+                child = len(self.goto)
+                self.goto[node][char] = child
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            node = child
+        # the same term may be listed in several vocabularies; keep its first spelling
+        if not self.output[node]:
+            self.output[node].append(term)
+
+    def _link(self):
+        # breadth first, so every node's fail target is already final when its children need it
+        pending = deque(self.goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for char, child in self.goto[node].items():
+                pending.append(child)
+                target = self.fail[node]
+                while target and char not in self.goto[target]:
+                    target = self.fail[target]
+                self.fail[child] = self.goto[target].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text, word_boundary=False):
+        """Every term found in text, in order of first occurrence, spelled as in the vocabulary."""
+        text = text.lower()
+        found = {}
+        node = 0
+        for end, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for term in self.output[node]:
+                if term in found:
+                    continue
+                if word_boundary:
+                    start = end - len(term) + 1
+                    if (start > 0 and text[start - 1].isalnum()) or (end + 1 < len(text) and text[end + 1].isalnum()):
+                        continue
+                found[term] = None
+        return list(found)
@@ -0,0 +1,260 @@
+# TextureIndexEagle.py
+"""
+Local SQLite index of the textures render jobs have seen: whether each exists, its format and its
+pixel size read from the file header (the image is never decoded). Entries are keyed by
+normalized path and revalidated against (size, mtime) once they are older than VERIFY_SECONDS,
+so a texture shared by many scenes rendering at the same time is stat'ed once rather than once
+per scene. Missing textures are always rechecked, so a texture is never reported missing from a
+stale entry. Nothing here imports Maya, so MayaRenderJob uses it inside mayapy.
+"""
+
+import os
+import time
+import hashlib
+import struct
+import sqlite3
+import logging
+
+from RenderCacheEagle import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "texture_index.sqlite3"
+# Entries for present textures checked more recently than this are trusted without a stat; a
+# texture deleted within this window is still reported present
+VERIFY_SECONDS = 60
+# Bytes read from the start of a texture to find its size; JPEG frame headers can sit behind large EXIF blocks
+HEADER_BYTES = 64 * 1024
+# Parameters per SELECT ... IN (...), below SQLite's limit
+QUERY_CHUNK = 500
+
+# Texture memory pre-flight: scenes whose textures are estimated over the budget render with
+# Hardware 2.0's texture max resolution capped ("cap") or with downscaled copies ("proxy")
+DEFAULT_TEXTURE_BUDGET_MB = 2048
+TEXTURE_BUDGET_MODES = ("cap", "proxy")
+# Resolutions the pre-flight may cap to, largest first
+TEXTURE_CAPS = (4096, 2048, 1024, 512, 256)
+PROXY_DIRNAME = "texture_proxies"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS textures (
+    path TEXT PRIMARY KEY,
+    present INTEGER NOT NULL,
+    size INTEGER,
+    mtime REAL,
+    format TEXT,
+    width INTEGER,
+    height INTEGER,
+    checked_at REAL NOT NULL
+);
+"""
+
+
+def texture_key(path):
+    """Index key of a texture path: normalized, forward slashes and (on Windows) lower case."""
+    return os.path.normcase(os.path.normpath(path)).replace("\\", "/")
+
+
+def texture_memory_mb(info, max_res=0):
+    """Estimated GPU memory of one texture: RGBA8 plus its mip chain, longest edge capped at max_res."""
+    width, height = info.get('width'), info.get('height')
+    if not width or not height:
+        return 0.0
+    if max_res and max(width, height) > max_res:
+        scale = float(max_res) / max(width, height)
+        width, height = max(1, int(width * scale)), max(1, int(height * scale))
+    return width * height * 4 * 4.0 / 3.0 / (1024 * 1024)
+
+
+def plan_texture_budget(texture_info, budget_mb, max_res=0):
+    """
+    (estimated_mb, cap) for a scene's lookup() results. cap is 0 when the textures fit budget_mb
+    (or budget_mb is 0), otherwise the largest TEXTURE_CAPS resolution below max_res that fits,
+    or the smallest one when none does. Textures without a readable header count as nothing.
+    """
+    estimated_mb = sum(texture_memory_mb(info, max_res) for info in texture_info.values() if info.get('exists'))
+    if not budget_mb or estimated_mb <= budget_mb:
+        return estimated_mb, 0
+    caps = [cap for cap in TEXTURE_CAPS if not max_res or cap < max_res] or [TEXTURE_CAPS[-1]]
+    for cap in caps:
+        if sum(texture_memory_mb(info, cap) for info in texture_info.values() if info.get('exists')) <= budget_mb:
+            return estimated_mb, cap
+    return estimated_mb, caps[-1]
+
+
+def proxy_path(path, info, max_res, proxy_dir=None):
+    """
+    Cache path of the max_res proxy of a texture. The name includes the source's size and mtime,
+    so an edited texture gets a new proxy and every scene using the same version shares one.
+    """
+    proxy_dir = proxy_dir or os.path.join(default_cache_dir(), PROXY_DIRNAME)
+    source = f"{texture_key(path)}|{info.get('size')}|{info.get('mtime')}"
+    digest = hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(proxy_dir, f"{stem}_{digest}_{max_res}.png")
+
+
+def _png(header):
+    if header[:8] == b"\x89PNG\r\n\x1a\n" and header[12:16] == b"IHDR":
+        return struct.unpack(">II", header[16:24])
+    return None
+
+
+def _jpeg(header):
+    if header[:2] != b"\xff\xd8":
+        return None
+    i = 2
+    while i + 9 < len(header):
+        if header[i] != 0xFF:
+            i += 1
+            continue
+        marker = header[i + 1]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+            i += 1 if marker == 0xFF else 2
+            continue
+        length = struct.unpack(">H", header[i + 2:i + 4])[0]
+        # start-of-frame markers, excluding DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", header[i + 5:i + 9])
+            return width, height
+        i += 2 + length
+    return None
+
+
+def _tga(header):
+    # no magic number: check the image type and pixel depth fields instead
+    if len(header) >= 18 and header[2] in (1, 2, 3, 9, 10, 11) and header[16] in (8, 15, 16, 24, 32):
+        return struct.unpack("<HH", header[12:16])
+    return None
+
+
+def _dds(header):
+    if header[:4] == b"DDS ":
+        height, width = struct.unpack("<II", header[12:20])
+        return width, height
+    return None
+
+
+def _bmp(header):
+    if header[:2] == b"BM" and len(header) >= 26:
+        width, height = struct.unpack("<ii", header[18:26])
+        return width, abs(height)
+    return None
+
+
+def _psd(header):
+    if header[:4] == b"8BPS":
+        height, width = struct.unpack(">II", header[14:22])
+        return width, height
+    return None
+
+
+def _tiff(header):
+    order = {b"II": "<", b"MM": ">"}.get(header[:2])
+    if not order or struct.unpack(order + "H", header[2:4])[0] != 42:
+        return None
+    offset = struct.unpack(order + "I", header[4:8])[0]
+    if offset + 2 > len(header):
+        return None
+    count = struct.unpack(order + "H", header[offset:offset + 2])[0]
+    size = {}
+    for n in range(count):
+        entry = offset + 2 + 12 * n
+        if entry + 12 > len(header):
+            break
+        tag, kind = struct.unpack(order + "HH", header[entry:entry + 4])
+        if tag in (256, 257):
+            # SHORT or LONG value stored in the entry itself
+            value_format, value_size = ("H", 2) if kind == 3 else ("I", 4)
+            size[tag] = struct.unpack(order + value_format, header[entry + 8:entry + 8 + value_size])[0]
+    if 256 in size and 257 in size:
+        return size[256], size[257]
+    return None
+
+
+# Tried in order; TGA comes last because it has no magic number
+HEADER_READERS = (("png", _png), ("jpeg", _jpeg), ("dds", _dds), ("tiff", _tiff),
+                  ("psd", _psd), ("bmp", _bmp), ("tga", _tga))
+
+
+def read_image_header(path):
+    """(format, width, height) of an image from its first bytes, or (None, None, None) if unknown."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER_BYTES)
+    except OSError:
+        return None, None, None
+    for name, reader in HEADER_READERS:
+        if name == "tga" and not path.lower().endswith(".tga"):
+            continue
+        try:
+            size = reader(header)
+        except struct.error:
+            size = None
+        if size:
+            return name, size[0], size[1]
+    return None, None, None
+
+
+class TextureIndex(object):
+    """
+    Shared texture inventory. lookup() answers for a whole scene's textures with one query and only
+    touches the file system for entries that are unknown or due for revalidation.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(default_cache_dir(), INDEX_FILENAME)
+        # several render jobs share the index; wait for each other's writes instead of failing
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _rows(self, keys):
+        rows = {}
+        for start in range(0, len(keys), QUERY_CHUNK):
+            chunk = keys[start:start + QUERY_CHUNK]
+            for row in self.conn.execute(
+                    "SELECT path, present, size, mtime, format, width, height, checked_at FROM textures"
+                    f" WHERE path IN ({','.join('?' * len(chunk))})", chunk):
+                rows[row[0]] = row
+        return rows
+
+    def lookup(self, paths, max_age=VERIFY_SECONDS):
+        """
+        {path: {'exists', 'format', 'width', 'height', 'size', 'mtime'}} for every path, as written in the
+        scene. Entries older than max_age, and missing ones, are restat'ed; the header is only
+        reread when the file's size or mtime changed.
+        """
+        keys = {path: texture_key(path) for path in paths if path}
+        rows = self._rows(sorted(set(keys.values())))
+        now = time.time()
+        updates = []
+        result = {}
+        for path, key in keys.items():
+            row = rows.get(key)
+            if row is None or not row[1] or now - row[7] > max_age:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    row = (key, 0, None, None, None, None, None, now)
+                else:
+                    if row and row[1] and row[2] == st.st_size and row[3] == st.st_mtime:
+                        row = row[:7] + (now,)
+                    else:
+                        fmt, width, height = read_image_header(path)
+                        row = (key, 1, st.st_size, st.st_mtime, fmt, width, height, now)
+                rows[key] = row
+                updates.append(row)
+            result[path] = {'exists': bool(row[1]), 'size': row[2], 'mtime': row[3], 'format': row[4],
+                            'width': row[5], 'height': row[6]}
+        if updates:
+            try:
+                with self.conn:
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO textures (path, present, size, mtime, format, width, height,"
+                        " checked_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", updates)
+            except sqlite3.Error as e:
+                logger.error(f"Could not update texture index: {e}")
+        return result
@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+# The modules live flat at the repository root, next to this folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point RenderCacheEagle.default_cache_dir() (and everything built on it) at a temp folder."""
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+    return tmp_path / "MayaToEagleTool"
@@ -0,0 +1,67 @@
+import pytest
+
+import JobHistoryEagle
+from JobHistoryEagle import JobHistory, format_duration
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = JobHistory(str(tmp_path / "history.sqlite3"))
+    yield history
+    history.close()
+
+
+def scene_of_size(tmp_path, name, size):
+    path = tmp_path / name
+    with open(path, "wb") as f:
+        f.truncate(size)
+    return str(path)
+
+
+def test_format_duration():
+    assert format_duration(None) == "0s"
+    assert format_duration(-5) == "0s"
+    assert format_duration(45.9) == "45s"
+    assert format_duration(725) == "12m 05s"
+    assert format_duration(3 * 3600 + 20 * 60 + 59) == "3h 20m"
+
+
+def test_estimate_averages_recent_successful_runs(history, tmp_path):
+    scene = scene_of_size(tmp_path, "p_chair_rig.ma", MB)
+    history.record("p_chair_rig", scene, 1, 3221225477, "texture_crash", 900)
+    assert history.estimate("p_chair_rig", scene)[1] == 'file size'
+    for seconds in (10, 100, 200, 300, 400, 500):
+        history.record("P_Chair_Rig", scene, 1, 0, "ok", seconds)
+    # only the last HISTORY_SAMPLES successful runs count, and asset names ignore case
+    assert history.estimate("p_chair_rig", scene) == (300.0, 'history')
+
+
+def test_estimate_from_file_size_uses_defaults_until_enough_history(history, tmp_path):
+    scene = scene_of_size(tmp_path, "p_new_rig.ma", 10 * MB)
+    expected = JobHistoryEagle.DEFAULT_BASE_SECONDS + 10 * JobHistoryEagle.DEFAULT_SECONDS_PER_MB
+    assert history.estimate("p_new_rig", scene) == (pytest.approx(expected), 'file size')
+    assert history.estimate("p_gone_rig", str(tmp_path / "missing.ma"))[0] == JobHistoryEagle.DEFAULT_BASE_SECONDS
+
+
+def test_size_model_is_fitted_to_history(history, tmp_path):
+    # seconds = 20 + 5 per MB
+    for i in range(1, JobHistoryEagle.MIN_ROWS_FOR_SIZE_MODEL + 1):
+        scene = scene_of_size(tmp_path, f"p_asset{i}_rig.ma", i * MB)
+        history.record(f"p_asset{i}_rig", scene, 1, 0, "ok", 20 + 5 * i)
+    base, per_mb = history.size_model()
+    assert (base, per_mb) == (pytest.approx(20), pytest.approx(5))
+    scene = scene_of_size(tmp_path, "p_new_rig.ma", 30 * MB)
+    assert history.estimate("p_new_rig", scene) == (pytest.approx(170), 'file size')
+
+
+def test_size_model_ignores_failed_runs_and_refits_after_record(history, tmp_path):
+    for i in range(1, JobHistoryEagle.MIN_ROWS_FOR_SIZE_MODEL):
+        scene = scene_of_size(tmp_path, f"p_asset{i}_rig.ma", i * MB)
+        history.record(f"p_asset{i}_rig", scene, 1, 0, "ok", 20 + 5 * i)
+    history.record("p_crash_rig", scene, 1, 211, "bad_layer", 5)
+    assert history.size_model() == (JobHistoryEagle.DEFAULT_BASE_SECONDS, JobHistoryEagle.DEFAULT_SECONDS_PER_MB)
+    scene = scene_of_size(tmp_path, "p_last_rig.ma", 50 * MB)
+    history.record("p_last_rig", scene, 1, 0, "ok", 270)
+    assert history.size_model()[1] == pytest.approx(5)
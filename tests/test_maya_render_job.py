@@ -0,0 +1,205 @@
+import os
+import sys
+import time
+import types
+
+import pytest
+
+import MayaRenderJob
+from MayaRenderJob import file_defines_node
+
+RIG_MA = '''//Maya ASCII 2024 scene
+requires maya "2024";
+createNode transform -n "Char_Rig";
+createNode transform -n "grp_geo" -p "Char_Rig";
+createNode mesh -n "bodyShape" -p "grp_geo";
+'''
+
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_ascii_file_defining_grp_geo(tmp_path):
+    assert file_defines_node(write(tmp_path / "rig.ma", RIG_MA)) is True
+    assert file_defines_node(write(tmp_path / "cam.ma", 'createNode transform -n "cam_grp_geo";\n')) is False
+
+
+def test_grp_geo_from_a_nested_reference(tmp_path):
+    rig = write(tmp_path / "rig.ma", RIG_MA)
+    outer = write(tmp_path / "outfit.ma",
+                  f'file -rdi 1 -ns "rig" -rfn "rigRN" -typ "mayaAscii" "{rig}";\n'
+                  'requires maya "2024";\ncreateNode transform -n "grp_other";\n')
+    assert file_defines_node(outer) is True
+
+
+def test_binary_file_is_searched_for_the_name(tmp_path):
+    (tmp_path / "rig.mb").write_bytes(b"FOR4\x00" * 1000 + b"grp_geo\x00" + b"\x01" * 10)
+    (tmp_path / "anim.mb").write_bytes(b"FOR4\x00grp_geometry\x00")
+    assert file_defines_node(str(tmp_path / "rig.mb")) is True
+    assert file_defines_node(str(tmp_path / "anim.mb")) is False
+
+
+def test_unreadable_file(tmp_path):
+    assert file_defines_node(str(tmp_path / "missing.ma")) is None
+
+
+class FakeCmds(types.ModuleType):
+    """Just enough of maya.cmds for load_needed_references."""
+
+    def __init__(self, references, edits):
+        super().__init__("maya.cmds")
+        self.references = references  # ref node -> (path, namespace)
+        self.ref_edits = edits
+        self.loaded = []
+
+    def ls(self, *args, **kwargs):
+        if kwargs.get("type") == "reference":
+            return list(self.references)
+        if kwargs.get("type") == "transform":
+            return ["|rig:Char_Rig|grp_geo"] if "rigRN" in self.loaded else []
+        return []
+
+    def referenceQuery(self, ref_node, **kwargs):
+        path, namespace = self.references[ref_node]
+        if kwargs.get("isLoaded"):
+            return ref_node in self.loaded
+        if kwargs.get("filename"):
+            return path
+        if kwargs.get("namespace"):
+            return namespace
+        if kwargs.get("editStrings"):
+            return self.ref_edits.get(ref_node, [])
+        raise RuntimeError(kwargs)
+
+    def file(self, *args, **kwargs):
+        self.loaded.append(kwargs["loadReference"])
+
+
+@pytest.fixture
+def fake_maya(monkeypatch):
+    def install(references, edits=None):
+        cmds = FakeCmds(references, edits or {})
+        maya = types.ModuleType("maya")
+        maya.cmds = cmds
+        monkeypatch.setitem(sys.modules, "maya", maya)
+        monkeypatch.setitem(sys.modules, "maya.cmds", cmds)
+        return cmds
+    return install
+
+
+def test_only_grp_geo_and_linked_references_load(tmp_path, fake_maya):
+    rig = write(tmp_path / "rig.ma", RIG_MA)
+    props = write(tmp_path / "p_wand.ma", 'createNode transform -n "grp_wand";\n')
+    shaders = write(tmp_path / "shaders.ma", 'createNode shadingEngine -n "skinSG";\n')
+    cmds = fake_maya({
+        "rigRN": (rig, "rig"),
+        "wandRN": (props, "wand"),
+        "shaderLibRN": (shaders, "shaderLib"),
+    }, edits={"rigRN": ['connectAttr "|rig:Char_Rig|grp_geo|rig:body|rig:bodyShape.iog" "shaderLib:skinSG.dsm" -na']})
+    loaded, left = MayaRenderJob.load_needed_references()
+    assert loaded == ["rigRN", "shaderLibRN"]
+    assert left == ["wandRN"]
+    assert cmds.loaded == loaded
+
+
+def test_unrecognized_owner_falls_back_to_skip_patterns(tmp_path, fake_maya):
+    other = write(tmp_path / "weird.mb", "no name here")
+    cam = write(tmp_path / "shot_cam.mb", "no name here")
+    cmds = fake_maya({"weirdRN": (other, "weird"), "camRN": (cam, "cam")})
+    MayaRenderJob.load_needed_references(skip_patterns=("_cam.mb",))
+    # grp_geo never appears in the fake scene, so the skipped camera is loaded last
+    assert cmds.loaded == ["weirdRN", "camRN"]
+
+
+def test_finalize_moves_this_runs_layer_images(tmp_path):
+    started_at = time.time()
+    (tmp_path / "masterLayer").mkdir()
+    write(tmp_path / "masterLayer" / "p_chair_Front_rig.1.png", "front")
+    write(tmp_path / "p_chair_Left_rig.png", "left")
+    missing = MayaRenderJob.finalize_render_outputs(
+        str(tmp_path), [("defaultRenderLayer", "p_chair_Front_rig"), ("Left", "p_chair_Left_rig"),
+                        ("Top", "p_chair_Top_rig")], started_at)
+    assert missing == ["Top"]
+    assert (tmp_path / "chair_Front.png").read_text() == "front"
+    assert (tmp_path / "chair_Left.png").read_text() == "left"
+    assert not (tmp_path / "masterLayer").exists()
+
+
+def test_finalize_ignores_images_left_by_an_earlier_run(tmp_path):
+    (tmp_path / "Front").mkdir()
+    stale = tmp_path / "Front" / "p_chair_Front_rig.1.png"
+    write(stale, "crashed run")
+    old = time.time() - 3600
+    os.utime(stale, (old, old))
+    missing = MayaRenderJob.finalize_render_outputs(str(tmp_path), [("Front", "p_chair_Front_rig")], time.time())
+    assert missing == ["Front"]
+    assert not (tmp_path / "chair_Front.png").exists()
+
+
+def test_finalize_keeps_the_previous_image_when_nothing_new_was_written(tmp_path):
+    # Render.exe may write straight to the Eagle name; an old copy there is not this run's output
+    previous = write(tmp_path / "chair.png", "last good render")
+    old = time.time() - 3600
+    os.utime(previous, (old, old))
+    missing = MayaRenderJob.finalize_render_outputs(str(tmp_path), [("defaultRenderLayer", "chair")], time.time())
+    assert missing == ["defaultRenderLayer"]
+    assert (tmp_path / "chair.png").read_text() == "last good render"
+
+
+# Box 2 wide (X), 4 high (Y) and 6 deep (Z) around the origin
+BOX = [(x, y, z) for x in (-1, 1) for y in (-2, 2) for z in (-3, 3)]
+
+
+def box_stats(np, frame, world_matrix=None, pivot=(0, 0, 0)):
+    points = np.array(BOX, dtype=np.float64)
+    if world_matrix is not None:
+        points = points @ np.array(world_matrix, dtype=np.float64)
+    return {"points": points, "pivot": np.array(pivot, dtype=np.float64), "frame": frame}
+
+
+def test_euler_matrix_matches_maya_axes():
+    np = pytest.importorskip("numpy")
+    # rotateY 90 takes +X to -Z; rotateX 90 takes +Y to +Z
+    assert np.allclose(np.array([1, 0, 0]) @ MayaRenderJob.euler_matrix((0, 90, 0)), [0, 0, -1])
+    assert np.allclose(np.array([0, 1, 0]) @ MayaRenderJob.euler_matrix((90, 0, 0)), [0, 0, 1])
+    # xyz: X first, so +X is untouched and then goes to -Z; yxz: Y first to -Z, then X takes it to +Y
+    assert np.allclose(np.array([1, 0, 0]) @ MayaRenderJob.euler_matrix((90, 90, 0), "xyz"), [0, 0, -1])
+    assert np.allclose(np.array([1, 0, 0]) @ MayaRenderJob.euler_matrix((90, 90, 0), "yxz"), [0, 1, 0])
+
+
+def test_view_bbox_of_a_rotated_box():
+    np = pytest.importorskip("numpy")
+    stats = box_stats(np, np.identity(3))
+    assert MayaRenderJob.view_bbox(stats) == [-1, -2, -3, 1, 2, 3]
+    assert np.allclose(MayaRenderJob.view_bbox(stats, (0, -90, 0)), [-3, -2, -1, 3, 2, 1])
+    # top view used for props: depth along X, width along Y, height along Z
+    assert np.allclose(MayaRenderJob.view_bbox(stats, (90, 0, -90)), [-3, -1, -2, 3, 1, 2])
+    stats = box_stats(np, np.identity(3), pivot=(1, 0, 0))
+    assert np.allclose(MayaRenderJob.view_bbox(stats, (0, 180, 0), (10, 0, 0)), [11, -2, -3, 13, 2, 3])
+
+
+def test_view_bbox_with_non_uniform_scale():
+    np = pytest.importorskip("numpy")
+    # grp_geo scaled 3x in Z: its own scale is applied before the object-space rotation
+    scale = np.diag([1.0, 1.0, 3.0])
+    stats = box_stats(np, MayaRenderJob.rotation_frame((0, 0, 0)), scale)
+    assert np.allclose(MayaRenderJob.view_bbox(stats, (0, 90, 0)), [-9, -2, -1, 9, 2, 1])
+
+    # grp_geo rotated 90 in Y under a parent scaled 2x in X: world (x, y, z) -> (2z, y, -x)
+    parent = [2, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
+    frame = MayaRenderJob.rotation_frame((0, 90, 0), parent_matrix=parent)
+    stats = box_stats(np, frame, frame)
+    assert np.allclose(MayaRenderJob.view_bbox(stats), [-6, -2, -1, 6, 2, 1])
+    # a further 90 in Y: local (x, y, z) -> (-x, y, -z), scaled by the parent to (-2x, y, -z)
+    assert np.allclose(MayaRenderJob.view_bbox(stats, (0, 90, 0)), [-2, -2, -3, 2, 2, 3])
+
+
+def test_rotation_frame_includes_rotate_axis_and_order():
+    np = pytest.importorskip("numpy")
+    # rotate axis Z 90 takes +X to +Y and rotateY 90 leaves it; +Z stays, then goes to +X
+    frame = MayaRenderJob.rotation_frame((0, 90, 0), rotate_axis=(0, 0, 90))
+    assert np.allclose(frame, [[0, 1, 0], [0, 0, 1], [1, 0, 0]])
+    # rotate order yxz: +X goes to -Z under Y, then X 90 takes -Z to +Y
+    assert np.allclose(np.array([1, 0, 0]) @ MayaRenderJob.rotation_frame((90, 90, 0), rotate_order="yxz"), [0, 1, 0])
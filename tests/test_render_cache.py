@@ -0,0 +1,103 @@
+import os
+import hashlib
+
+import RenderCacheEagle
+from RenderCacheEagle import RenderCache
+
+SETTINGS = {'backend': "renderexe"}
+
+
+def make_scene(tmp_path):
+    scene = tmp_path / "p_chair_rig.ma"
+    scene.write_text('//Maya ASCII 2024 scene\nrequires maya "2024";\ncreateNode transform -n "grp_geo";\n')
+    image = tmp_path / "p_chair_rig_front.png"
+    image.write_bytes(b"png")
+    texture = tmp_path / "wood.png"
+    texture.write_bytes(b"wood")
+    return str(scene), str(image), str(texture)
+
+
+def test_edited_texture_invalidates_the_render(tmp_path):
+    scene, image, texture = make_scene(tmp_path)
+    cache = RenderCache(str(tmp_path / "cache"))
+    os.makedirs(cache.cache_dir)
+    cache.record(scene, ["Front"], "v1", SETTINGS, [image], [texture])
+    assert cache.is_unchanged(scene, ["Front"], "v1", SETTINGS)[0]
+
+    with open(texture, "ab") as f:
+        f.write(b" grain")
+    unchanged, reason = cache.is_unchanged(scene, ["Front"], "v1", SETTINGS)
+    assert not unchanged
+    assert reason == f"texture changed: {texture}"
+
+
+def test_texture_added_after_render_invalidates_it(tmp_path):
+    scene, image, texture = make_scene(tmp_path)
+    later = str(tmp_path / "metal.png")
+    cache = RenderCache(str(tmp_path))
+    cache.record(scene, ["Front"], "v1", SETTINGS, [image], [texture, later])
+    assert cache.is_unchanged(scene, ["Front"], "v1", SETTINGS)[0]
+    with open(later, "wb") as f:
+        f.write(b"metal")
+    assert cache.is_unchanged(scene, ["Front"], "v1", SETTINGS) == (False, f"texture changed: {later}")
+
+
+def test_read_reference_paths(tmp_path):
+    chair = (tmp_path / "Props" / "p_chair_rig.ma").as_posix()
+    scene = tmp_path / "scene.ma"
+    scene.write_text(
+        '//Maya ASCII 2024 scene\n'
+        'file -rdi 1 -ns "chair" -rfn "chairRN"\n'
+        f'\t\t "{chair}";\n'
+        'file -r -ns "lamp" -dr 1 -rfn "lampRN" "lamp/p_lamp_rig.mb";\n'
+        f'file -r -ns "chair1" -rfn "chairRN1" "{chair}";\n'
+        'requires maya "2024";\n'
+        'file -r -ns "late" "after_requires.ma";\n'
+    )
+    # multi-line statements, relative paths and repeated references; nothing after "requires"
+    assert RenderCacheEagle.read_reference_paths(str(scene)) == [
+        os.path.normpath(chair),
+        os.path.normpath(str(tmp_path / "lamp" / "p_lamp_rig.mb")),
+    ]
+    assert RenderCacheEagle.read_reference_paths(str(tmp_path / "scene.mb")) == []
+
+
+def test_file_digest_reads_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(RenderCacheEagle, "HASH_CHUNK_SIZE", 7)
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"x" * 100)
+    assert RenderCacheEagle.file_digest(str(path)) == hashlib.sha1(b"x" * 100).hexdigest()
+
+
+def test_record_round_trip(tmp_path):
+    scene, image, texture = make_scene(tmp_path)
+    cache = RenderCache(str(tmp_path))
+    assert cache.is_unchanged(scene, ["Front"], "v1", SETTINGS) == (False, "no previous render recorded")
+    cache.record(scene, ["Front", "Left"], "v1", SETTINGS, [image])
+    cache.save()
+
+    cache = RenderCache(str(tmp_path))
+    # view order and case do not matter
+    assert cache.is_unchanged(scene, ["left", "FRONT"], "v1", SETTINGS) == (True, "inputs and output images unchanged")
+    assert not cache.is_unchanged(scene, ["Front"], "v1", SETTINGS)[0]
+    assert not cache.is_unchanged(scene, ["Front", "Left"], "v2", SETTINGS)[0]
+    assert not cache.is_unchanged(scene, ["Front", "Left"], "v1", {'backend': "inprocess"})[0]
+
+    os.remove(image)
+    assert cache.is_unchanged(scene, ["Front", "Left"], "v1", SETTINGS) == (False, f"output image missing: {image}")
+
+
+def test_changed_reference_invalidates_the_render(tmp_path):
+    ref = tmp_path / "p_lamp_rig.ma"
+    ref.write_text('//Maya ASCII 2024 scene\nrequires maya "2024";\n')
+    scene = tmp_path / "room.ma"
+    scene.write_text(f'//Maya ASCII 2024 scene\nfile -r -ns "lamp" -rfn "lampRN" "{ref.as_posix()}";\nrequires maya "2024";\n')
+    image = tmp_path / "room.png"
+    image.write_bytes(b"png")
+    cache = RenderCache(str(tmp_path))
+    cache.record(str(scene), ["Front"], "v1", SETTINGS, [str(image)])
+    assert cache.is_unchanged(str(scene), ["Front"], "v1", SETTINGS)[0]
+
+    ref.write_text('//Maya ASCII 2024 scene\nrequires maya "2024";\ncreateNode transform -n "bulb";\n')
+    assert cache.is_unchanged(str(scene), ["Front"], "v1", SETTINGS) == (
+        False, "scene, references, views or render settings changed")
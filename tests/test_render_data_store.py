@@ -0,0 +1,85 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from RenderDataStoreEagle import RenderDataLockTimeout, RenderDataStore, format_render_data
+
+
+def quiet(text):
+    pass
+
+
+def entry(i):
+    return {'imglink': f"C:/EagleFiles/Props/p{i}.png", 'bounding_box': [i, 1.5, 2.0]}
+
+
+def test_compaction_folds_journal_into_legacy_json(tmp_path):
+    json_path = tmp_path / "render_data_props.json"
+    json_path.write_text(json.dumps({'old': entry(0), 'p1': {'stale': True}}))
+    store = RenderDataStore(str(json_path), log=quiet)
+    store.upsert({'p1': entry(1)}, source="p1_rig.ma")
+    store.upsert({'p2': entry(2)}, source="p2_rig.ma")
+    # the legacy file is untouched until compaction
+    assert 'p2' not in json.loads(json_path.read_text())
+
+    assert store.compact() == str(json_path)
+    data = json.loads(json_path.read_text())
+    assert data == {'old': entry(0), 'p1': entry(1), 'p2': entry(2)}
+    assert not os.path.exists(store.journal_path)
+    assert '"bounding_box": [1, 1.5, 2.0]' in json_path.read_text()
+
+
+def test_compact_without_any_data(tmp_path):
+    store = RenderDataStore(str(tmp_path / "render_data_hair.json"), log=quiet)
+    assert store.compact() is None
+    assert not os.path.exists(store.json_path)
+
+
+def test_partial_last_line_is_skipped(tmp_path):
+    store = RenderDataStore(str(tmp_path / "render_data_props.json"), log=quiet)
+    store.upsert({'p1': entry(1)})
+    with open(store.journal_path, "a") as f:
+        f.write('{"entries": {"p2": ')
+    store.compact()
+    assert json.loads(open(store.json_path).read()) == {'p1': entry(1)}
+
+
+def test_format_keeps_bounding_box_on_one_line():
+    text = format_render_data({'a': {'bounding_box': [1.25, 2, 3]}})
+    assert '"bounding_box": [1.25, 2, 3]' in text
+
+
+def test_lock_timeout_raises_instead_of_writing(tmp_path):
+    json_path = str(tmp_path / "render_data_props.json")
+    holder = RenderDataStore(json_path, log=quiet)
+    waiter = RenderDataStore(json_path, log=quiet, lock_timeout=0.3)
+    with holder:
+        with pytest.raises(RenderDataLockTimeout):
+            waiter.upsert({'p1': entry(1)})
+    assert not os.path.exists(waiter.journal_path)
+    # released: the waiter gets in now
+    waiter.upsert({'p1': entry(1)})
+    assert os.path.exists(waiter.journal_path)
+
+
+def _upsert_many(json_path, worker):
+    store = RenderDataStore(json_path, log=quiet)
+    for i in range(20):
+        store.upsert({f"w{worker}_{i}": entry(i)})
+        if i % 7 == 0:
+            store.compact()
+
+
+def test_concurrent_processes_lose_no_entries(tmp_path):
+    json_path = str(tmp_path / "render_data_props.json")
+    workers = [multiprocessing.Process(target=_upsert_many, args=(json_path, w)) for w in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(60)
+        assert process.exitcode == 0
+    store = RenderDataStore(json_path, log=quiet)
+    store.compact()
+    assert len(json.loads(open(json_path).read())) == 4 * 20
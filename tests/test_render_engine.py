@@ -0,0 +1,246 @@
+import pytest
+
+import RenderEngineEagle
+from RenderEngineEagle import RenderEngine, classify_exit
+
+
+def make_job(index, sheet="Props", **fields):
+    job = {
+        'id': index,
+        'index': index,
+        'asset': f"p_asset{index}_rig",
+        'scene_file': f"/scenes/p_asset{index}_rig.ma",
+        'output_dir': "/EagleFiles/Props",
+        'sheet': sheet,
+        'views': ["Front"],
+        'action': 'render',
+        'reason': None,
+        'attempts': [],
+        'overrides': {},
+        'render_backend': "renderexe",
+        'summary': None,
+        'images': [],
+    }
+    job.update(fields)
+    return job
+
+
+class FakeDaemonEngine(RenderEngine):
+    """Persistent engine whose daemons are plain dicts: nothing is launched."""
+
+    def __init__(self, **kwargs):
+        super().__init__(log=lambda text: None, **kwargs)
+        self.persistent = True
+        self.history = None
+        self.started = 0
+        self.dispatched = []
+
+    def start_daemon(self):
+        self.started += 1
+        self.daemons.append({'process': None, 'job': None, 'ready': False, 'ping_pending': False})
+        return True
+
+    def prepare_render_job(self, job):
+        return job
+
+    def dispatch_daemon_job(self, daemon, job):
+        daemon['job'] = job
+        self.dispatched.append(job)
+
+
+def test_one_job_starts_one_daemon(cache_dir):
+    engine = FakeDaemonEngine()
+    engine.max_workers = 6
+    engine.render_queue = [make_job(1)]
+    engine.run_next_render()
+    assert engine.started == 1
+
+
+def test_daemons_capped_by_workers_and_pending_jobs(cache_dir):
+    engine = FakeDaemonEngine()
+    engine.max_workers = 3
+    engine.render_queue = [make_job(i) for i in range(1, 6)]
+    engine.run_next_render()
+    assert engine.started == 3
+
+    engine = FakeDaemonEngine()
+    engine.max_workers = 6
+    engine.render_queue = [make_job(i) for i in range(1, 3)]
+    engine.run_next_render()
+    assert engine.started == 2
+
+
+def test_starting_daemons_count_as_capacity(cache_dir):
+    engine = FakeDaemonEngine()
+    engine.max_workers = 6
+    engine.render_queue = [make_job(1), make_job(2)]
+    engine.run_next_render()
+    # nothing finished and no daemon is ready yet: another pass must not start more
+    engine.run_next_render()
+    assert engine.started == 2
+    for daemon in engine.daemons:
+        daemon['ready'] = True
+    engine.run_next_render()
+    assert engine.started == 2
+    assert len(engine.dispatched) == 2
+
+
+def test_busy_daemons_do_not_count_as_capacity(cache_dir):
+    engine = FakeDaemonEngine()
+    engine.max_workers = 4
+    engine.render_queue = [make_job(1)]
+    engine.run_next_render()
+    engine.daemons[0]['ready'] = True
+    engine.run_next_render()
+    assert engine.daemons[0]['job'] is not None
+    # a retry arrives while the only daemon is busy: one more daemon for it
+    engine.retry_queue.append(make_job(2))
+    engine.run_next_render()
+    assert engine.started == 2
+
+
+class FailingDaemonEngine(RenderEngine):
+    """Persistent engine whose mayapy stand-ins exit before they are ready; one-shot jobs succeed."""
+
+    def __init__(self, tmp_path, **kwargs):
+        super().__init__(log=lambda text: None, **kwargs)
+        self.persistent = True
+        self.history = None
+        self.tmp_path = tmp_path
+        self.events_seen = []
+        self.on_event = lambda event: self.events_seen.append(event['event'])
+
+    def start_daemon(self):
+        if self.daemon_start_failures >= RenderEngineEagle.DAEMON_MAX_START_FAILURES:
+            return super().start_daemon()
+        self.daemons.append({'process': object(), 'job': None, 'ready': False, 'ping_pending': False})
+        return True
+
+    def prepare_render_job(self, job):
+        job['scratch_dir'] = str(self.tmp_path / f"scratch_{job['id']}")
+        return job
+
+    def start_render_process(self, job):
+        job['started_at'] = job['last_output_at'] = 0
+        self.active_jobs[object()] = job
+        return True
+
+    def sync_sheets(self, job, summary, crashed):
+        pass
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_jobs_fall_back_to_one_shot_when_daemons_never_start(cache_dir, tmp_path, workers):
+    engine = FailingDaemonEngine(tmp_path)
+    engine.max_workers = workers
+    engine.failures_log = str(tmp_path / "failures.txt")
+    engine.render_queue = [make_job(i) for i in range(1, 4)]
+    engine.run_next_render()
+    for _ in range(20):
+        if engine.daemons:
+            engine.handle_exit(engine.daemons[0]['process'], 1)
+        elif engine.active_jobs:
+            engine.handle_exit(next(iter(engine.active_jobs)), 0)
+        else:
+            break
+    assert not engine.persistent
+    assert 'persistent_disabled' in engine.events_seen
+    assert engine.events_seen.count('job_finished') == 3
+    assert 'batch_finished' in engine.events_seen
+    assert not engine.is_running()
+
+
+def test_classify_exit():
+    assert classify_exit(0)[0] == 'ok'
+    assert classify_exit(211)[0] == 'bad_layer'
+    assert classify_exit(1)[0] == 'unknown_data'
+    assert classify_exit(3221225477)[0] == 'texture_crash'
+    assert classify_exit(-9)[0] == 'texture_crash'
+    assert classify_exit(7)[0] == 'other'
+    kind, crashed, note = classify_exit(-9, timed_out="no output for 900s")
+    assert kind == 'timeout'
+    assert "no output for 900s" in note
+
+
+class RetryEngine(RenderEngine):
+    def __init__(self, **kwargs):
+        super().__init__(log=lambda text: None, **kwargs)
+        self.history = None
+        self.synced = []
+        self.finished = []
+        self.on_event = lambda event: self.finished.append(event) if event['event'] == 'job_finished' else None
+
+    def sync_sheets(self, job, summary, crashed):
+        self.synced.append((job['asset'], crashed))
+
+
+def finish(engine, job, exit_code, tmp_path):
+    job['scratch_dir'] = str(tmp_path / f"scratch_{job['id']}_{len(job['attempts'])}")
+    job['started_at'] = 0
+    engine.finish_render_job(job, exit_code)
+
+
+def test_texture_crash_is_retried_with_capped_textures(cache_dir, tmp_path):
+    engine = RetryEngine()
+    engine.failures_log = str(tmp_path / "failures.txt")
+    engine.render_queue = [make_job(1)]
+    job = engine.render_queue[0]
+    finish(engine, job, 3221225477, tmp_path)
+    assert engine.retry_queue == [job]
+    assert job['overrides'] == RenderEngineEagle.RETRY_POLICY['texture_crash']
+    assert not engine.finished
+
+    engine.next_job()
+    finish(engine, job, 3221225477, tmp_path)
+    # out of attempts: reported as crashed, not retried again
+    assert engine.retry_queue == []
+    assert [event['asset'] for event in engine.finished] == [job['asset']]
+    assert engine.synced == [(job['asset'], RenderEngineEagle.EXIT_CLASSES['texture_crash'][0])]
+    assert len(job['attempts']) == engine.max_attempts
+
+
+def test_sheets_wait_for_the_exit_code(cache_dir, tmp_path):
+    engine = RetryEngine()
+    engine.failures_log = str(tmp_path / "failures.txt")
+    engine.render_queue = [make_job(1)]
+    job = engine.render_queue[0]
+    engine.handle_job_event(job, {'type': 'summary', 'summary': {'type': "props", 'images': []}})
+    assert job['summary'] and engine.synced == []
+    # Maya crashed while shutting down after reporting its summary
+    finish(engine, job, 3221225477, tmp_path)
+    assert engine.synced == []
+    engine.next_job()
+    engine.handle_job_event(job, {'type': 'summary', 'summary': {'type': "props", 'images': []}})
+    finish(engine, job, 3221225477, tmp_path)
+    assert engine.synced == [(job['asset'], RenderEngineEagle.EXIT_CLASSES['texture_crash'][0])]
+
+
+def test_deterministic_failures_are_not_retried(cache_dir, tmp_path):
+    engine = RetryEngine()
+    engine.failures_log = str(tmp_path / "failures.txt")
+    engine.render_queue = [make_job(1)]
+    job = engine.render_queue[0]
+    finish(engine, job, 211, tmp_path)
+    assert engine.retry_queue == []
+    assert len(engine.finished) == 1
+    assert engine.finished[0]['exit_code'] == 211
+
+
+def test_retries_run_first_and_alone(cache_dir):
+    engine = RenderEngine(log=lambda text: None)
+    engine.scenes_per_process = 4
+    engine.render_queue = [make_job(i) for i in range(1, 5)]
+    retry = make_job(9)
+    engine.retry_queue.append(retry)
+    assert engine.next_batch() == [retry]
+    batch = engine.next_batch()
+    assert [job['id'] for job in batch] == [1, 2, 3, 4]
+
+
+def test_only_batch_sheets_share_a_process(cache_dir):
+    engine = RenderEngine(log=lambda text: None)
+    engine.scenes_per_process = 4
+    engine.render_queue = [make_job(1), make_job(2), make_job(3, sheet="Characters"), make_job(4)]
+    assert [job['id'] for job in engine.next_batch()] == [1, 2]
+    assert [job['id'] for job in engine.next_batch()] == [3]
+    assert [job['id'] for job in engine.next_batch()] == [4]
@@ -0,0 +1,73 @@
+import pytest
+
+import RenderPlanEagle
+from RenderPlanEagle import SheetsUnavailableError, _evaluate_skip, build_job_plan
+
+SCENES = [("/Perforce/Potter/Art/3D/Props/p_chair_rig.ma", "/Perforce/Potter/Art/EagleFiles/Props"),
+          ("/Perforce/Potter/Art/3D/Props/p_table_rig.ma", "/Perforce/Potter/Art/EagleFiles/Props")]
+
+
+class FakeGDocs(object):
+    """Sheets helper with one existing row, for p_chair_rig."""
+
+    def __init__(self, row, fail=False):
+        self.row = row
+        self.fail = fail
+
+    def getRowIndex(self, sheet):
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        return {"p_chair_rig": (2,)}
+
+    def to_dict(self, sheet, row_number):
+        return self.row
+
+
+def actions(plan):
+    return {job['asset']: job['action'] for job in plan}
+
+
+def test_new_entries_only_skips_existing_rows():
+    plan = build_job_plan(SCENES, FakeGDocs({'front': 'TRUE'}), "Render New Entries Only", False)
+    assert actions(plan) == {"p_chair_rig": 'skip', "p_table_rig": 'render'}
+    assert plan[1]['views'] == ["Front", "Left", "Top"]
+
+
+@pytest.mark.parametrize("mode", [m for m in RenderPlanEagle.RERENDER_MODES
+                                  if m not in RenderPlanEagle.SHEETLESS_MODES])
+def test_modes_needing_sheets_fail_without_them(mode):
+    with pytest.raises(SheetsUnavailableError):
+        build_job_plan(SCENES, None, mode, False)
+    with pytest.raises(SheetsUnavailableError):
+        build_job_plan(SCENES, FakeGDocs({}, fail=True), mode, False)
+
+
+def test_force_rerender_renders_without_sheets():
+    plan = build_job_plan(SCENES, FakeGDocs({}, fail=True), "Force Re-Render All", False)
+    assert set(actions(plan).values()) == {'render'}
+
+
+def test_incremental_saves_are_skipped_without_sheets():
+    scenes = [("/Perforce/Potter/Art/3D/Props/incrementalSave/p_chair_rig.ma", SCENES[0][1])]
+    plan = build_job_plan(scenes, None, "Force Re-Render All", False)
+    assert actions(plan) == {"p_chair_rig": 'skip'}
+
+
+def test_evaluate_skip_deleted_rows():
+    row = {'deleted': 'TRUE'}
+    assert _evaluate_skip(row, "Force Re-Render All", False, "p_x")[0] is True
+    skip, message, is_deleted = _evaluate_skip(row, "Render New Entries Only", True, "p_x")
+    assert (skip, is_deleted) == (False, True)
+
+
+def test_evaluate_skip_crashed_only():
+    assert _evaluate_skip({'crashed': 'Yes, Large Texture Crash'}, "Re-Render Crashed Renders Only", False, "p_x")[0] is False
+    assert _evaluate_skip({'crashed': 'No'}, "Re-Render Crashed Renders Only", False, "p_x")[0] is True
+    assert _evaluate_skip({}, "Re-Render Crashed Renders Only", False, "p_x")[0] is True
+
+
+def test_evaluate_skip_new_view():
+    row = {'front': 'TRUE', 'left': 'TRUE', 'previouslyrendered': 'Front, Left'}
+    assert _evaluate_skip(row, "Re-Render If New View", False, "p_x")[0] is True
+    row['top'] = 'TRUE'
+    assert _evaluate_skip(row, "Re-Render If New View", False, "p_x")[0] is False
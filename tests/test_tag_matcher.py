@@ -0,0 +1,50 @@
+import json
+
+import TagMatcherEagle
+from TagMatcherEagle import TagMatcher, apply_tag_rules, tag_matcher
+
+
+def test_find_returns_terms_in_order_of_first_occurrence():
+    matcher = TagMatcher(["Wood", "metal", "woodland", "land"])
+    assert matcher.find("p_metal_WOODLAND_metal") == ["metal", "Wood", "woodland", "land"]
+    assert matcher.find("glass") == []
+
+
+def test_overlapping_terms_are_all_found():
+    # "he", "she" and "hers" end inside one another: the fail links must report every one
+    matcher = TagMatcher(["he", "she", "his", "hers"])
+    assert sorted(matcher.find("ushers")) == ["he", "hers", "she"]
+
+
+def test_word_boundary():
+    matcher = TagMatcher(["wood"])
+    assert matcher.find("p_wood_floor", word_boundary=True) == ["wood"]
+    assert matcher.find("wood.png", word_boundary=True) == ["wood"]
+    assert matcher.find("woodland", word_boundary=True) == []
+    assert matcher.find("redwood", word_boundary=True) == []
+    assert matcher.find("woodland") == ["wood"]
+
+
+def test_word_boundary_keeps_looking_after_a_rejected_match():
+    matcher = TagMatcher(["wood"])
+    assert matcher.find("woodland_wood", word_boundary=True) == ["wood"]
+
+
+def test_duplicate_terms_keep_their_first_spelling():
+    matcher = TagMatcher(["Wood", "wood", ""])
+    assert matcher.find("wood") == ["Wood"]
+
+
+def test_apply_tag_rules():
+    assert apply_tag_rules(["Female", "male", "mask", "hat"], ["Shirt"]) == ["Female", "hat", "shirt"]
+    assert apply_tag_rules(["male", "Mask"]) == ["male"]
+
+
+def test_tag_matcher_uses_every_tag_list(tmp_path):
+    path = tmp_path / "tags.json"
+    path.write_text(json.dumps({"props": ["chair"], "effects": ["smoke"], "all": ["red"],
+                                "shaders": ["lambert"], "unused": ["table"]}))
+    matcher = tag_matcher(str(path))
+    assert matcher is tag_matcher(str(path))
+    assert matcher.find("red_chair_table_smoke_lambert1") == ["red", "chair", "smoke", "lambert"]
+    assert TagMatcherEagle.load_vocabulary(str(path))["unused"] == ["table"]
@@ -0,0 +1,123 @@
+import os
+import struct
+
+import pytest
+
+import TextureIndexEagle
+from TextureIndexEagle import TextureIndex, plan_texture_budget, proxy_path, read_image_header, texture_memory_mb
+
+
+def png(width, height):
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", width, height) + b"\x08\x06\x00\x00\x00"
+
+
+def jpeg(width, height):
+    exif = b"\xff\xe1" + struct.pack(">H", 2 + 100) + b"\x00" * 100
+    sof = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    return b"\xff\xd8" + exif + sof + b"\xff\xd9"
+
+
+def tga(width, height):
+    return bytes([0, 0, 2]) + b"\x00" * 9 + struct.pack("<HH", width, height) + bytes([32, 8])
+
+
+def dds(width, height):
+    return b"DDS " + struct.pack("<II", 124, 0x1007) + struct.pack("<II", height, width) + b"\x00" * 108
+
+
+def bmp(width, height):
+    return b"BM" + b"\x00" * 12 + struct.pack("<I", 40) + struct.pack("<ii", width, -height) + b"\x00" * 28
+
+
+def psd(width, height):
+    return b"8BPS" + struct.pack(">H", 1) + b"\x00" * 6 + struct.pack(">H", 3) + struct.pack(">II", height, width)
+
+
+def tiff(width, height, order="<"):
+    magic = b"II" if order == "<" else b"MM"
+    entries = [struct.pack(order + "HHI", 256, 3, 1) + struct.pack(order + "HH", width, 0),
+               struct.pack(order + "HHI", 257, 4, 1) + struct.pack(order + "I", height)]
+    return magic + struct.pack(order + "HI", 42, 8) + struct.pack(order + "H", len(entries)) + b"".join(entries)
+
+
+@pytest.mark.parametrize("name, data, fmt", [
+    ("a.png", png(2048, 1024), "png"),
+    ("a.jpg", jpeg(2048, 1024), "jpeg"),
+    ("a.tga", tga(2048, 1024), "tga"),
+    ("a.dds", dds(2048, 1024), "dds"),
+    ("a.bmp", bmp(2048, 1024), "bmp"),
+    ("a.psd", psd(2048, 1024), "psd"),
+    ("a.tif", tiff(2048, 1024), "tiff"),
+    ("b.tif", tiff(2048, 1024, ">"), "tiff"),
+])
+def test_read_image_header(tmp_path, name, data, fmt):
+    path = tmp_path / name
+    path.write_bytes(data)
+    assert read_image_header(str(path)) == (fmt, 2048, 1024)
+
+
+def test_read_image_header_unknown(tmp_path):
+    path = tmp_path / "a.png"
+    path.write_bytes(b"not an image")
+    assert read_image_header(str(path)) == (None, None, None)
+    # TGA has no magic number, so only files named .tga are read as one
+    path = tmp_path / "a.exr"
+    path.write_bytes(tga(64, 64))
+    assert read_image_header(str(path)) == (None, None, None)
+    assert read_image_header(str(tmp_path / "missing.png")) == (None, None, None)
+
+
+def test_texture_memory_includes_mips_and_cap():
+    info = {'width': 4096, 'height': 4096}
+    assert texture_memory_mb(info) == pytest.approx(64 * 4 / 3.0)
+    assert texture_memory_mb(info, 1024) == pytest.approx(4 * 4 / 3.0)
+    assert texture_memory_mb({'width': None, 'height': None}) == 0.0
+
+
+def test_plan_texture_budget():
+    textures = {f"t{i}.png": {'exists': True, 'width': 4096, 'height': 4096} for i in range(4)}
+    textures["missing.png"] = {'exists': False, 'width': 8192, 'height': 8192}
+    estimated, cap = plan_texture_budget(textures, 0)
+    assert (round(estimated), cap) == (341, 0)
+    assert plan_texture_budget(textures, 400)[1] == 0
+    # 4 x 2048^2 is about 85 MB
+    assert plan_texture_budget(textures, 100)[1] == 2048
+    assert plan_texture_budget(textures, 0.01)[1] == TextureIndexEagle.TEXTURE_CAPS[-1]
+    # an existing cap only allows smaller ones
+    assert plan_texture_budget(textures, 6, max_res=1024)[1] == 512
+
+
+def test_proxy_path_changes_with_the_source(tmp_path):
+    info = {'size': 10, 'mtime': 1.0}
+    first = proxy_path("C:/tex/wood.png", info, 1024, str(tmp_path))
+    assert os.path.dirname(first) == str(tmp_path)
+    assert os.path.basename(first).startswith("wood_") and first.endswith("_1024.png")
+    assert proxy_path("C:/tex/wood.png", info, 1024, str(tmp_path)) == first
+    assert proxy_path("C:/tex/wood.png", dict(info, mtime=2.0), 1024, str(tmp_path)) != first
+    assert proxy_path("C:/tex/wood.png", info, 512, str(tmp_path)) != first
+
+
+def test_lookup_trusts_recent_entries_and_rechecks_missing_ones(tmp_path, monkeypatch):
+    present = tmp_path / "present.png"
+    present.write_bytes(png(512, 256))
+    missing = tmp_path / "missing.png"
+    index = TextureIndex(str(tmp_path / "index.sqlite3"))
+    try:
+        info = index.lookup([str(present), str(missing)])
+        assert info[str(present)]['exists'] and (info[str(present)]['width'], info[str(present)]['height']) == (512, 256)
+        assert not info[str(missing)]['exists']
+
+        stats = []
+        real_stat = os.stat
+        monkeypatch.setattr(TextureIndexEagle.os, "stat", lambda path: stats.append(path) or real_stat(path))
+        missing.write_bytes(png(64, 64))
+        info = index.lookup([str(present), str(missing)])
+        # the present texture is trusted, the missing one is checked again and found
+        assert stats == [str(missing)]
+        assert info[str(missing)]['exists'] and info[str(missing)]['width'] == 64
+
+        present.write_bytes(png(1024, 1024))
+        assert index.lookup([str(present)])[str(present)]['width'] == 512
+        assert index.lookup([str(present)], max_age=-1)[str(present)]['width'] == 1024
+    finally:
+        index.close()